@@ -0,0 +1,467 @@
+import gzip
+import heapq
+import os
+import threading
+import time
+from datetime import date
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from fastapi import HTTPException
+
+try:
+    from .storage import TicketStore, FileLock, IdCounter, _as_dict, _file_stamp, _fsync_dir, _ticket_id
+    from .sorting import parse_date_yyyy_mm_dd
+    from .stats import TicketStats
+    from .serialization import dumps, dumps_file, loads
+except ImportError:
+    from storage import TicketStore, FileLock, IdCounter, _as_dict, _file_stamp, _fsync_dir, _ticket_id
+    from sorting import parse_date_yyyy_mm_dd
+    from stats import TicketStats
+    from serialization import dumps, dumps_file, loads
+
+""" Archive des tickets fermés : partition froide du store.
+
+La plupart des tickets sont Closed, mais chaque GET /tickets, chaque calcul
+de stats et chaque sauvegarde les touchait avec les tickets ouverts. Avec
+TICKETS_ARCHIVE_DAYS=n (n > 0), les tickets Closed créés il y a plus de n
+jours quittent le store actif (cache, index, fichier de données) pour
+<fichier>.archive/ :
+
+    manifest.json    par segment : nombre de tickets, ids min/max, compteurs de stats.py
+    2024-03.json.gz  tickets Closed créés en mars 2024 (tableau JSON trié par id, gzip)
+
+Un segment n'est lu que si on le vise : GET /tickets avec status=Closed
+(tous les segments), avec created_from / created_to (les mois concernés),
+ou un ticket demandé par son ID (segments dont l'intervalle d'ids le
+contient). Les segments lus sont servis par un TicketStore en lecture seule
+(mêmes index, tri et recherche que le store actif), tenu à jour par
+opérations comme un worker du backend wal : un segment nouvellement visé est
+lu seul, un ticket restauré ou supprimé en est retiré par son id, un segment
+réécrit par un autre process est relu seul. Un segment que plus personne ne
+vise depuis IDLE_SECONDS en est retiré. Les stats globales additionnent
+celles du manifeste, sans lire aucun segment.
+
+Un PATCH sur un ticket archivé le remet dans le store actif (opérations
+restore puis patch) ; un DELETE le retire de l'archive. Un ticket remis
+dans le store actif sans être rouvert est réarchivé au passage suivant.
+
+Ordre des écritures (thread écrivain du store, verrou de fichier tenu) :
+segments des tickets archivés écrits AVANT les données actives, segments
+des tickets restaurés ou supprimés réécrits APRÈS. Un crash entre les deux
+laisse au pire un ticket des deux côtés, jamais un ticket perdu : le store
+actif l'emporte (un ticket qu'il contient est ignoré à la lecture de l'archive).
+"""
+
+MANIFEST = "manifest.json"
+SEGMENT_SUFFIX = ".json.gz"
+# Délai min entre deux passages automatiques (voir TicketStore.archive_closed)
+CHECK_INTERVAL = 3600.0
+# Segment non visé depuis ce délai : retiré du store de lecture (mémoire)
+IDLE_SECONDS = 600.0
+
+
+def segment_name(ticket: Dict[str, Any]) -> str:
+    """Segment d'un ticket : mois de createdAt (date invalide : 1970-01, comme pour le tri)."""
+    return parse_date_yyyy_mm_dd(str(ticket.get("createdAt", ""))).strftime("%Y-%m")
+
+
+def _month_days(name: str) -> Tuple[int, int]:
+    """Premier et dernier jour (numéros de jour) du mois d'un segment."""
+    year, month = int(name[:4]), int(name[5:7])
+    first = date(year, month, 1).toordinal()
+    following = date(year + month // 12, month % 12 + 1, 1).toordinal()
+    return first, following - 1
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """Même principe que storage._write_file : fichier temporaire + fsync + os.replace."""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        _fsync_dir(path)
+    except OSError as e:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise HTTPException(status_code=500, detail=f"Échec de l'écriture de l'archive: {e}")
+
+
+class ArchiveSegments:
+    """
+    Backend (au sens de storage.py) du store de lecture de l'archive : les
+    segments ouverts, en lecture seule. Incrémental comme le backend wal :
+    load_changes() renvoie les opérations qui mettent le store à jour.
+    """
+
+    name = "archive"
+    incremental = True
+
+    def __init__(self, archive: "TicketArchive"):
+        self.archive = archive
+        # Même verrou de fichier que le store actif : jamais de lecture pendant un commit
+        self.lock = archive.lock
+        self.counter = archive.counter
+        self._signature: Optional[Tuple] = None
+
+    def has_changed(self) -> bool:
+        return self.archive.signature() != self._signature
+
+    def load(self, item_hook: Optional[Callable] = None) -> List[Dict[str, Any]]:
+        self._signature = self.archive.signature()
+        return self.archive.opened_tickets(item_hook)
+
+    def load_changes(self) -> Optional[List[Dict[str, Any]]]:
+        signature = self.archive.signature()
+        ops = self.archive.reader_changes()
+        if ops is not None:  # None : has_changed() reste vrai, le store relit tout
+            self._signature = signature
+        return ops
+
+    def commit(self, tickets: List[Dict[str, Any]], ops: List[Dict[str, Any]]) -> int:
+        raise RuntimeError("Archive en lecture seule : les mutations passent par le store actif.")
+
+    def close(self) -> None:
+        pass
+
+
+class TicketArchive:
+    """
+    Segments de l'archive d'un TicketStore (dossier path). Lectures depuis
+    n'importe quel thread ; put / take / commit_* depuis le thread écrivain
+    du store actif, verrou de fichier tenu.
+
+    lock, counter : ceux du backend du store actif ; is_active(id) : le
+    ticket est-il dans le store actif ? (il l'emporte alors sur l'archive)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_age_days: int,
+        lock: FileLock,
+        counter: IdCounter,
+        is_active: Callable[[int], bool],
+        compact: bool,
+        engine: str,
+    ):
+        self.path = path
+        self.max_age_days = max_age_days
+        self.lock = lock
+        self.counter = counter
+        self._is_active = is_active
+        self._mutex = threading.RLock()
+        self._manifest: Dict[str, Dict[str, Any]] = {}
+        self._manifest_stamp: Any = False  # False : jamais lu
+        self._stats: Optional[TicketStats] = None
+        # Segments visés -> dernier accès (time.monotonic) ; _generation change
+        # dès que le store de lecture a quelque chose à appliquer
+        self._opened: Dict[str, float] = {}
+        self._generation = 0
+        # Store de lecture : segment chargé -> (entrée du manifeste lue, ids),
+        # opérations en attente, relecture complète demandée
+        self._loaded: Dict[str, Tuple[Optional[Dict[str, Any]], Set[int]]] = {}
+        self._reader_ops: List[Dict[str, Any]] = []
+        self._reload = False
+        # Écritures en attente du commit du store actif
+        self._added: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self._removed: Dict[str, Set[int]] = {}
+        self._checked_at = time.monotonic()
+        self.reader = TicketStore(ArchiveSegments(self), compact=compact, engine=engine, snapshot=False, archive_days=0)
+
+    # ---------------- Manifeste ----------------
+    def _manifest_path(self) -> str:
+        return os.path.join(self.path, MANIFEST)
+
+    def _segment_path(self, name: str) -> str:
+        return os.path.join(self.path, name + SEGMENT_SUFFIX)
+
+    def _refresh(self) -> None:
+        """Relit le manifeste s'il a changé (archivage par un autre worker, script.py...)."""
+        stamp = _file_stamp(self._manifest_path())
+        if stamp == self._manifest_stamp:
+            return
+        with self._mutex:
+            try:
+                with open(self._manifest_path(), "rb") as f:
+                    manifest = loads(f.read())["segments"]
+            except FileNotFoundError:
+                manifest = {}
+            except (ValueError, KeyError, TypeError):
+                raise HTTPException(status_code=500, detail="Manifeste de l'archive corrompu.")
+            except OSError as e:
+                raise HTTPException(status_code=500, detail=f"Erreur système de fichier: {e}")
+            self._manifest, self._manifest_stamp = manifest, stamp
+            self._stats = None
+            self._generation += 1
+
+    def signature(self) -> int:
+        """Change dès que le contenu des segments ouverts peut avoir changé."""
+        self._refresh()
+        return self._generation
+
+    def stats(self) -> TicketStats:
+        """Compteurs de tous les tickets archivés, d'après le manifeste (aucun segment lu)."""
+        self._refresh()
+        stats = self._stats
+        if stats is None:
+            with self._mutex:
+                stats = TicketStats.combined(*(TicketStats.from_state(e["stats"]) for e in self._manifest.values()))
+                self._stats = stats
+        return stats
+
+    def segments(self, days: Optional[Tuple[int, int]] = None) -> List[str]:
+        """Segments existants, ou ceux dont le mois recoupe days (bornes incluses, numéros de jour)."""
+        self._refresh()
+        names = sorted(self._manifest)
+        if days is None:
+            return names
+        low, high = days
+        return [name for name in names if _month_days(name)[0] <= high and _month_days(name)[1] >= low]
+
+    def _segments_of(self, ticket_id: int) -> List[str]:
+        self._refresh()
+        return [name for name, e in self._manifest.items() if e["min_id"] <= ticket_id <= e["max_id"]]
+
+    # ---------------- Lecture ----------------
+    def _read_segment(self, name: str) -> List[Dict[str, Any]]:
+        try:
+            with open(self._segment_path(name), "rb") as f:
+                tickets = loads(gzip.decompress(f.read()))
+        except FileNotFoundError:
+            return []
+        except (ValueError, EOFError, gzip.BadGzipFile):
+            raise HTTPException(status_code=500, detail=f"Segment d'archive corrompu: {name}")
+        except OSError as e:
+            raise HTTPException(status_code=500, detail=f"Erreur système de fichier: {e}")
+        if not isinstance(tickets, list):
+            raise HTTPException(status_code=500, detail=f"Segment d'archive corrompu: {name}")
+        return tickets
+
+    def open(self, names: List[str]) -> TicketStore:
+        """
+        Store de lecture servant (au moins) ces segments ; les nouveaux sont
+        lus au prochain accès, ceux non visés depuis IDLE_SECONDS retirés.
+        """
+        now = time.monotonic()
+        with self._mutex:
+            changed = not all(name in self._opened for name in names)
+            for name in names:
+                self._opened[name] = now
+            idle = [name for name, used in self._opened.items() if now - used > IDLE_SECONDS]
+            for name in idle:
+                del self._opened[name]
+            if changed or idle:
+                self._generation += 1
+        return self.reader
+
+    def _segment_tickets(self, name: str) -> List[Dict[str, Any]]:
+        """Tickets d'un segment, sauf ceux revenus dans le store actif (il l'emporte)."""
+        return [t for t in self._read_segment(name) if isinstance(t, dict) and not self._is_active(_ticket_id(t))]
+
+    def opened_tickets(self, item_hook: Optional[Callable] = None) -> List[Dict[str, Any]]:
+        """Tickets des segments ouverts (chargement complet du store de lecture)."""
+        tickets = []
+        with self._mutex:
+            self._refresh()
+            self._loaded, self._reader_ops, self._reload = {}, [], False
+            for name in sorted(self._opened):
+                if name not in self._manifest:
+                    continue
+                segment = self._segment_tickets(name)
+                self._loaded[name] = (self._manifest[name], set(_ticket_id(t) for t in segment))
+                tickets.extend(item_hook(t) if item_hook is not None else t for t in segment)
+        return tickets
+
+    def reader_changes(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Opérations (delete / restore) qui mettent le store de lecture à jour
+        depuis son dernier chargement. None : le relire en entier (plus de
+        tickets à lire que déjà chargés, ou invalidate()).
+        """
+        with self._mutex:
+            self._refresh()
+            if self._reload:
+                return None
+            ops, self._reader_ops = self._reader_ops, []
+            # Segments plus visés, ou réécrits par un autre process : retirés (puis relus)
+            for name, (entry, ids) in list(self._loaded.items()):
+                if name not in self._opened or self._manifest.get(name) != entry:
+                    ops.extend({"op": "delete", "id": tid} for tid in ids)
+                    del self._loaded[name]
+            new = [name for name in sorted(self._opened) if name in self._manifest and name not in self._loaded]
+            loaded = sum(len(ids) for _, ids in self._loaded.values())
+            if sum(self._manifest[name]["count"] for name in new) > loaded:
+                return None
+            for name in new:
+                segment = self._segment_tickets(name)
+                self._loaded[name] = (self._manifest[name], set(_ticket_id(t) for t in segment))
+                ops.extend({"op": "restore", "ticket": t} for t in segment)
+            return ops
+
+    def get(self, ticket_id: int) -> Optional[Dict[str, Any]]:
+        names = self._segments_of(ticket_id)
+        if not names:
+            return None
+        return self.open(names).get(ticket_id)
+
+    def iter_tickets(self) -> Iterator[Dict[str, Any]]:
+        """Tous les tickets archivés par id croissant, un segment lu à la fois quand c'est possible (export)."""
+        runs: List[List[Dict[str, Any]]] = []
+        last = None
+        for name, entry in sorted(self._manifest_items(), key=lambda item: item[1]["min_id"]):
+            if last is not None and entry["min_id"] > last:
+                # Segments sans recouvrement d'ids : ceux déjà lus peuvent sortir
+                yield from heapq.merge(*runs, key=_ticket_id)
+                runs = []
+            runs.append([t for t in self._read_segment(name) if not self._is_active(_ticket_id(t))])
+            last = entry["max_id"] if last is None else max(last, entry["max_id"])
+        yield from heapq.merge(*runs, key=_ticket_id)
+
+    def _manifest_items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        self._refresh()
+        return list(self._manifest.items())
+
+    def invalidate(self) -> None:
+        """Le store de lecture relira tous ses segments."""
+        with self._mutex:
+            self._reload = True
+            self._generation += 1
+
+    def forget(self, ticket_id: int) -> None:
+        """Ticket restauré ou supprimé par un autre worker : retiré du store de lecture."""
+        with self._mutex:
+            for _, ids in self._loaded.values():
+                if ticket_id in ids:
+                    ids.discard(ticket_id)
+                    self._reader_ops.append({"op": "delete", "id": ticket_id})
+                    self._generation += 1
+                    return
+
+    # ---------------- Écriture (thread écrivain du store actif) ----------------
+    def cutoff(self) -> int:
+        """Numéro du premier jour de création qui reste dans le store actif."""
+        return date.today().toordinal() - self.max_age_days
+
+    def due(self) -> bool:
+        """Passage automatique à faire (au plus un toutes les CHECK_INTERVAL secondes) ?"""
+        now = time.monotonic()
+        if now - self._checked_at < CHECK_INTERVAL:
+            return False
+        self._checked_at = now
+        return True
+
+    def put(self, ticket: Dict[str, Any]) -> None:
+        """Ticket à archiver au prochain commit."""
+        ticket = dict(_as_dict(ticket))
+        name = segment_name(ticket)
+        ticket_id = _ticket_id(ticket)
+        self._added.setdefault(name, {})[ticket_id] = ticket
+        self._removed.get(name, set()).discard(ticket_id)
+
+    def take(self, ticket_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Ticket archivé, retiré de l'archive au prochain commit (restauration ou
+        suppression). None s'il n'est pas archivé.
+        """
+        for name, added in self._added.items():
+            ticket = added.pop(ticket_id, None)
+            if ticket is not None:
+                # Archivé dans ce même lot ; peut-être déjà dans le segment (archivé plus tôt)
+                self._removed.setdefault(name, set()).add(ticket_id)
+                return ticket
+        for name in self._segments_of(ticket_id):
+            if ticket_id in self._removed.get(name, ()):
+                continue
+            ticket = next((t for t in self._read_segment(name) if _ticket_id(t) == ticket_id), None)
+            if ticket is not None:
+                self._removed.setdefault(name, set()).add(ticket_id)
+                return ticket
+        return None
+
+    def commit_added(self) -> None:
+        """Avant le commit du store actif : segments complétés des tickets archivés."""
+        if not self._added:
+            return
+        for name, added in self._added.items():
+            tickets = {_ticket_id(t): t for t in self._read_segment(name)}
+            tickets.update(added)
+            self._write_segment(name, list(tickets.values()), added=added)
+        self._added = {}
+        self._write_manifest()
+
+    def commit_removed(self) -> None:
+        """Après le commit du store actif : tickets restaurés ou supprimés retirés de leur segment."""
+        if not self._removed:
+            return
+        for name, removed in self._removed.items():
+            if removed:
+                self._write_segment(
+                    name, [t for t in self._read_segment(name) if _ticket_id(t) not in removed], removed=removed
+                )
+        self._removed = {}
+        self._write_manifest()
+
+    def discard_pending(self) -> None:
+        """Commit du store actif échoué : rien à retirer (au pire des doublons, que le store actif masque)."""
+        self._added = {}
+        self._removed = {}
+        self.invalidate()
+
+    def _write_segment(
+        self,
+        name: str,
+        tickets: List[Dict[str, Any]],
+        added: Optional[Dict[int, Dict[str, Any]]] = None,
+        removed: Set[int] = frozenset(),
+    ) -> None:
+        """Réécrit le segment ; added / removed : les tickets qui ont changé (store de lecture)."""
+        with self._mutex:
+            self._refresh()
+            before = self._manifest.get(name)
+            os.makedirs(self.path, exist_ok=True)
+            if not tickets:
+                try:
+                    os.remove(self._segment_path(name))
+                except FileNotFoundError:
+                    pass
+                self._manifest.pop(name, None)
+            else:
+                tickets.sort(key=_ticket_id)
+                _write_atomic(self._segment_path(name), gzip.compress(dumps_file(tickets), compresslevel=6))
+                self._manifest[name] = {
+                    "count": len(tickets),
+                    "min_id": _ticket_id(tickets[0]),
+                    "max_id": _ticket_id(tickets[-1]),
+                    "stats": TicketStats.from_tickets(tickets).state(),
+                }
+            self._update_reader(name, before, added or {}, removed)
+
+    def _update_reader(
+        self, name: str, before: Optional[Dict[str, Any]], added: Dict[int, Dict[str, Any]], removed: Set[int]
+    ) -> None:
+        """Mêmes changements, par id, pour le store de lecture s'il sert ce segment."""
+        loaded = self._loaded.get(name)
+        if loaded is None or loaded[0] != before:
+            return  # segment pas chargé, ou déjà périmé : relu en entier par reader_changes()
+        ids = loaded[1]
+        for tid in removed:
+            if tid in ids:
+                ids.discard(tid)
+                self._reader_ops.append({"op": "delete", "id": tid})
+        for tid, ticket in added.items():
+            if tid in ids:  # réarchivé, peut-être modifié entre-temps
+                self._reader_ops.append({"op": "delete", "id": tid})
+            ids.add(tid)
+            self._reader_ops.append({"op": "restore", "ticket": ticket})
+        self._loaded[name] = (self._manifest.get(name), ids)
+        self._generation += 1
+
+    def _write_manifest(self) -> None:
+        """Écrit en dernier : un lecteur qui voit le nouveau manifeste voit aussi les nouveaux segments."""
+        with self._mutex:
+            _write_atomic(self._manifest_path(), dumps({"version": 1, "segments": self._manifest}))
+            self._manifest_stamp = _file_stamp(self._manifest_path())
+            self._stats = None
@@ -0,0 +1,97 @@
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+import anyio
+from fastapi import Request
+
+try:
+    from .storage import get_store
+    from .timing import stage
+except ImportError:
+    from storage import get_store
+    from timing import stage
+
+""" Interface asynchrone du store, pour les handlers `async def` (TICKETS_HANDLERS=async).
+
+- Store en mémoire (TicketStore) : les lectures sont servies directement
+  dans la boucle asyncio ; un rechargement depuis le disque et les lectures
+  qui peuvent passer par l'archive (segments gzip, voir
+  TicketStore.archive_hit) partent dans un thread. Les mutations sont confiées au thread écrivain et attendues
+  via leur Future : aucun thread du pool n'est bloqué pendant l'écriture.
+- Store SQLite : chaque appel est une requête sur la base, donc part dans
+  un thread (anyio).
+"""
+
+T = TypeVar("T")
+
+
+class AsyncTicketStore:
+    """Enveloppe async d'un TicketStore ou d'un SqliteTicketStore."""
+
+    __slots__ = ("store",)
+
+    def __init__(self, store):
+        self.store = store
+
+    async def _refresh(self) -> None:
+        if self.store.needs_reload():
+            await anyio.to_thread.run_sync(self.store.refresh)
+
+    async def read(self, fn: Callable[..., T], *args: Any, query: Optional[Dict[str, Any]] = None) -> T:
+        """
+        Exécute une lecture fn(*args) sur le store : dans la boucle si les
+        données sont en mémoire (après un éventuel rechargement), sinon dans un thread.
+        query : paramètres de TicketStore.archive_hit pour cette lecture ; si
+        elle peut lire l'archive sur le disque, elle part aussi dans un thread.
+        """
+        if self.store.in_memory:
+            await self._refresh()
+            # Lot en cours d'écriture : la lecture attendrait le commit, hors de la boucle
+            if not self.store.writing() and (query is None or not self.store.archive_hit(**query)):
+                return fn(*args)
+        return await anyio.to_thread.run_sync(fn, *args)
+
+    async def _mutate(self, method: Callable, *args: Any) -> Any:
+        if self.store.in_memory:
+            with stage("write"):
+                return await asyncio.wrap_future(method(*args, wait=False))
+        return await anyio.to_thread.run_sync(method, *args)
+
+    # ---------------- Lecture ----------------
+    async def get(self, ticket_id: int) -> Optional[Dict[str, Any]]:
+        return await self.read(self.store.get, ticket_id, query={"ticket_id": ticket_id})
+
+    async def get_stats(self) -> Dict[str, Any]:
+        return await self.read(self.store.get_stats)
+
+    async def version(self):
+        return await self.read(self.store.version)
+
+    # ---------------- Écriture ----------------
+    async def create(self, ticket: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._mutate(self.store.create, ticket)
+
+    async def create_many(self, tickets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return await self._mutate(self.store.create_many, tickets)
+
+    async def update(self, ticket_id: int, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return await self._mutate(self.store.update, ticket_id, data)
+
+    async def update_many(self, changes: List[Tuple[int, Dict[str, Any]]]) -> List[Optional[Dict[str, Any]]]:
+        return await self._mutate(self.store.update_many, changes)
+
+    async def delete(self, ticket_id: int) -> bool:
+        return await self._mutate(self.store.delete, ticket_id)
+
+    async def delete_many(self, ids: List[int]) -> List[bool]:
+        return await self._mutate(self.store.delete_many, ids)
+
+
+async def get_async_store(request: Request) -> AsyncTicketStore:
+    """
+    Dépendance FastAPI des handlers async. Dépendance `async def` : une
+    dépendance `def` (comme get_store) occuperait un thread du pool à chaque requête.
+    Respecte app.dependency_overrides[get_store] (benchmarks).
+    """
+    provider = request.app.dependency_overrides.get(get_store, get_store)
+    return AsyncTicketStore(provider())
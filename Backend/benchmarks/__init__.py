@@ -0,0 +1 @@
+""" Benchmarks du backend (à lancer depuis Backend/ : python -m benchmarks.<nom>)."""
@@ -0,0 +1,76 @@
+import os
+import sys
+import tempfile
+
+from fastapi.testclient import TestClient
+
+import storage
+from main import app
+from routers.tickets import response_cache
+from sqlite_store import SqliteTicketStore
+from wal import WalBackend
+from benchmarks.common import make_tickets, write_data_file, throughput
+
+""" Comparaison des backends json / wal / sqlite sur les mêmes données.
+
+Pour chaque backend : débit de plusieurs variantes de GET /tickets, puis
+débit de POST /tickets (écritures séquentielles).
+
+Usage : python -m benchmarks.bench_backends [tailles...]   (défaut : 10000 100000)
+"""
+
+GET_VARIANTS = [
+    ("GET page par défaut", {"limit": 50}),
+    ("GET filtre status+tag", {"status": "Open", "tag": "bug", "limit": 50}),
+    ("GET search", {"search": "ticket 12", "limit": 50}),
+    ("GET tri priority", {"sort_by": "priority", "order": "desc", "then_by": "createdAt", "limit": 50}),
+    ("GET offset profond", {"limit": 50, "offset": 5000}),
+]
+
+NEW_TICKET = {
+    "title": "Bench",
+    "description": "Ticket créé par le benchmark",
+    "priority": "Medium",
+    "status": "Open",
+    "tags": ["bench"],
+}
+
+
+def _provide(store):
+    # Pas de paramètre dans la lambda : FastAPI le prendrait pour un query param
+    return lambda: store
+
+
+def _stores(data_file: str):
+    """(nom, store) pour chaque backend, chacun sur sa propre copie des données."""
+    tickets = storage._read_file(data_file)
+    directory = os.path.dirname(data_file)
+    yield "json", storage.TicketStore(storage.JsonFileBackend(write_data_file(tickets, directory)))
+    yield "wal", storage.TicketStore(WalBackend(write_data_file(tickets, directory), storage.WAL_COMPACT_BYTES))
+    yield "sqlite", SqliteTicketStore(os.path.join(directory, "bench.db"), migrate_from=data_file)
+
+
+def run(size: int, budget_s: float = 2.0) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        data_file = write_data_file(make_tickets(size), directory)
+        client = TestClient(app)
+        # Sans cache de réponses : on compare les backends, pas le cache HTTP
+        response_cache.maxsize = 0
+        try:
+            for name, store in _stores(data_file):
+                app.dependency_overrides[storage.get_store] = _provide(store)
+                client.get("/tickets")  # chauffe (chargement, index)
+                for label, params in GET_VARIANTS:
+                    rps = throughput(lambda: client.get("/tickets", params=params), budget_s)
+                    print(f"{size:>8} | {name:<6} | {label:<22} | {rps:10.1f} req/s")
+                rps = throughput(lambda: client.post("/tickets", json=NEW_TICKET), budget_s)
+                print(f"{size:>8} | {name:<6} | {'POST /tickets':<22} | {rps:10.1f} req/s")
+                store.close()
+        finally:
+            app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000]
+    for n in sizes:
+        run(n)
@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+
+import storage
+from benchmarks.common import make_tickets, write_data_file
+from indexes import normalize_tag
+
+""" Filtres status/priority/tag : compréhensions de liste vs index inversés.
+
+Usage : python -m benchmarks.bench_filters [tailles...]   (défaut : 100000)
+"""
+
+QUERIES = [
+    {"status": "Open"},
+    {"tag": "security"},
+    {"status": "Open", "priority": "High", "tag": "security"},
+]
+
+
+def scan(tickets, status=None, priority=None, tag=None):
+    """Ancien chemin de get_tickets."""
+    results = tickets
+    if status is not None:
+        results = [t for t in results if t.get("status") == status]
+    if priority is not None:
+        results = [t for t in results if t.get("priority") == priority]
+    if tag is not None:
+        tag_lc = normalize_tag(tag)
+        results = [t for t in results if tag_lc in [normalize_tag(x) for x in t.get("tags") or [] if str(x).strip()]]
+    return results
+
+
+def best_of(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run(size: int) -> None:
+    path = write_data_file(make_tickets(size))
+    store = storage.TicketStore(storage.JsonFileBackend(path))
+    tickets = store.tickets()
+    try:
+        for q in QUERIES:
+            assert [t["id"] for t in scan(tickets, **q)] == [t["id"] for t in store.filter(**q)]
+            print(f"{size:>9} tickets | {str(q):<58} | scan {best_of(lambda: scan(tickets, **q)):8.2f} ms"
+                  f" | index {best_of(lambda: store.filter(**q)):8.2f} ms")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    for n in [int(a) for a in sys.argv[1:]] or [100_000]:
+        run(n)
@@ -0,0 +1,110 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import storage
+import streaming
+from compact import TicketRecord
+from serialization import loads
+from benchmarks.generator import write_tickets_file
+
+""" Pic mémoire (RSS) de la lecture d'un gros fichier de tickets : d'un bloc vs en flux.
+
+Chaque mode tourne dans un process neuf, dont on relève le pic de RSS
+(ru_maxrss) et la durée. La mémoire du process est plafonnée (--limit-mb,
+RLIMIT_AS) : un mode qui la dépasse est signalé au lieu de faire tuer la
+machine par l'OOM killer.
+
+Modes :
+- json.load      : lecture historique (anciens script.open_read_JSON et load_tickets) ;
+- bloc           : octets du fichier + loads() (orjson si installé) ;
+- liste en flux  : storage.iter_file -> liste (load_tickets au-delà de TICKETS_STREAM_LOAD_BYTES) ;
+- liste compacte : idem, convertie en TicketRecord pendant la lecture (chargement avec TICKETS_COMPACT=1) ;
+- filtre en flux : streaming.stream_tickets(status="Open", tag="bug"), compté sans rien garder ;
+- filtre mmap    : idem, lecture via mmap (le pic RSS compte alors les pages
+                   du fichier mappées : elles restent dans le cache disque et
+                   le noyau peut les reprendre, ce n'est pas de la mémoire du process) ;
+- export en flux : tous les tickets réécrits en NDJSON (vers /dev/null).
+
+Usage : python -m benchmarks.bench_loader [--megabytes 1024] [--limit-mb 4096] [--seed 42]
+"""
+
+MODES = ("json.load", "bloc", "liste en flux", "liste compacte", "filtre en flux", "filtre mmap", "export en flux")
+# Octets par ticket du générateur (moyenne mesurée, pour viser une taille de fichier)
+BYTES_PER_TICKET = 322
+
+
+def _run_mode(mode: str, path: str) -> int:
+    """Exécute un mode et renvoie un nombre de tickets (pour vérifier qu'il a tout lu)."""
+    if mode == "json.load":
+        with open(path, "r", encoding="utf-8") as f:
+            return len(json.load(f))
+    if mode == "bloc":
+        with open(path, "rb") as f:
+            return len(loads(f.read()))
+    if mode == "liste en flux":
+        return len(list(storage.iter_file(path, use_mmap=False)))
+    if mode == "liste compacte":
+        return len(storage._read_file(path, TicketRecord))
+    if mode == "filtre en flux":
+        return sum(1 for _ in streaming.stream_tickets(path, use_mmap=False, status="Open", tag="bug"))
+    if mode == "filtre mmap":
+        return sum(1 for _ in streaming.stream_tickets(path, use_mmap=True, status="Open", tag="bug"))
+    with open(os.devnull, "wb") as out:
+        return streaming.write_ndjson(storage.iter_file(path, use_mmap=False), out)
+
+
+def _child(mode: str, path: str, limit_mb: int) -> None:
+    limit = limit_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    start = time.perf_counter()
+    try:
+        count = _run_mode(mode, path)
+    except MemoryError:
+        print("memoire")
+        return
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{count} {elapsed:.2f} {peak_kb}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pic de RSS : lecture d'un bloc vs en flux.")
+    parser.add_argument("--megabytes", type=int, default=1024, help="taille visée du fichier")
+    parser.add_argument("--limit-mb", type=int, default=4096, help="mémoire max par process")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        _child(args.child[0], args.child[1], args.limit_mb)
+        return
+
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        n = args.megabytes * 1024 * 1024 // BYTES_PER_TICKET
+        write_tickets_file(path, n, args.seed)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        print(f"{n} tickets, fichier de {size_mb:.0f} Mo, mémoire plafonnée à {args.limit_mb} Mo par process")
+        print(f"  {'mode':<15} | {'tickets':>9} | {'durée':>8} | {'pic RSS':>10}")
+        for mode in MODES:
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_loader", "--limit-mb", str(args.limit_mb), "--child", mode, path],
+                capture_output=True, text=True,
+            ).stdout.split()
+            if len(out) != 3:
+                print(f"  {mode:<15} | {'-':>9} | {'-':>8} | > {args.limit_mb} Mo (MemoryError)")
+                continue
+            count, elapsed, peak_kb = int(out[0]), float(out[1]), int(out[2])
+            print(f"  {mode:<15} | {count:>9} | {elapsed:7.1f}s | {peak_kb / 1024:7.0f} Mo")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+import argparse
+import gc
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from typing import Dict, List
+
+import storage
+from compact import TicketRecord
+from fulltext import SearchIndex
+from indexes import TicketIndex
+from sorting import sort_values
+from benchmarks.generator import write_tickets_file
+
+""" Mémoire du store par ticket : dicts (défaut) vs TicketRecord (TICKETS_COMPACT=1).
+
+Pour chaque mode, deux process neufs (les tables partagées de compact.py et
+les chaînes déjà allouées ne faussent pas la mesure suivante) :
+- détail par composant avec tracemalloc : tickets, index, plein texte, clés de tri, id -> ticket ;
+- RSS du process avant / après le chargement complet du store (sans tracemalloc,
+  qui gonfle la RSS).
+
+Usage : python -m benchmarks.bench_memory [--sizes 10000 100000] [--seed 42]
+"""
+
+MODES = ("dict", "compact")
+COMPONENTS = ("tickets", "index", "search", "sort", "by_id")
+
+
+def _rss_bytes() -> int:
+    """RSS courante (Linux : /proc ; ailleurs, pic via resource)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _measure_components(path: str, compact: bool) -> Dict[str, int]:
+    """Octets alloués par composant, construits dans l'ordre du chargement du store."""
+    backend = storage.JsonFileBackend(path)
+    sizes: Dict[str, int] = {}
+    kept: List[object] = []
+    tracemalloc.start()
+
+    def step(name, build):
+        gc.collect()
+        before = tracemalloc.get_traced_memory()[0]
+        kept.append(build())
+        gc.collect()
+        sizes[name] = tracemalloc.get_traced_memory()[0] - before
+
+    def load():
+        return backend.load(TicketRecord) if compact else backend.load()
+
+    step("tickets", load)
+    tickets = kept[0]
+    step("index", lambda: TicketIndex.from_tickets(tickets))
+    step("search", lambda: SearchIndex.from_tickets(tickets))
+    step("sort", lambda: {int(t["id"]): sort_values(t) for t in tickets})
+    step("by_id", lambda: {int(t["id"]): t for t in tickets})
+    tracemalloc.stop()
+    return sizes
+
+
+def _measure_rss(path: str, compact: bool) -> int:
+    store = storage.TicketStore(storage.JsonFileBackend(path), compact=compact)
+    gc.collect()
+    before = _rss_bytes()
+    store.tickets()
+    gc.collect()
+    return _rss_bytes() - before
+
+
+def _child(args) -> None:
+    compact = args.mode == "compact"
+    if args.what == "rss":
+        print(_measure_rss(args.path, compact))
+    else:
+        sizes = _measure_components(args.path, compact)
+        print(" ".join(str(sizes[c]) for c in COMPONENTS))
+
+
+def _run_child(what: str, mode: str, path: str) -> List[int]:
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_memory", "--child", what, mode, path],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return [int(v) for v in out.split()]
+
+
+def run(size: int, seed: int) -> None:
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        write_tickets_file(path, size, seed)
+        print(f"{size} tickets ({os.path.getsize(path) / size:.0f} octets/ticket sur disque), octets/ticket :")
+        print(f"  {'mode':<8} | " + " | ".join(f"{c:>8}" for c in COMPONENTS) + f" | {'total':>8} | {'RSS':>8}")
+        for mode in MODES:
+            sizes = _run_child("components", mode, path)
+            rss = _run_child("rss", mode, path)[0]
+            cols = " | ".join(f"{v / size:8.0f}" for v in sizes)
+            print(f"  {mode:<8} | {cols} | {sum(sizes) / size:8.0f} | {rss / size:8.0f}")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mémoire du store par ticket : dicts vs TicketRecord.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--child", nargs=3, metavar=("WHAT", "MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        args.what, args.mode, args.path = args.child
+        _child(args)
+    else:
+        for n in args.sizes:
+            run(n, args.seed)
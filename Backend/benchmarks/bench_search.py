@@ -0,0 +1,35 @@
+import os
+import sys
+
+import storage
+from benchmarks.common import make_tickets, write_data_file
+from benchmarks.bench_filters import best_of
+from fulltext import contains_text
+
+""" Paramètre search : balayage contains_text vs index plein texte.
+
+Usage : python -m benchmarks.bench_search [tailles...]   (défaut : 100000)
+"""
+
+QUERIES = ["security", "priorité", "tick", "ticket 4242", "description verif"]
+
+
+def run(size: int) -> None:
+    path = write_data_file(make_tickets(size))
+    try:
+        store = storage.TicketStore(storage.JsonFileBackend(path))
+        tickets = store.tickets()
+        for q in QUERIES:
+            needle = q.lower()
+            scan_ms = best_of(lambda: [t for t in tickets if contains_text(t, needle)])
+            index_ms = best_of(lambda: store.filter(search=needle))
+            hits = len(store.filter(search=needle))
+            print(f"{size:>9} tickets | {q!r:<22} | {hits:>7} résultats | contains_text {scan_ms:8.2f} ms"
+                  f" | index {index_ms:8.2f} ms")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    for n in [int(a) for a in sys.argv[1:]] or [100_000]:
+        run(n)
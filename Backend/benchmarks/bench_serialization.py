@@ -0,0 +1,78 @@
+import json
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+
+import serialization
+from benchmarks.common import make_tickets
+
+""" Micro-benchmark de sérialisation, en ms pour 10 000 tickets.
+
+Pour chaque bibliothèque disponible (json, ujson, orjson) :
+- encode / decode compact ;
+- fichier indenté (ancien format) vs compact : temps et taille ;
+Puis les chemins de réponse de GET /tickets :
+- jsonable_encoder + json.dumps (rendu FastAPI par défaut) ;
+- FastJSONResponse.render (sans jsonable_encoder) ;
+- assemblage de tickets pré-encodés (cache du store).
+
+Usage : python -m benchmarks.bench_serialization [nombre de tickets]   (défaut : 10000)
+"""
+
+
+def best_ms(fn, repeat: int = 5) -> float:
+    """Meilleur temps sur quelques exécutions, en ms."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _libs():
+    libs = ["json"]
+    if serialization.ujson is not None:
+        libs.append("ujson")
+    if serialization.orjson is not None:
+        libs.append("orjson")
+    return libs
+
+
+def run(size: int) -> None:
+    tickets = make_tickets(size)
+    scale = 10_000 / size
+    print(f"{size} tickets (temps ramenés à 10k tickets)")
+
+    for lib in _libs():
+        compact = serialization.dumps(tickets, lib=lib)
+        indented = serialization.dumps(tickets, indent=True, lib=lib)
+        enc = best_ms(lambda: serialization.dumps(tickets, lib=lib)) * scale
+        enc_indent = best_ms(lambda: serialization.dumps(tickets, indent=True, lib=lib)) * scale
+        dec = best_ms(lambda: serialization.loads(compact, lib=lib)) * scale
+        print(
+            f"  {lib:<7} | encode {enc:8.2f} ms | encode indenté {enc_indent:8.2f} ms | decode {dec:8.2f} ms"
+            f" | fichier {len(compact) / 1024:8.0f} Ko (indenté {len(indented) / 1024:8.0f} Ko)"
+        )
+
+    page = {"items": tickets, "total": len(tickets), "limit": len(tickets), "offset": 0}
+    meta = {k: v for k, v in page.items() if k != "items"}
+    response = serialization.FastJSONResponse(content=None)
+    cache = [serialization.dumps(t) for t in tickets]
+
+    paths = [
+        ("jsonable_encoder + json.dumps", lambda: json.dumps(jsonable_encoder(page), ensure_ascii=False).encode("utf-8")),
+        (f"FastJSONResponse ({serialization.JSON_LIB})", lambda: response.render(page)),
+        ("tickets pré-encodés", lambda: serialization.encode_list_response(cache, meta)),
+    ]
+    for label, fn in paths:
+        print(f"  réponse | {label:<30} | {best_ms(fn) * scale:8.2f} ms")
+
+    # Les trois chemins produisent le même JSON
+    expected = json.loads(paths[0][1]())
+    assert all(json.loads(fn()) == expected for _, fn in paths[1:])
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,47 @@
+import os
+import sys
+
+import storage
+from benchmarks.common import make_tickets, write_data_file
+from benchmarks.bench_filters import best_of
+from routers.tickets import build_sort_key
+from sorting import SortSpec, select_page
+
+""" Tri + pagination : double tri complet (ancien chemin) vs clés précalculées + heapq.
+
+Usage : python -m benchmarks.bench_sort [tailles...]   (défaut : 100000)
+"""
+
+CASES = [
+    ("createdAt", "desc", None, "desc", 0),
+    ("priority", "desc", "createdAt", "desc", 0),
+    ("title", "desc", "status", "asc", 1000),
+]
+
+
+def old_path(tickets, sort_by, order, then_by, then_order, offset, limit=50):
+    results = list(tickets)
+    if then_by is not None:
+        results.sort(key=build_sort_key(then_by), reverse=(then_order == "desc"))
+    results.sort(key=build_sort_key(sort_by), reverse=(order == "desc"))
+    return results[offset: offset + limit]
+
+
+def run(size: int) -> None:
+    path = write_data_file(make_tickets(size))
+    try:
+        store = storage.TicketStore(storage.JsonFileBackend(path))
+        tickets = store.tickets()
+        for sort_by, order, then_by, then_order, offset in CASES:
+            spec = SortSpec(sort_by, order, then_by, then_order)
+            old_ms = best_of(lambda: old_path(tickets, sort_by, order, then_by, then_order, offset), 3)
+            new_ms = best_of(lambda: select_page(tickets, store.sort_values, spec, offset, 50), 3)
+            label = f"{sort_by} {order}" + (f", {then_by} {then_order}" if then_by else "") + f", offset {offset}"
+            print(f"{size:>9} tickets | {label:<40} | double tri {old_ms:8.2f} ms | top-k {new_ms:8.2f} ms")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    for n in [int(a) for a in sys.argv[1:]] or [100_000]:
+        run(n)
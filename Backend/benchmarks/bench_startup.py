@@ -0,0 +1,148 @@
+import argparse
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+
+from benchmarks.generator import write_tickets_file
+
+""" Temps de démarrage : imports, puis délai jusqu'à la première réponse de GET /tickets.
+
+1. Imports : python -X importtime -c "import main", relancé --repeat fois
+   (meilleur temps), avec les modules les plus coûteux (temps cumulé).
+2. Premier GET /tickets d'un vrai serveur uvicorn lancé sur --size tickets,
+   dans quatre configurations :
+   - sans warm-up ni snapshot : le serveur écoute tout de suite, mais la
+     première requête paie le décodage du JSON et la construction des index
+     (comportement historique) ;
+   - warm-up sans snapshot : chargement complet dans le lifespan ;
+   - warm-up, 1er démarrage : chargement complet puis écriture du snapshot ;
+   - warm-up, redémarrage : index relus depuis le snapshot.
+   Pour chacune : délai jusqu'à ce que le serveur réponde (GET /openapi.json,
+   sans toucher au store), jusqu'à la première réponse de GET /tickets, et
+   durée de cette première requête.
+
+Usage : python -m benchmarks.bench_startup [--size 100000] [--repeat 5] [--backend json]
+        [--output startup.json]
+"""
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS: List[Tuple[str, Dict[str, str]]] = [
+    ("sans warm-up ni snapshot", {"TICKETS_WARMUP": "0", "TICKETS_SNAPSHOT": "0"}),
+    ("warm-up sans snapshot", {"TICKETS_WARMUP": "1", "TICKETS_SNAPSHOT": "0"}),
+    ("warm-up, 1er démarrage", {"TICKETS_WARMUP": "1", "TICKETS_SNAPSHOT": "1"}),
+    ("warm-up, redémarrage", {"TICKETS_WARMUP": "1", "TICKETS_SNAPSHOT": "1"}),
+]
+
+
+def import_times(env: Dict[str, str], repeat: int, top: int) -> Tuple[float, List[Tuple[str, float]]]:
+    """(durée totale de `import main` en s, [(module, durée cumulée en s)]) du meilleur essai."""
+    best = None
+    for _ in range(repeat):
+        err = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import main"],
+            cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+        ).stderr
+        modules = []
+        for line in err.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line.split("|")
+            if not cumulative.strip().isdigit():
+                continue  # ligne d'en-tête
+            modules.append((name.rstrip(), int(cumulative) / 1e6))
+        total = next((t for name, t in modules if name.strip() == "main"), 0.0)
+        if best is None or total < best[0]:
+            # Paquets de premier niveau sous main (indentation de 2 ou 3 espaces)
+            direct = [(name.strip(), t) for name, t in modules if name.startswith("  ") and not name.startswith("    ")]
+            best = (total, sorted(direct, key=lambda m: m[1], reverse=True)[:top])
+    return best
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait(url: str, start: float, deadline: float) -> float:
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=600).status_code == 200:
+                return time.perf_counter() - start
+        except httpx.TransportError:
+            pass
+        time.sleep(0.02)
+    raise SystemExit(f"pas de réponse de {url}")
+
+
+def first_response(env: Dict[str, str]) -> Dict[str, float]:
+    """Démarre uvicorn et mesure : serveur prêt, première réponse de GET /tickets, durée de celle-ci."""
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    try:
+        deadline = time.monotonic() + 600
+        ready = _wait(base_url + "/openapi.json", start, deadline)
+        before = time.perf_counter()
+        first = _wait(base_url + "/tickets?limit=50", start, deadline)
+        return {"ready_s": ready, "first_response_s": first, "first_request_s": time.perf_counter() - before}
+    finally:
+        # Arrêt propre : le lifespan peut encore écrire le snapshot
+        proc.terminate()
+        proc.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Temps d'import et délai jusqu'à la première réponse.")
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5, help="essais de -X importtime")
+    parser.add_argument("--top", type=int, default=8, help="modules affichés")
+    parser.add_argument("--backend", default="json", choices=["json", "wal"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="résultats en JSON (pour comparer deux versions)")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    data_file = os.path.join(directory, "tickets.json")
+    base_env = dict(os.environ, TICKETS_DATA_FILE=data_file, TICKETS_BACKEND=args.backend)
+    results: Dict[str, object] = {"size": args.size, "backend": args.backend}
+    try:
+        total, modules = import_times(base_env, args.repeat, args.top)
+        print(f"import main : {total * 1000:.0f} ms (meilleur de {args.repeat})")
+        for name, seconds in modules:
+            print(f"  {name:<24} {seconds * 1000:7.1f} ms")
+        results["import_s"] = total
+        results["imports"] = dict(modules)
+
+        write_tickets_file(data_file, args.size, args.seed)
+        print(f"\n{args.size} tickets, backend {args.backend}")
+        print(f"  {'configuration':<26} | {'prêt':>7} | {'1re réponse':>11} | {'1re requête':>11}")
+        runs = {}
+        for label, extra in SCENARIOS:
+            run = first_response(dict(base_env, **extra))
+            runs[label] = run
+            print(f"  {label:<26} | {run['ready_s']:6.2f}s | {run['first_response_s']:10.2f}s | "
+                  f"{run['first_request_s'] * 1000:8.0f} ms")
+        results["first_response"] = runs
+    finally:
+        shutil.rmtree(directory)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import os
+import sys
+
+from fastapi.testclient import TestClient
+
+import storage
+from main import app
+from routers.tickets import response_cache
+from benchmarks.common import make_tickets, write_data_file, throughput
+
+""" Débit de GET /tickets : relecture du fichier à chaque requête vs TicketStore en cache,
+puis avec le cache de réponses (même requête répétée) et en revalidation (304).
+
+Usage : python -m benchmarks.bench_store [tailles...]   (défaut : 1000 100000 1000000)
+"""
+
+
+class _ReloadEveryTime(storage.TicketStore):
+    """
+    Ancien chemin : relecture complète du fichier à chaque requête. Forcée
+    dans version(), premier appel de GET /tickets ; query() lit ensuite ce
+    chargement. reloads compte les chargements (vérifié dans run()).
+    """
+
+    reloads = 0
+
+    def version(self):
+        self._loaded = False
+        return super().version()
+
+    def _build_indexes(self, tickets):
+        self.reloads += 1
+        super()._build_indexes(tickets)
+
+
+def _provide(store):
+    # Pas de paramètre dans la lambda : FastAPI le prendrait pour un query param
+    return lambda: store
+
+
+def run(size: int) -> None:
+    path = write_data_file(make_tickets(size))
+    try:
+        client = TestClient(app)
+        params = {"limit": 50}
+        # Sans cache de réponses : on mesure le store
+        response_cache.maxsize = 0
+        for label, store in (
+            ("load_tickets()", _ReloadEveryTime(storage.JsonFileBackend(path), snapshot=False)),
+            ("TicketStore", storage.TicketStore(storage.JsonFileBackend(path))),
+        ):
+            app.dependency_overrides[storage.get_store] = _provide(store)
+            client.get("/tickets")  # chauffe (premier chargement du cache)
+            if isinstance(store, _ReloadEveryTime):
+                before = store.reloads
+                for _ in range(3):
+                    client.get("/tickets", params=params)
+                assert store.reloads == before + 3, "la référence doit relire le fichier à chaque requête"
+            rps = throughput(lambda: client.get("/tickets", params=params))
+            print(f"{size:>9} tickets | {label:<15} | {rps:10.1f} req/s")
+
+        response_cache.maxsize = 128
+        etag = client.get("/tickets", params=params).headers["ETag"]
+        rps = throughput(lambda: client.get("/tickets", params=params))
+        print(f"{size:>9} tickets | {'cache réponses':<15} | {rps:10.1f} req/s")
+        rps = throughput(lambda: client.get("/tickets", params=params, headers={"If-None-Match": etag}))
+        print(f"{size:>9} tickets | {'304':<15} | {rps:10.1f} req/s")
+    finally:
+        app.dependency_overrides.clear()
+        response_cache.clear()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    sizes = [int(a) for a in sys.argv[1:]] or [1_000, 100_000, 1_000_000]
+    for n in sizes:
+        run(n)
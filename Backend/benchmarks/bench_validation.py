@@ -0,0 +1,169 @@
+import argparse
+import gc
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from pydantic import ValidationError
+
+import models
+from models import TicketBatchItem, TicketCreate, payload_to_dict, validate_batch_items, validate_creates
+from benchmarks.generator import generate_tickets
+
+""" Validation des tickets reçus en lot : modèles historiques vs chemin rapide Pydantic v2.
+
+Deux chemins pour les mêmes dicts (créations, puis éléments de PATCH /tickets) :
+- modèles  : TicketCreate(**raw) / TicketBatchItem(**raw) élément par élément,
+             puis conversion en dict ;
+- lot (v2) : models.validate_creates / validate_batch_items (TypeAdapter sur
+             une liste des mêmes modèles, toute la liste en un appel).
+
+Les éléments sont validés par paquets de --chunk (comme POST /tickets/bulk,
+voir BULK_CHUNK_LINES). Une part des éléments (--invalid) est invalide : les deux chemins doivent
+accepter les mêmes éléments, produire les mêmes dicts, et refuser les autres
+avec les mêmes erreurs (loc + message). Code de sortie 1 à la première différence.
+
+Usage : python -m benchmarks.bench_validation [--size 20000] [--invalid 0.01] [--chunk 500] [--repeat 5]
+"""
+
+Result = Tuple[List[Tuple[int, Dict[str, Any]]], List[Tuple[int, List[Dict[str, Any]]]]]
+
+
+def _breakers(rnd: random.Random) -> List[Callable[[Dict[str, Any]], None]]:
+    """Façons de rendre un élément invalide (ou limite : blancs, tags vides)."""
+    return [
+        lambda t: t.update(title="   "),
+        lambda t: t.update(title=""),
+        lambda t: t.update(description="x" * (models.MAX_DESC_LEN + 1)),
+        lambda t: t.update(priority=rnd.choice(["Urgent", "low", None, 3])),
+        lambda t: t.update(status=rnd.choice(["Fermé", "", None])),
+        lambda t: t.update(tags=["tag"] * (models.MAX_TAGS + 1)),
+        lambda t: t.update(tags=["bug", "x" * (models.MAX_TAG_LEN + 1)]),
+        lambda t: t.update(tags=["bug", 12]),
+        lambda t: t.update(tags="bug"),
+        lambda t: t.update(tags=["  ", " ui ", ""]),
+        lambda t: t.update(title=f"  {t.get('title', '')}  "),
+        lambda t: t.update(title="  " + "x" * (models.MAX_TITLE_LEN - 1) + "  "),
+        lambda t: t.pop("description", None),
+        lambda t: t.update(id="abc"),
+    ]
+
+
+def make_items(size: int, invalid: float, seed: int) -> List[Dict[str, Any]]:
+    rnd = random.Random(seed)
+    breakers = _breakers(rnd)
+    items = generate_tickets(size, seed)
+    for item in items:
+        if rnd.random() < invalid:
+            rnd.choice(breakers)(item)
+    return items
+
+
+def make_updates(items: List[Dict[str, Any]], seed: int) -> List[Dict[str, Any]]:
+    """Éléments {id, quelques champs} tirés des tickets (invalides compris)."""
+    rnd = random.Random(seed)
+    fields = ["title", "description", "priority", "status", "tags"]
+    updates = []
+    for item in items:
+        update = {"id": item.get("id")}
+        for field in rnd.sample(fields, rnd.randint(1, 3)):
+            if field in item:
+                update[field] = item[field]
+        updates.append(update)
+    return updates
+
+
+def by_models(model, dump: Callable[[Any], Dict[str, Any]], items: List[Dict[str, Any]]) -> Result:
+    valid: List[Tuple[int, Dict[str, Any]]] = []
+    errors: List[Tuple[int, List[Dict[str, Any]]]] = []
+    for i, raw in enumerate(items):
+        try:
+            valid.append((i, dump(model(**raw))))
+        except ValidationError as e:
+            errors.append((i, e.errors()))
+    return valid, errors
+
+
+Validate = Callable[[List[Dict[str, Any]]], Result]
+
+
+def by_chunks(validate: Validate, chunks: List[List[Dict[str, Any]]]) -> Result:
+    valid: List[Tuple[int, Dict[str, Any]]] = []
+    errors: List[Tuple[int, List[Dict[str, Any]]]] = []
+    start = 0
+    for chunk in chunks:
+        chunk_valid, chunk_errors = validate(chunk)
+        valid.extend((start + i, data) for i, data in chunk_valid)
+        errors.extend((start + i, errs) for i, errs in chunk_errors)
+        start += len(chunk)
+    return valid, errors
+
+
+def _comparable(result: Result):
+    valid, errors = result
+    return valid, [(i, [(tuple(err["loc"]), err["msg"]) for err in errs]) for i, errs in errors]
+
+
+def _best(paths: List[Validate], chunks: List[List[Dict[str, Any]]], repeat: int) -> List[float]:
+    """Meilleur temps de chaque chemin, essais alternés (la machine varie moins entre deux essais voisins)."""
+    best = [float("inf")] * len(paths)
+    for _ in range(repeat):
+        for n, validate in enumerate(paths):
+            start = time.perf_counter()
+            for chunk in chunks:
+                validate(chunk)
+            best[n] = min(best[n], time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Validation en lot : modèles vs TypeAdapter.")
+    parser.add_argument("--size", type=int, default=20_000)
+    parser.add_argument("--invalid", type=float, default=0.01, help="part d'éléments invalides")
+    parser.add_argument("--chunk", type=int, default=500, help="éléments validés par appel")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if models.TypeAdapter is None:
+        print("Pydantic v1 : pas de chemin rapide, validation par les modèles uniquement")
+    items = make_items(args.size, args.invalid, args.seed)
+    updates = make_updates(items, args.seed)
+    # Comme le serveur après warm_up : les données déjà chargées ne sont plus
+    # parcourues par le ramasse-miettes à chaque paquet validé
+    gc.collect()
+    gc.freeze()
+    create_dump = lambda p: payload_to_dict(p, exclude_unset=False)  # noqa: E731
+    cases = [
+        ("créations", items, lambda chunk: by_models(TicketCreate, create_dump, chunk), validate_creates),
+        ("PATCH (lot)", updates, lambda chunk: by_models(TicketBatchItem, payload_to_dict, chunk), validate_batch_items),
+    ]
+
+    failed = False
+    print(f"{args.size} éléments par paquets de {args.chunk}, ~{args.invalid:.0%} invalides, meilleur de {args.repeat}")
+    print(f"  {'':<12} | {'modèles':>14} | {'lot (v2)':>14} | gain")
+    for label, data, old, new in cases:
+        chunks = [data[start:start + args.chunk] for start in range(0, len(data), args.chunk)]
+        old_result, new_result = _comparable(by_chunks(old, chunks)), _comparable(by_chunks(new, chunks))
+        if old_result != new_result:
+            failed = True
+            old_valid, new_valid = dict(old_result[0]), dict(new_result[0])
+            old_errors, new_errors = dict(old_result[1]), dict(new_result[1])
+            for i in range(len(data)):
+                if (old_valid.get(i), old_errors.get(i)) != (new_valid.get(i), new_errors.get(i)):
+                    print(f"DIFFÉRENCE ({label}) pour {data[i]} :")
+                    print(f"  modèles  : {old_valid.get(i) or old_errors.get(i)}")
+                    print(f"  lot (v2) : {new_valid.get(i) or new_errors.get(i)}")
+                    break
+            continue
+        old_s, new_s = _best([old, new], chunks, args.repeat)
+        print(f"  {label:<12} | {len(data) / old_s:9.0f} tk/s | {len(data) / new_s:9.0f} tk/s | x{old_s / new_s:.1f}"
+              f"   ({len(old_result[1])} refusés)")
+    if failed:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import storage
+from fulltext import SEARCH_MODES
+from sorting import ALLOWED_SORT_BY, SortSpec
+from benchmarks.generator import TAGS, write_tickets_file
+
+""" Vérifie l'archive des tickets fermés (TICKETS_ARCHIVE_DAYS, voir archive.py)
+contre un store sans archive, puis compare leurs temps.
+
+Deux stores sur la même copie des données : référence (tout en mémoire) et
+archive (tickets Closed créés il y a plus de --days jours déplacés dans les
+segments). Doivent être identiques (ids de la page, total, curseur suivant) :
+- les requêtes qui visent l'archive : status=Closed, ou created_from /
+  created_to sans autre statut, avec filtres, tris, offset et curseurs suivis
+  page par page ;
+- celles sur Open / In progress (jamais archivés) ;
+- get(id), les stats, l'export complet (iter_tickets).
+Les temps comprennent un GET status=Closed juste après le PATCH d'un ticket
+archivé : seul ce ticket sort du store de lecture de l'archive, sans relecture.
+Les mêmes mutations sont appliquées aux deux stores (tickets archivés
+rouverts, modifiés sans être rouverts, supprimés ; créations), puis tout est
+revérifié, et encore après relecture du disque par un nouveau store.
+
+Usage : python -m benchmarks.check_archive [--size 20000] [--days 365] [--queries 300] [--engine python]
+Code de sortie 1 à la première différence.
+"""
+
+PRIORITIES = ["Low", "Medium", "High", None, None]
+WORDS = ["erreur", "connexion", "export", "lent", "zzz", None, None, None]
+DAYS = ["2023-01-01", "2023-06-15", "2024-02-29", "2024-12-31", "2025-03-01", "2025-11-20", "2026-01-01", None]
+
+
+def random_query(rnd: random.Random) -> Dict[str, Any]:
+    created_from, created_to = rnd.choice(DAYS), rnd.choice(DAYS)
+    status = rnd.choice(["Closed", "Closed", "Open", "In progress", None])
+    if status is None and created_from is None and created_to is None:
+        created_from = "2024-01-01"
+    return {
+        "status": status,
+        "priority": rnd.choice(PRIORITIES),
+        "tag": rnd.choice(TAGS[:6] + [None] * 6),
+        "search": rnd.choice(WORDS),
+        "search_mode": rnd.choice(sorted(SEARCH_MODES)),
+        "sort": SortSpec(
+            rnd.choice(sorted(ALLOWED_SORT_BY)),
+            rnd.choice(["asc", "desc"]),
+            rnd.choice(sorted(ALLOWED_SORT_BY) + [None]),
+            rnd.choice(["asc", "desc"]),
+        ),
+        "offset": rnd.choice([0, 0, 0, 7, 120]),
+        "limit": rnd.choice([1, 10, 50, 200]),
+        "created_from": created_from,
+        "created_to": created_to,
+    }
+
+
+def _page(store: storage.TicketStore, params: Dict[str, Any], after: Optional[List[Any]] = None):
+    page = store.query(**params, after=after)
+    return [int(t["id"]) for t in page.items], page.total, page.next_after
+
+
+def _fail(message: str) -> None:
+    print(f"DIFFÉRENCE : {message}")
+    sys.exit(1)
+
+
+def compare(ref: storage.TicketStore, arch: storage.TicketStore, rnd: random.Random, queries: int) -> int:
+    """Compare les deux stores ; renvoie le nombre de pages comparées."""
+    pages = 0
+    for _ in range(queries):
+        params = random_query(rnd)
+        after = None
+        for _ in range(3):
+            expected, got = _page(ref, params, after), _page(arch, params, after)
+            pages += 1
+            if got != expected:
+                _fail(f"{params} (after={after})\n  référence ids={expected[0][:20]} total={expected[1]}"
+                      f"\n  archive   ids={got[0][:20]} total={got[1]}")
+            after = expected[2]
+            if after is None:
+                break
+            params = {**params, "offset": 0}
+    for tid in rnd.sample(range(1, ref.get_stats()["total"] + 50), 200):
+        if ref.get(tid) != arch.get(tid):
+            _fail(f"get({tid}) : {ref.get(tid)} / {arch.get(tid)}")
+    ref_stats, arch_stats = ref.get_stats(), arch.get_stats()
+    if ref_stats != arch_stats:
+        _fail(f"stats\n  référence {ref_stats}\n  archive   {arch_stats}")
+    if [t for c in ref.iter_tickets() for t in c] != [t for c in arch.iter_tickets() for t in c]:
+        _fail("export (iter_tickets)")
+    return pages
+
+
+def mutate(stores: List[storage.TicketStore], archived: List[int], rnd: random.Random) -> List[int]:
+    """Mêmes mutations sur chaque store ; renvoie les ids des tickets rouverts."""
+    picked = rnd.sample(archived, min(len(archived), 300))
+    reopened, edited, deleted = picked[:100], picked[100:200], picked[200:]
+    new = [
+        {"title": f"Nouveau ticket {i}", "description": "Créé par check_archive.", "priority": "High",
+         "status": "Open", "tags": ["bug"], "createdAt": "2026-05-01"}
+        for i in range(50)
+    ]
+    for store in stores:
+        futures = [store.create_many([dict(t, tags=list(t["tags"])) for t in new], wait=False)]
+        futures += [store.update(tid, {"status": "Open"}, wait=False) for tid in reopened]
+        futures += [store.update(tid, {"title": "Titre modifié"}, wait=False) for tid in edited]
+        futures.append(store.delete_many(deleted, wait=False))
+        for future in futures:
+            future.result()
+    return reopened
+
+
+def _size(path: str) -> int:
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def _best(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def timings(ref: storage.TicketStore, arch: storage.TicketStore, repeat: int, archived: List[int]) -> None:
+    active = {"status": "Open", "sort": SortSpec("createdAt", "desc"), "limit": 50}
+    listing = {"sort": SortSpec("priority", "desc", "createdAt"), "limit": 50}
+    closed = {"status": "Closed", "sort": SortSpec("createdAt", "desc"), "limit": 50}
+    tid = int(ref.query(status="Open", limit=1).items[0]["id"])
+    # Un ticket archivé différent à chaque mesure (le même pour les deux stores)
+    restored = {id(ref): iter(archived[::-1]), id(arch): iter(archived[::-1])}
+
+    def patch_archived(s: storage.TicketStore) -> None:
+        s.update(next(restored[id(s)]), {"priority": "Low"})
+        s.query(**closed)
+    cases = [
+        ("GET status=Open", lambda s: s.query(**active)),
+        ("GET sans filtre (tri priorité)", lambda s: s.query(**listing)),
+        ("GET status=Closed", lambda s: s.query(**closed)),
+        ("stats", lambda s: s.get_stats()),
+        ("PATCH (écriture)", lambda s: s.update(tid, {"priority": "Low"})),
+        ("PATCH archivé + GET Closed", patch_archived),
+    ]
+    print(f"  {'':<30} | {'référence':>10} | {'archive':>10}")
+    for label, fn in cases:
+        ref_s, arch_s = _best(lambda: fn(ref), repeat), _best(lambda: fn(arch), repeat)
+        print(f"  {label:<30} | {ref_s * 1000:7.2f} ms | {arch_s * 1000:7.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Archive des tickets fermés : équivalence et temps.")
+    parser.add_argument("--size", type=int, default=20_000)
+    parser.add_argument("--days", type=int, default=365, help="âge (jours) au-delà duquel un ticket Closed est archivé")
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--engine", default="python", choices=["python", "numpy"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rnd = random.Random(args.seed)
+
+    directory = tempfile.mkdtemp()
+    try:
+        source = os.path.join(directory, "source.json")
+        write_tickets_file(source, args.size, args.seed)
+        paths = {name: os.path.join(directory, f"{name}.json") for name in ("ref", "arch")}
+        for path in paths.values():
+            shutil.copy(source, path)
+
+        def open_stores():
+            return (
+                storage.TicketStore(storage.JsonFileBackend(paths["ref"]), engine=args.engine, archive_days=0),
+                storage.TicketStore(storage.JsonFileBackend(paths["arch"]), engine=args.engine, archive_days=args.days),
+            )
+
+        ref, arch = open_stores()
+        start = time.perf_counter()
+        moved = arch.archive_closed()
+        print(f"{args.size} tickets : {moved} archivés en {time.perf_counter() - start:.2f} s")
+        print(f"  données actives : {_size(paths['ref']) / 1e6:.1f} Mo -> {_size(paths['arch']) / 1e6:.1f} Mo"
+              f" (+ archive gzip {_size(paths['arch'] + '.archive') / 1e6:.1f} Mo)")
+        if not moved:
+            sys.exit("Aucun ticket archivé : rien à comparer (voir --days).")
+        archived = sorted(set(int(t["id"]) for c in ref.iter_tickets() for t in c)
+                          - set(int(t["id"]) for t in arch.tickets()))
+
+        pages = compare(ref, arch, rnd, args.queries)
+        print(f"  {pages} pages identiques")
+        timings(ref, arch, args.repeat, archived)
+
+        reopened = mutate([ref, arch], archived, rnd)
+        active = set(int(t["id"]) for t in arch.tickets())
+        if not active.issuperset(reopened):
+            _fail("tickets rouverts absents du store actif")
+        pages = compare(ref, arch, rnd, args.queries)
+        print(f"après mutations : {pages} pages identiques")
+
+        for store in (ref, arch):
+            store.close()
+        ref, arch = open_stores()
+        pages = compare(ref, arch, rnd, args.queries)
+        print(f"après relecture du disque : {pages} pages identiques")
+        for store in (ref, arch):
+            store.close()
+    finally:
+        shutil.rmtree(directory)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
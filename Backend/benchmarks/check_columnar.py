@@ -0,0 +1,170 @@
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import storage
+from fulltext import SEARCH_MODES
+from sorting import ALLOWED_SORT_BY, SortSpec
+from benchmarks.generator import TAGS, write_tickets_file
+
+""" Vérifie que le moteur colonnes (TICKETS_QUERY_ENGINE=numpy) renvoie exactement
+les mêmes résultats que le chemin Python, puis compare leurs temps.
+
+Deux stores sur la même copie des données, l'un par moteur. Pour des
+requêtes tirées au hasard (filtres, recherche, tris, offset, curseurs suivis
+page par page), les ids de la page, le total et le curseur suivant doivent
+être identiques ; les stats aussi (construites par np.bincount au chargement).
+Les mêmes mutations (créations, modifications de tags/titre/statut,
+suppressions en masse) sont ensuite appliquées aux deux stores, et tout est
+revérifié : mises à jour incrémentales des colonnes, fusion du CSR des tags,
+retrait des lignes mortes.
+
+Usage : python -m benchmarks.check_columnar [--size 5000] [--queries 500] [--seed 7]
+Code de sortie 1 à la première différence.
+"""
+
+STATUSES = ["Open", "In progress", "Closed", "Inconnu"]
+PRIORITIES = ["Low", "Medium", "High", "Urgent"]
+WORDS = ["erreur", "connexion", "export", "lent", "pai", "mise à jour", "zzz", "iOS", "données", "!!"]
+
+
+def random_query(rnd: random.Random) -> Dict[str, Any]:
+    sort_by = rnd.choice(sorted(ALLOWED_SORT_BY))
+    params: Dict[str, Any] = {
+        "status": rnd.choice(STATUSES + [None] * 4),
+        "priority": rnd.choice(PRIORITIES + [None] * 4),
+        "tag": rnd.choice(TAGS[:8] + ["BUG ", "absent"] + [None] * 8),
+        "search": rnd.choice(WORDS + [None] * 6),
+        "search_mode": rnd.choice(sorted(SEARCH_MODES)),
+        "sort": SortSpec(
+            sort_by,
+            rnd.choice(["asc", "desc"]),
+            rnd.choice(sorted(ALLOWED_SORT_BY) + [None]),
+            rnd.choice(["asc", "desc"]),
+        ),
+        "offset": rnd.choice([0, 0, 0, 5, 50, 10_000]),
+        "limit": rnd.choice([1, 10, 50, 200]),
+    }
+    if params["sort"].primary[0] == "id" and not any(
+        params[k] for k in ("status", "priority", "tag", "search")
+    ):
+        # Liste complète par id : servie par page_by_id dans les deux moteurs
+        params["status"] = "Open"
+    return params
+
+
+def _page(store: storage.TicketStore, params: Dict[str, Any], after: Optional[List[Any]] = None):
+    page = store.query(**params, after=after)
+    return [int(t["id"]) for t in page.items], page.total, page.next_after
+
+
+def compare(stores: Dict[str, storage.TicketStore], rnd: random.Random, queries: int) -> int:
+    """Compare les moteurs sur des requêtes aléatoires ; renvoie le nombre de pages comparées."""
+    pages = 0
+    for _ in range(queries):
+        params = random_query(rnd)
+        after = None
+        # Suivi du curseur sur quelques pages (offset seulement sur la première)
+        for _ in range(3):
+            results = {name: _page(store, params, after) for name, store in stores.items()}
+            pages += 1
+            expected = results["python"]
+            if results["numpy"] != expected:
+                print(f"DIFFÉRENCE pour {params} (after={after}) :")
+                for name, result in results.items():
+                    print(f"  {name:<6} ids={result[0][:20]} total={result[1]} next={result[2]}")
+                sys.exit(1)
+            after = expected[2]
+            if after is None:
+                break
+            params = {**params, "offset": 0}
+    for store in stores.values():
+        store.invalidate()  # stats : le moteur numpy les reconstruit par bincount
+    # Ordre des clés compris (JSON identique)
+    stats = {
+        name: [(k, list(v.items()) if isinstance(v, dict) else v) for k, v in store.get_stats().items()]
+        for name, store in stores.items()
+    }
+    if stats["numpy"] != stats["python"]:
+        print("DIFFÉRENCE dans les stats")
+        sys.exit(1)
+    return pages
+
+
+def mutate(stores: Dict[str, storage.TicketStore], rnd: random.Random, size: int) -> None:
+    """Mêmes mutations sur chaque store (IDs attribués identiques)."""
+    ids = [int(t["id"]) for t in stores["python"].tickets()]
+    new = [
+        {"title": f"Nouveau ticket {i}", "description": "Créé par check_columnar.", "priority": "High",
+         "status": "Open", "tags": rnd.sample(TAGS, 2) + ["Nouveau-Tag"], "createdAt": "2026-05-01"}
+        for i in range(size // 10)
+    ]
+    patches = []
+    for tid in rnd.sample(ids, min(len(ids), size // 4)):
+        data = rnd.choice([
+            {"status": rnd.choice(STATUSES)},
+            {"priority": rnd.choice(PRIORITIES), "title": rnd.choice(["Zèbre", "aaa", "Erreur lors de"])},
+            {"tags": rnd.sample(TAGS, rnd.randint(0, 3))},
+            {"createdAt": rnd.choice(["2024-02-29", "pas une date", ""])},
+        ])
+        patches.append((tid, data))
+    # Plus de la moitié des tickets : déclenche le retrait des lignes mortes
+    deleted = rnd.sample(ids, len(ids) * 6 // 10)
+    for store in stores.values():
+        futures = [store.create_many([dict(t, tags=list(t["tags"])) for t in new], wait=False)]
+        futures += [store.update(tid, data, wait=False) for tid, data in patches]
+        futures += [store.delete(tid, wait=False) for tid in deleted]
+        for future in futures:
+            future.result()
+
+
+def timings(stores: Dict[str, storage.TicketStore], rnd: random.Random, queries: int) -> None:
+    params_list = [random_query(rnd) for _ in range(queries)]
+    for name, store in stores.items():
+        start = time.perf_counter()
+        for params in params_list:
+            store.query(**params)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<6} : {elapsed / queries * 1000:7.3f} ms/requête")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Équivalence et temps du moteur colonnes vs chemin Python.")
+    parser.add_argument("--size", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rnd = random.Random(args.seed)
+
+    directory = tempfile.mkdtemp()
+    try:
+        source = os.path.join(directory, "source.json")
+        write_tickets_file(source, args.size, args.seed)
+        stores = {}
+        for engine in ("python", "numpy"):
+            path = os.path.join(directory, f"{engine}.json")
+            shutil.copy(source, path)
+            stores[engine] = storage.TicketStore(storage.JsonFileBackend(path), engine=engine)
+        if stores["numpy"].engine != "numpy":
+            sys.exit("NumPy n'est pas installé : rien à comparer.")
+
+        pages = compare(stores, rnd, args.queries)
+        print(f"{args.size} tickets : {pages} pages identiques")
+        timings(stores, rnd, args.queries)
+        mutate(stores, rnd, args.size)
+        pages = compare(stores, rnd, args.queries)
+        print(f"après mutations ({len(stores['python'].tickets())} tickets) : {pages} pages identiques")
+        for store in stores.values():
+            store.close()
+    finally:
+        shutil.rmtree(directory)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+from typing import Any, Dict, List, Tuple
+
+""" Vérifie que les erreurs de validation des tickets n'ont pas changé.
+
+Les erreurs attendues (loc + message) sont celles des modèles historiques
+(validators _clean_text / _clean_tags, PRIORITY_ERROR, STATUS_ERROR ; longueur
+max vérifiée avant le strip), relevées avant la validation par lots et figées
+ici. Chaque cas passe par tous les chemins qui valident des tickets :
+- les modèles seuls (TicketCreate / TicketUpdate) ;
+- la validation par lots (models.validate_creates / validate_batch_items) ;
+- l'API : POST /tickets, POST /tickets/bulk, PATCH /tickets/{id}, PATCH /tickets.
+
+Messages Pydantic v2 (les messages anglais des contraintes natives en dépendent).
+
+Usage : python -m benchmarks.check_validation_errors
+Code de sortie 1 à la première différence.
+"""
+
+Errors = List[Tuple[Tuple[Any, ...], str]]
+
+T, D = "Titre", "Description"
+EMPTY = "Value error, Ne peut pas être vide."
+PRIORITY = "Value error, Priorité invalide. Valeurs possibles: ['High', 'Low', 'Medium']"
+STATUS = "Value error, Statut invalide. Valeurs possibles: ['Closed', 'In progress', 'Open']"
+TOO_MANY_TAGS = "Value error, Maximum 20 tags autorisés."
+TAG_TOO_LONG = "Value error, Un tag ne doit pas dépasser 30 caractères."
+NOT_STR = "Input should be a valid string"
+
+CREATE_CASES: List[Tuple[Dict[str, Any], Errors]] = [
+    ({"title": "   ", "description": D}, [(("title",), EMPTY)]),
+    ({"title": "", "description": D}, [(("title",), "String should have at least 1 character")]),
+    ({"title": "x" * 121, "description": D}, [(("title",), "String should have at most 120 characters")]),
+    # 119 caractères + blancs : longueur max vérifiée sur la valeur brute
+    ({"title": "  " + "x" * 119 + "  ", "description": D}, [(("title",), "String should have at most 120 characters")]),
+    ({"title": T, "description": "x" * 2001}, [(("description",), "String should have at most 2000 characters")]),
+    ({"title": T}, [(("description",), "Field required")]),
+    ({"title": 3, "description": D}, [(("title",), NOT_STR)]),
+    ({"title": T, "description": D, "priority": "Urgent"}, [(("priority",), PRIORITY)]),
+    ({"title": T, "description": D, "priority": None}, [(("priority",), NOT_STR)]),
+    ({"title": T, "description": D, "status": "Fermé"}, [(("status",), STATUS)]),
+    ({"title": T, "description": D, "tags": ["tag"] * 21}, [(("tags",), TOO_MANY_TAGS)]),
+    ({"title": T, "description": D, "tags": ["bug", "x" * 31]}, [(("tags",), TAG_TOO_LONG)]),
+    ({"title": T, "description": D, "tags": ["bug", " " + "x" * 30 + " "]}, []),
+    ({"title": T, "description": D, "tags": ["bug", 12]}, [(("tags", 1), NOT_STR)]),
+    ({"title": T, "description": D, "tags": "bug"}, [(("tags",), "Input should be a valid list")]),
+]
+
+UPDATE_CASES: List[Tuple[Dict[str, Any], Errors]] = [
+    ({"title": "  "}, [(("title",), EMPTY)]),
+    ({"title": "x" * 121}, [(("title",), "String should have at most 120 characters")]),
+    ({"title": "  " + "x" * 119 + "  "}, [(("title",), "String should have at most 120 characters")]),
+    ({"description": ""}, [(("description",), "String should have at least 1 character")]),
+    ({"priority": "low", "status": "Fermé"}, [(("status",), STATUS), (("priority",), PRIORITY)]),
+    ({"tags": ["tag"] * 21}, [(("tags",), TOO_MANY_TAGS)]),
+    ({"tags": ["x" * 31]}, [(("tags",), TAG_TOO_LONG)]),
+]
+
+
+def _errors(errs: List[Dict[str, Any]], strip: int = 0) -> Errors:
+    """(loc sans ses `strip` premiers éléments, message) de chaque erreur."""
+    return [(tuple(err["loc"])[strip:], err["msg"]) for err in errs]
+
+
+def _check(where: str, payload: Dict[str, Any], expected: Errors, got: Errors) -> None:
+    if got != expected:
+        print(f"DIFFÉRENCE ({where}) : {json.dumps(payload, ensure_ascii=False)[:120]}"
+              f"\n  attendu {expected}\n  obtenu  {got}")
+        sys.exit(1)
+
+
+def check_models() -> int:
+    from pydantic import ValidationError
+
+    from models import TicketCreate, TicketUpdate, validate_batch_items, validate_creates
+
+    for model, cases in ((TicketCreate, CREATE_CASES), (TicketUpdate, UPDATE_CASES)):
+        for payload, expected in cases:
+            try:
+                model(**payload)
+                got: Errors = []
+            except ValidationError as e:
+                got = _errors(e.errors())
+            _check(model.__name__, payload, expected, got)
+
+    payloads, expected = zip(*CREATE_CASES)
+    _, invalid = validate_creates([dict(p) for p in payloads])
+    got_by_index = dict(invalid)
+    for i, payload in enumerate(payloads):
+        _check("validate_creates", payload, expected[i], _errors(got_by_index.get(i, [])))
+
+    payloads, expected = zip(*UPDATE_CASES)
+    _, invalid = validate_batch_items([{"id": 1, **p} for p in payloads])
+    got_by_index = dict(invalid)
+    for i, payload in enumerate(payloads):
+        _check("validate_batch_items", payload, expected[i], _errors(got_by_index.get(i, [])))
+    return 2 * (len(CREATE_CASES) + len(UPDATE_CASES))
+
+
+def check_api() -> int:
+    from fastapi.testclient import TestClient
+
+    from main import app
+
+    checked = 0
+    with TestClient(app) as client:
+        tid = client.post("/tickets", json={"title": T, "description": D}).json()["id"]
+        for payload, expected in CREATE_CASES:
+            r = client.post("/tickets", json=payload)
+            _check("POST /tickets", payload, expected, _errors(r.json()["detail"], 1) if r.status_code == 422 else [])
+            r = client.post("/tickets/bulk", content=json.dumps(payload).encode())
+            errors = r.json()["errors"]
+            _check("POST /tickets/bulk", payload, expected, _errors(errors[0]["errors"]) if errors else [])
+            checked += 2
+        for payload, expected in UPDATE_CASES:
+            r = client.patch(f"/tickets/{tid}", json=payload)
+            _check("PATCH /tickets/{id}", payload, expected, _errors(r.json()["detail"], 1))
+            r = client.patch("/tickets", json={"items": [{"id": tid, **payload}]})
+            # loc : body, items, indice, champ...
+            _check("PATCH /tickets", payload, expected, _errors(r.json()["detail"], 3))
+            checked += 2
+    return checked
+
+
+def main() -> None:
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "tickets.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([], f)
+        # Avant l'import de main : get_store() lit TICKETS_DATA_FILE
+        os.environ["TICKETS_DATA_FILE"] = path
+        checked = check_models() + check_api()
+    finally:
+        shutil.rmtree(directory)
+    print(f"{checked} cas identiques aux erreurs historiques")
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
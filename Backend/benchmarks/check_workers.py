@@ -0,0 +1,205 @@
+import argparse
+import os
+import random
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+import httpx
+
+import storage
+from benchmarks.generator import write_tickets_file
+
+""" Vérifie le mode multi-workers : uvicorn --workers N sur le même dossier de données.
+
+Démarre un vrai serveur uvicorn avec plusieurs process, puis :
+1. lecture de ses écritures : chaque création / modification / suppression
+   est relue aussitôt sur de nouvelles connexions (donc, au hasard, par
+   d'autres workers), qui doivent toutes voir le changement ;
+2. écritures concurrentes depuis plusieurs threads (création, PATCH, PATCH
+   et DELETE en lot) ;
+3. cohérence finale : chaque worker interrogé renvoie les mêmes stats et les
+   mêmes tickets que l'état relu sur le disque par un store neuf.
+
+Affiche ensuite, pour les workers vus sur /metrics, le nombre de chargements
+complets (load) et de rejeux incrémentaux du journal (load_changes).
+
+Usage : python -m benchmarks.check_workers [--workers 4] [--size 10000] [--backend wal]
+        [--writes 400] [--threads 16] [--seed 3]
+Code de sortie 1 à la première incohérence.
+"""
+
+_STORAGE_COUNT = re.compile(r'tickets_storage_seconds_(count|sum)\{op="(load|load_changes)",backend="\w+"\} (\S+)')
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(data_file: str, args: argparse.Namespace) -> Tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = dict(
+        os.environ,
+        TICKETS_DATA_FILE=data_file,
+        TICKETS_BACKEND=args.backend,
+        TICKETS_SQLITE_FILE=data_file + ".db",
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+         "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 120
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(base_url + "/tickets/stats", timeout=30).status_code == 200:
+                return proc, base_url
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    proc.kill()
+    raise SystemExit("le serveur n'a pas démarré")
+
+
+def _fail(message: str) -> None:
+    print(f"INCOHÉRENCE : {message}")
+    sys.exit(1)
+
+
+def _fresh(base_url: str) -> httpx.Client:
+    """Client sans keep-alive : chaque requête ouvre une connexion, servie par un worker quelconque."""
+    return httpx.Client(base_url=base_url, timeout=60, limits=httpx.Limits(max_keepalive_connections=0))
+
+
+def read_your_writes(client: httpx.Client, workers: int) -> None:
+    reads = 2 * workers
+    created = client.post("/tickets", json={"title": "Multi-workers", "description": "Relu partout.", "tags": ["mw"]})
+    tid = created.json()["id"]
+    for _ in range(reads):
+        r = client.get(f"/tickets/{tid}")
+        if r.status_code != 200:
+            _fail(f"ticket {tid} créé mais GET /tickets/{tid} -> {r.status_code}")
+
+    client.patch(f"/tickets/{tid}", json={"status": "Closed", "tags": ["mw", "relu"]})
+    for _ in range(reads):
+        ticket = client.get(f"/tickets/{tid}").json()
+        if ticket["status"] != "Closed" or ticket["tags"] != ["mw", "relu"]:
+            _fail(f"PATCH du ticket {tid} non vu : {ticket}")
+        page = client.get("/tickets", params={"tag": "relu"}).json()
+        if [t["id"] for t in page["items"]] != [tid]:
+            _fail(f"index des tags pas à jour : {page['items']}")
+
+    client.request("DELETE", "/tickets", json={"ids": [tid]})
+    for _ in range(reads):
+        if client.get(f"/tickets/{tid}").status_code != 404:
+            _fail(f"ticket {tid} supprimé mais encore servi")
+
+
+def concurrent_writes(client: httpx.Client, writes: int, threads: int, seed: int) -> None:
+    rnd = random.Random(seed)
+    ids = [t["id"] for t in client.get("/tickets", params={"limit": 500}).json()["items"]]
+    plan = []
+    for i in range(writes):
+        kind = rnd.choice(["create", "create", "patch", "batch"])
+        if kind == "create":
+            plan.append(("post", "/tickets", {"title": f"Concurrent {i}", "description": "Écrit en parallèle.",
+                                              "priority": rnd.choice(["Low", "High"]), "tags": ["concurrent"]}))
+        elif kind == "patch":
+            plan.append(("patch", f"/tickets/{rnd.choice(ids)}", {"status": rnd.choice(["Open", "In progress"])}))
+        else:
+            sample = rnd.sample(ids, 5)
+            plan.append(("patch", "/tickets", {"items": [{"id": tid, "priority": "Medium"} for tid in sample]}))
+    plan.append(("delete", "/tickets", {"ids": ids[:20]}))
+
+    def send(step) -> None:
+        method, url, body = step
+        r = client.request(method.upper(), url, json=body)
+        if r.status_code >= 400 and r.status_code != 404:
+            _fail(f"{method.upper()} {url} -> {r.status_code} {r.text}")
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(send, plan))
+
+
+def final_consistency(client: httpx.Client, data_file: str, backend: str, workers: int) -> int:
+    """Chaque worker doit servir l'état du disque ; renvoie le nombre de tickets."""
+    if backend == "sqlite":
+        from sqlite_store import SqliteTicketStore
+        truth = SqliteTicketStore(data_file + ".db")
+    else:
+        truth = storage.TicketStore(storage.make_backend(backend, data_file))
+    expected_stats = truth.get_stats()
+    tickets = truth.tickets()
+    sample = random.Random(0).sample(tickets, min(50, len(tickets)))
+    for _ in range(4 * workers):
+        stats = client.get("/tickets/stats").json()
+        if stats != expected_stats:
+            _fail(f"stats d'un worker différentes du disque : total {stats['total']} au lieu de {expected_stats['total']}")
+    for ticket in sample:
+        served = client.get(f"/tickets/{ticket['id']}").json()
+        if served != dict(ticket):
+            _fail(f"ticket {ticket['id']} : {served} au lieu de {dict(ticket)}")
+    truth.close()
+    return len(tickets)
+
+
+def refresh_counts(client: httpx.Client, workers: int) -> List[Dict[str, float]]:
+    """Compteurs load / load_changes des workers vus sur /metrics (un par connexion)."""
+    seen = {}
+    for _ in range(8 * workers):
+        values: Dict[str, float] = {}
+        for kind, op, value in _STORAGE_COUNT.findall(client.get("/metrics").text):
+            values[f"{op}_{kind}"] = float(value)
+        seen[tuple(sorted(values.items()))] = values
+    return list(seen.values())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cohérence de uvicorn --workers N sur un même dossier de données.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--size", type=int, default=10_000)
+    parser.add_argument("--backend", default="wal", choices=["json", "wal", "sqlite"])
+    parser.add_argument("--writes", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    data_file = os.path.join(directory, "tickets.json")
+    try:
+        write_tickets_file(data_file, args.size, args.seed)
+        proc, base_url = _start_server(data_file, args)
+        try:
+            with _fresh(base_url) as client:
+                start = time.perf_counter()
+                read_your_writes(client, args.workers)
+                print(f"{args.workers} workers, backend {args.backend} : lecture de ses écritures OK")
+                concurrent_writes(client, args.writes, args.threads, args.seed)
+                elapsed = time.perf_counter() - start
+                total = final_consistency(client, data_file, args.backend, args.workers)
+                print(f"{args.writes} écritures concurrentes en {elapsed:.1f} s : {total} tickets, tous les workers à jour")
+                for values in refresh_counts(client, args.workers):
+                    loads = values.get("load_count", 0)
+                    changes = values.get("load_changes_count", 0)
+                    mean = values.get("load_changes_sum", 0) / changes * 1000 if changes else 0
+                    print(f"  worker : {loads:.0f} chargement(s) complet(s), {changes:.0f} rejeu(x) du journal ({mean:.2f} ms en moyenne)")
+        finally:
+            proc.terminate()
+            proc.wait()
+    finally:
+        shutil.rmtree(directory)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
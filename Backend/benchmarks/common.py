@@ -0,0 +1,49 @@
+import json
+import os
+import random
+import tempfile
+import time
+from typing import List, Dict, Any, Callable
+
+""" Outils partagés par les benchmarks : génération de tickets et chronométrage."""
+
+PRIORITIES = ["Low", "Medium", "High"]
+STATUSES = ["Open", "In progress", "Closed"]
+TAGS = ["bug", "ui", "backend", "feature", "ux", "security", "performance", "mobile", "api", "docs"]
+
+
+def make_tickets(n: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """Génère n tickets synthétiques (reproductibles grâce à la graine)."""
+    rnd = random.Random(seed)
+    tickets = []
+    for i in range(1, n + 1):
+        tickets.append({
+            "id": i,
+            "title": f"Ticket {i} - {rnd.choice(TAGS)}",
+            "description": f"Description du ticket {i} : priorité à vérifier.",
+            "priority": rnd.choice(PRIORITIES),
+            "status": rnd.choice(STATUSES),
+            "tags": rnd.sample(TAGS, rnd.randint(0, 3)),
+            "createdAt": f"2026-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}",
+        })
+    return tickets
+
+
+def write_data_file(tickets: List[Dict[str, Any]], directory: str = None) -> str:
+    """Écrit les tickets dans un fichier temporaire (même format que save_tickets)."""
+    fd, path = tempfile.mkstemp(suffix=".json", dir=directory)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(tickets, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def throughput(fn: Callable[[], Any], budget_s: float = 3.0, min_runs: int = 3) -> float:
+    """Exécute fn en boucle pendant ~budget_s secondes et renvoie les appels/seconde."""
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        runs += 1
+        elapsed = time.perf_counter() - start
+        if runs >= min_runs and elapsed >= budget_s:
+            return runs / elapsed
@@ -0,0 +1,105 @@
+import random
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List
+
+from serialization import dumps
+
+""" Générateur de tickets réalistes et reproductibles (même graine = mêmes tickets).
+
+Contrairement à common.make_tickets (valeurs uniformes), les données
+ressemblent à une vraie base de support :
+- titres et descriptions en français (accents, mots composés), longueurs variables ;
+- tags en loi de Zipf : quelques tags très fréquents, une longue traîne de rares ;
+- priorités et statuts déséquilibrés (beaucoup de Closed, peu de High) ;
+- dates étalées sur plusieurs années, plus denses vers la fin (activité croissante).
+"""
+
+ACTIONS = [
+    "Erreur lors de", "Impossible de", "Lenteur pendant", "Plantage après", "Problème d'affichage sur",
+    "Demande d'amélioration pour", "Comportement inattendu à", "Échec de", "Timeout pendant", "Bouton inactif sur",
+]
+OBJECTS = [
+    "la connexion", "l'export CSV", "la recherche", "la création de compte", "la page de paiement",
+    "l'envoi des notifications", "la mise à jour du profil", "l'import des données", "la génération du rapport",
+    "la synchronisation mobile", "l'ouverture d'un ticket", "la réinitialisation du mot de passe",
+    "le tableau de bord", "la facturation mensuelle", "le téléversement de fichiers",
+]
+CONTEXTS = [
+    "sous Firefox", "sur iOS", "sur Android", "en production", "depuis la dernière mise à jour",
+    "pour les comptes entreprise", "avec un proxy", "en mode hors-ligne", "après déconnexion", "",
+]
+SENTENCES = [
+    "Le client signale que le problème survient de façon intermittente.",
+    "Reproduit sur l'environnement de recette avec un compte de test.",
+    "Aucun message d'erreur n'est affiché à l'utilisateur.",
+    "Les journaux serveur montrent une exception non gérée.",
+    "Le contournement actuel consiste à recharger la page.",
+    "Plusieurs utilisateurs sont impactés depuis ce matin.",
+    "Voir la capture d'écran jointe par le support.",
+    "La régression semble liée au déploiement de vendredi.",
+    "Priorité à réévaluer avec l'équipe produit.",
+    "Le temps de réponse dépasse dix secondes sur les gros volumes.",
+    "Vérifier la compatibilité avec l'ancienne version de l'API.",
+    "Le problème n'apparaît pas en local.",
+]
+# Du plus fréquent au plus rare (poids de Zipf décroissants)
+TAGS = [
+    "bug", "ui", "backend", "feature", "performance", "api", "mobile", "sécurité", "ux", "docs",
+    "paiement", "export", "recherche", "notifications", "authentification", "accessibilité",
+    "base-de-données", "i18n", "tests", "infra", "cache", "import", "facturation", "rgpd",
+]
+ZIPF_EXPONENT = 1.1
+TAG_COUNT_WEIGHTS = {0: 10, 1: 40, 2: 30, 3: 15, 4: 5}
+PRIORITY_WEIGHTS = {"Low": 30, "Medium": 50, "High": 20}
+STATUS_WEIGHTS = {"Open": 30, "In progress": 15, "Closed": 55}
+FIRST_DAY = date(2023, 1, 1)
+DAYS = 3 * 365
+
+
+def _weighted(weights: Dict[Any, int]):
+    return list(weights), list(weights.values())
+
+
+def iter_tickets(n: int, seed: int = 42, start_id: int = 1) -> Iterator[Dict[str, Any]]:
+    """Tickets un par un (ids consécutifs à partir de start_id)."""
+    rnd = random.Random(seed)
+    tag_weights = [1 / rank ** ZIPF_EXPONENT for rank in range(1, len(TAGS) + 1)]
+    tag_counts, tag_count_w = _weighted(TAG_COUNT_WEIGHTS)
+    priorities, priority_w = _weighted(PRIORITY_WEIGHTS)
+    statuses, status_w = _weighted(STATUS_WEIGHTS)
+    for i in range(start_id, start_id + n):
+        tags: List[str] = []
+        for tag in rnd.choices(TAGS, tag_weights, k=rnd.choices(tag_counts, tag_count_w)[0]):
+            if tag not in tags:
+                tags.append(tag)
+        title = f"{rnd.choice(ACTIONS)} {rnd.choice(OBJECTS)} {rnd.choice(CONTEXTS)}".rstrip()
+        # Racine carrée d'un uniforme : plus de tickets récents que d'anciens
+        day = FIRST_DAY + timedelta(days=int(DAYS * rnd.random() ** 0.5))
+        yield {
+            "id": i,
+            "title": title,
+            "description": " ".join(rnd.sample(SENTENCES, rnd.randint(1, 4))),
+            "priority": rnd.choices(priorities, priority_w)[0],
+            "status": rnd.choices(statuses, status_w)[0],
+            "tags": tags,
+            "createdAt": day.isoformat(),
+        }
+
+
+def generate_tickets(n: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """n tickets réalistes, ids 1..n."""
+    return list(iter_tickets(n, seed))
+
+
+def write_tickets_file(path: str, n: int, seed: int = 42) -> None:
+    """
+    Écrit n tickets dans un fichier de données (tableau JSON compact, comme
+    save_tickets), ticket par ticket : la liste n'est jamais construite en mémoire.
+    """
+    with open(path, "wb") as f:
+        f.write(b"[")
+        for ticket in iter_tickets(n, seed):
+            if ticket["id"] > 1:
+                f.write(b",")
+            f.write(dumps(ticket))
+        f.write(b"]")
@@ -0,0 +1,137 @@
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+
+from benchmarks.common import make_tickets, write_data_file
+
+""" Test de charge HTTP : handlers sync (pool de threads) vs async.
+
+Pour chaque mode, démarre un vrai serveur uvicorn (TICKETS_HANDLERS=sync|async)
+sur une copie des mêmes données, puis envoie des requêtes en rafale avec
+--concurrency clients simultanés pendant --duration secondes : GET /tickets
+(pages et filtres) et, selon --write-ratio, des POST /tickets. Affiche le
+débit et les latences p50/p99 par mode.
+
+Usage : python -m benchmarks.load_test --size 10000 --concurrency 200 --duration 10
+        [--modes sync async] [--threadpool 40] [--write-ratio 0.1] [--backend json]
+"""
+
+READ_PARAMS = [
+    {"limit": 50},
+    {"status": "Open", "limit": 50},
+    {"tag": "bug", "sort_by": "priority", "order": "desc", "limit": 50},
+    {"search": "ticket 12", "limit": 20},
+]
+
+NEW_TICKET = {"title": "Charge", "description": "Ticket créé par le test de charge", "tags": ["load"]}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentile(values: List[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def _start_server(mode: str, data_file: str, args: argparse.Namespace) -> Tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = dict(
+        os.environ,
+        TICKETS_HANDLERS=mode,
+        TICKETS_DATA_FILE=data_file,
+        TICKETS_BACKEND=args.backend,
+        TICKETS_SQLITE_FILE=data_file + ".db",
+        TICKETS_THREADPOOL_SIZE=str(args.threadpool),
+        # Chaque GET doit faire le travail : pas de cache de réponses
+        TICKETS_RESPONSE_CACHE_SIZE="0",
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(base_url + "/tickets/stats", timeout=5).status_code == 200:
+                return proc, base_url
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    proc.kill()
+    raise SystemExit(f"[{mode}] le serveur n'a pas démarré")
+
+
+async def _load(base_url: str, concurrency: int, duration: float, write_ratio: float) -> Dict[str, List[float]]:
+    latencies: Dict[str, List[float]] = {"GET": [], "POST": [], "errors": []}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        stop_at = time.perf_counter() + duration
+
+        async def worker(n: int) -> None:
+            i = n
+            while time.perf_counter() < stop_at:
+                i += concurrency
+                write = write_ratio > 0 and i % round(1 / write_ratio) == 0
+                start = time.perf_counter()
+                try:
+                    if write:
+                        r = await client.post("/tickets", json=NEW_TICKET)
+                    else:
+                        r = await client.get("/tickets", params=READ_PARAMS[i % len(READ_PARAMS)])
+                    ok = r.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                elapsed = time.perf_counter() - start
+                latencies[("POST" if write else "GET") if ok else "errors"].append(elapsed)
+
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+    return latencies
+
+
+def run(mode: str, data_file: str, args: argparse.Namespace) -> None:
+    proc, base_url = _start_server(mode, data_file, args)
+    try:
+        latencies = asyncio.run(_load(base_url, args.concurrency, args.duration, args.write_ratio))
+    finally:
+        proc.terminate()
+        proc.wait()
+    total = sum(len(v) for v in latencies.values())
+    print(f"{mode:<6} | {total / args.duration:9.1f} req/s | erreurs {len(latencies['errors'])}")
+    for kind in ("GET", "POST"):
+        values = latencies[kind]
+        if values:
+            p50, p99 = _percentile(values, 0.50) * 1000, _percentile(values, 0.99) * 1000
+            print(f"       | {kind:<4} n={len(values):<7} | p50 {p50:8.1f} ms | p99 {p99:8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test de charge HTTP : handlers sync vs async.")
+    parser.add_argument("--size", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    parser.add_argument("--threadpool", type=int, default=40)
+    parser.add_argument("--backend", default="json", choices=["json", "wal", "sqlite"])
+    parser.add_argument("--modes", nargs="+", default=["sync", "async"], choices=["sync", "async"])
+    args = parser.parse_args()
+
+    tickets = make_tickets(args.size)
+    print(f"{args.size} tickets, {args.concurrency} clients, {args.duration:.0f} s, backend {args.backend}, pool {args.threadpool}")
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in args.modes:
+            # Même point de départ pour chaque mode
+            run(mode, write_data_file(tickets, directory), args)
@@ -0,0 +1,81 @@
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+""" Test de charge des écritures concurrentes.
+
+Lance des milliers de POST /tickets en parallèle (threads), éventuellement
+depuis plusieurs process partageant le même fichier, puis vérifie que les
+IDs sont uniques et qu'aucun ticket n'est perdu.
+
+Usage : python -m benchmarks.stress_writes --creates 2000 --threads 64 --processes 4 [--backend wal]
+"""
+
+
+def _worker(data_file: str, backend: str, creates: int, threads: int, tag: str) -> None:
+    # Configuration lue par storage.py à l'import : à poser avant d'importer l'app
+    os.environ["TICKETS_DATA_FILE"] = data_file
+    os.environ["TICKETS_BACKEND"] = backend
+    from fastapi.testclient import TestClient
+    from main import app
+
+    client = TestClient(app)
+
+    def create(i: int) -> int:
+        r = client.post("/tickets", json={"title": f"{tag}-{i}", "description": "stress", "tags": [tag]})
+        if r.status_code != 201:
+            raise RuntimeError(f"{r.status_code} {r.text}")
+        return r.json()["id"]
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        ids = list(pool.map(create, range(creates)))
+    if len(set(ids)) != len(ids):
+        raise SystemExit(f"[{tag}] IDs dupliqués renvoyés par l'API")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--creates", type=int, default=2000, help="POST par process")
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--backend", default="json", choices=["json", "wal"])
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    data_file = os.path.join(workdir, "tickets.json")
+    try:
+        start = time.perf_counter()
+        procs = [
+            multiprocessing.Process(target=_worker, args=(data_file, args.backend, args.creates, args.threads, f"p{n}"))
+            for n in range(args.processes)
+        ]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        elapsed = time.perf_counter() - start
+        if any(p.exitcode != 0 for p in procs):
+            raise SystemExit("Échec d'un process de test.")
+
+        os.environ["TICKETS_DATA_FILE"] = data_file
+        os.environ["TICKETS_BACKEND"] = args.backend
+        import storage
+        tickets = storage.TicketStore(storage.make_backend(args.backend, data_file)).tickets()
+
+        expected = args.creates * args.processes
+        ids = [t["id"] for t in tickets]
+        titles = {t["title"] for t in tickets}
+        assert len(ids) == len(set(ids)), "IDs dupliqués sur le disque"
+        assert len(tickets) == expected, f"{expected - len(tickets)} tickets perdus"
+        assert len(titles) == expected, "tickets écrasés"
+        print(f"OK : {expected} créations en {elapsed:.1f} s ({expected / elapsed:.0f} créations/s), IDs uniques")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
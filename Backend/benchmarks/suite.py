@@ -0,0 +1,358 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+import httpx
+
+import storage
+from main import app
+from fulltext import contains_text
+from routers.tickets import response_cache
+from serialization import JSON_LIB, dumps
+from sqlite_store import SqliteTicketStore
+from wal import WalBackend
+from benchmarks.generator import iter_tickets, write_tickets_file
+
+""" Suite de benchmarks reproductible : un scénario par route, résultats JSON, comparaison.
+
+Les tickets viennent de generator.py (graine fixe). Chaque scénario est
+exécuté via un client ASGI dans le process (httpx.ASGITransport : toute la
+pile FastAPI, sans réseau) pendant --budget secondes, et on garde les
+latences : débit, moyenne, p50, p95, p99. Quelques fonctions sont aussi
+mesurées seules (next_id, contains_text, save_tickets).
+
+Lancer une série et garder les résultats :
+    python -m benchmarks.suite run --sizes 1000 100000 1000000 --output avant.json
+
+Comparer deux séries (code de sortie 1 si une régression dépasse le seuil) :
+    python -m benchmarks.suite compare avant.json apres.json [--threshold 0.15]
+"""
+
+NEW_TICKET = {
+    "title": "Nouveau ticket de benchmark",
+    "description": "Créé par la suite de benchmarks.",
+    "priority": "Medium",
+    "status": "Open",
+    "tags": ["bench"],
+}
+BULK_LINES = 1000
+
+
+class Scenario(NamedTuple):
+    name: str
+    # ctx -> fonction mesurée (coroutine pour les routes, fonction pour les micro-benchmarks)
+    setup: Callable[["Context"], Awaitable[Callable]]
+    # Cache de réponses de GET /tickets actif pendant le scénario
+    response_cache: bool = False
+
+
+class Context:
+    """Données partagées par les scénarios d'une taille."""
+
+    def __init__(self, client: httpx.AsyncClient, tickets: List[Dict[str, Any]], directory: str, seed: int):
+        self.client = client
+        self.tickets = tickets
+        self.directory = directory
+        self.rnd = random.Random(seed)
+
+
+async def _check(response: httpx.Response, expected: int = 200) -> None:
+    if response.status_code != expected:
+        raise RuntimeError(f"{response.request.method} {response.request.url} -> {response.status_code} {response.text[:200]}")
+
+
+def _get(params: Dict[str, Any]):
+    async def setup(ctx: Context):
+        async def call():
+            await _check(await ctx.client.get("/tickets", params=params))
+        return call
+    return setup
+
+
+async def _cursor_page(ctx: Context):
+    params = {"sort_by": "createdAt", "order": "desc", "limit": 50}
+    cursor = (await ctx.client.get("/tickets", params=params)).json()["next_cursor"]
+
+    async def call():
+        await _check(await ctx.client.get("/tickets", params=dict(params, cursor=cursor)))
+    return call
+
+
+async def _revalidate(ctx: Context):
+    params = {"status": "Open", "limit": 50}
+    etag = (await ctx.client.get("/tickets", params=params)).headers["ETag"]
+
+    async def call():
+        await _check(await ctx.client.get("/tickets", params=params, headers={"If-None-Match": etag}), 304)
+    return call
+
+
+async def _stats(ctx: Context):
+    async def call():
+        await _check(await ctx.client.get("/tickets/stats"))
+    return call
+
+
+async def _export(ctx: Context):
+    async def call():
+        await _check(await ctx.client.get("/tickets/export"))
+    return call
+
+
+async def _metrics(ctx: Context):
+    async def call():
+        await _check(await ctx.client.get("/metrics"))
+    return call
+
+
+async def _create(ctx: Context):
+    async def call():
+        await _check(await ctx.client.post("/tickets", json=NEW_TICKET), 201)
+    return call
+
+
+async def _patch(ctx: Context):
+    half = max(1, len(ctx.tickets) // 2)
+
+    async def call():
+        ticket_id = ctx.rnd.randint(1, half)
+        status = ctx.rnd.choice(["Open", "In progress", "Closed"])
+        await _check(await ctx.client.patch(f"/tickets/{ticket_id}", json={"status": status}))
+    return call
+
+
+async def _delete(ctx: Context):
+    # Supprime en partant du plus grand id (tickets créés par POST compris)
+    items = (await ctx.client.get("/tickets", params={"limit": 1})).json()["items"]
+    next_id = [items[0]["id"] if items else 0]
+
+    async def call():
+        if next_id[0] < 1:
+            raise RuntimeError("plus de tickets à supprimer")
+        await _check(await ctx.client.delete(f"/tickets/{next_id[0]}"), 204)
+        next_id[0] -= 1
+    return call
+
+
+async def _bulk(ctx: Context):
+    body = b"".join(dumps(t) + b"\n" for t in iter_tickets(BULK_LINES, seed=7))
+
+    async def call():
+        await _check(await ctx.client.post("/tickets/bulk", content=body, headers={"Content-Type": "application/x-ndjson"}))
+    return call
+
+
+async def _next_id(ctx: Context):
+    return lambda: storage.next_id(ctx.tickets)
+
+
+async def _contains_text(ctx: Context):
+    return lambda: [t for t in ctx.tickets if contains_text(t, "paiement")]
+
+
+async def _save_tickets(ctx: Context):
+    path = os.path.join(ctx.directory, "save.json")
+    return lambda: storage._write_file(path, ctx.tickets)
+
+
+# Lectures d'abord, puis écritures (elles modifient les données)
+SCENARIOS = [
+    Scenario("GET /tickets", _get({"limit": 50})),
+    Scenario("GET /tickets status+tag", _get({"status": "Open", "tag": "performance", "limit": 50})),
+    Scenario("GET /tickets search", _get({"search": "paiement", "limit": 50})),
+    Scenario("GET /tickets search exact", _get({"search": "mobile", "search_mode": "exact", "limit": 50})),
+    Scenario("GET /tickets tri priority", _get({"sort_by": "priority", "then_by": "createdAt", "limit": 50})),
+    Scenario("GET /tickets offset 5000", _get({"limit": 50, "offset": 5000})),
+    Scenario("GET /tickets cursor", _cursor_page),
+    Scenario("GET /tickets cache", _get({"status": "Closed", "limit": 50}), response_cache=True),
+    Scenario("GET /tickets 304", _revalidate, response_cache=True),
+    Scenario("GET /tickets/stats", _stats),
+    Scenario("GET /tickets/export", _export),
+    Scenario("GET /metrics", _metrics),
+    Scenario("fn next_id", _next_id),
+    Scenario("fn contains_text", _contains_text),
+    Scenario("fn save_tickets", _save_tickets),
+    Scenario("POST /tickets", _create),
+    Scenario("PATCH /tickets/{id}", _patch),
+    Scenario("DELETE /tickets/{id}", _delete),
+    Scenario("POST /tickets/bulk", _bulk),
+]
+
+
+# ------------------------------------------------------------
+# Exécution
+# ------------------------------------------------------------
+def _percentile(sorted_values: List[float], p: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+
+async def _measure(fn: Callable, budget_s: float, min_runs: int) -> List[float]:
+    is_async = asyncio.iscoroutinefunction(fn)
+    latencies: List[float] = []
+    start = time.perf_counter()
+    while len(latencies) < min_runs or time.perf_counter() - start < budget_s:
+        t0 = time.perf_counter()
+        if is_async:
+            await fn()
+        else:
+            fn()
+        latencies.append(time.perf_counter() - t0)
+    return latencies
+
+
+def _make_store(backend: str, data_file: str):
+    if backend == "json":
+        return storage.TicketStore(storage.JsonFileBackend(data_file))
+    if backend == "wal":
+        return storage.TicketStore(WalBackend(data_file, storage.WAL_COMPACT_BYTES))
+    return SqliteTicketStore(data_file + ".db", migrate_from=data_file)
+
+
+async def _run_size(size: int, args: argparse.Namespace) -> List[Dict[str, Any]]:
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        data_file = os.path.join(directory, "tickets.json")
+        write_tickets_file(data_file, size, args.seed)
+        store = _make_store(args.backend, data_file)
+        # Remplace le store du process plutôt que dependency_overrides :
+        # FastAPI réanalyse la signature d'un override à chaque requête
+        previous, storage._store = storage._store, store
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                await client.get("/tickets")  # chauffe : chargement et index
+                # Liste du store en mémoire (pas de seconde copie des données), sinon relue
+                tickets = store.tickets() if store.in_memory else storage._read_file(data_file)
+                ctx = Context(client, tickets, directory, args.seed)
+                for scenario in SCENARIOS:
+                    if args.only and not any(s in scenario.name for s in args.only):
+                        continue
+                    response_cache.clear()
+                    response_cache.maxsize = 128 if scenario.response_cache else 0
+                    fn = await scenario.setup(ctx)
+                    latencies = sorted(await _measure(fn, args.budget, args.min_runs))
+                    row = {
+                        "size": size,
+                        "backend": args.backend,
+                        "scenario": scenario.name,
+                        "runs": len(latencies),
+                        "ops_per_s": len(latencies) / sum(latencies),
+                        "mean_ms": sum(latencies) / len(latencies) * 1000,
+                        "p50_ms": _percentile(latencies, 0.50) * 1000,
+                        "p95_ms": _percentile(latencies, 0.95) * 1000,
+                        "p99_ms": _percentile(latencies, 0.99) * 1000,
+                    }
+                    results.append(row)
+                    print(
+                        f"{size:>9} | {args.backend:<6} | {scenario.name:<28} | {row['ops_per_s']:10.1f} op/s"
+                        f" | p50 {row['p50_ms']:9.2f} ms | p99 {row['p99_ms']:9.2f} ms",
+                        flush=True,
+                    )
+        finally:
+            storage._store = previous
+            response_cache.clear()
+            response_cache.maxsize = 128
+            store.close()
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args: argparse.Namespace) -> None:
+    results: List[Dict[str, Any]] = []
+    for size in args.sizes:
+        results.extend(asyncio.run(_run_size(size, args)))
+    report = {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "json_lib": JSON_LIB,
+            "handlers": os.environ.get("TICKETS_HANDLERS", "sync"),
+            "seed": args.seed,
+            "budget_s": args.budget,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Résultats écrits dans {args.output}")
+
+
+# ------------------------------------------------------------
+# Comparaison
+# ------------------------------------------------------------
+def compare(args: argparse.Namespace) -> int:
+    """Compare le p50 de chaque scénario ; renvoie le nombre de régressions."""
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    def key(row):
+        return row["backend"], row["size"], row["scenario"]
+
+    before = {key(r): r for r in baseline["results"]}
+    regressions = 0
+    print(f"{baseline['meta'].get('commit')} -> {candidate['meta'].get('commit')} (seuil {args.threshold:.0%} sur p50)")
+    for row in candidate["results"]:
+        old = before.get(key(row))
+        if old is None:
+            continue
+        delta = row["p50_ms"] / old["p50_ms"] - 1 if old["p50_ms"] else 0.0
+        if delta > args.threshold:
+            flag = "RÉGRESSION"
+            regressions += 1
+        elif delta < -args.threshold:
+            flag = "amélioré"
+        else:
+            flag = ""
+        print(
+            f"{row['size']:>9} | {row['backend']:<6} | {row['scenario']:<28} | p50 {old['p50_ms']:9.2f} -> "
+            f"{row['p50_ms']:9.2f} ms | {delta:+7.1%} {flag}"
+        )
+    print(f"{regressions} régression(s)")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Suite de benchmarks du backend tickets.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="exécute les scénarios")
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    run_parser.add_argument("--backend", default="json", choices=["json", "wal", "sqlite"])
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--budget", type=float, default=2.0, help="secondes par scénario")
+    run_parser.add_argument("--min-runs", type=int, default=3)
+    run_parser.add_argument("--only", nargs="+", help="scénarios dont le nom contient l'un de ces textes")
+    run_parser.add_argument("--output", help="fichier JSON des résultats")
+
+    compare_parser = commands.add_parser("compare", help="compare deux fichiers de résultats")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--threshold", type=float, default=0.15, help="hausse de p50 tolérée (0.15 = 15 %%)")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    else:
+        sys.exit(1 if compare(args) else 0)
@@ -0,0 +1,219 @@
+import asyncio
+import os
+import threading
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, FrozenSet, List, Optional, Set, Tuple
+
+try:
+    from .indexes import normalize_tag, ticket_tags
+    from .serialization import dumps
+except ImportError:
+    from indexes import normalize_tag, ticket_tags
+    from serialization import dumps
+
+""" Flux des modifications de tickets (GET /tickets/changes, SSE et WebSocket).
+
+Le store publie un événement par create/patch/delete, après l'écriture sur
+disque. Chaque événement reçoit un numéro de séquence croissant et est
+gardé dans un historique borné : un client qui se reconnecte reprend après
+le dernier identifiant reçu ("<flux>-<seq>", id SSE et champ event_id). Les
+numéros sont propres à chaque flux (un par process) : un identifiant d'un
+autre worker ou d'avant un redémarrage, ou un historique qui ne remonte pas
+assez loin, donnent un événement "reset" et le client relit GET /tickets.
+
+Diffusion non bloquante : le thread écrivain ne fait que programmer un
+callback par boucle asyncio (call_soon_threadsafe). Chaque abonné a une
+file bornée ; s'il ne suit pas, il est déconnecté (événement "overflow")
+au lieu de ralentir les écritures.
+"""
+
+# Événements gardés pour la reprise (TICKETS_CHANGES_HISTORY)
+HISTORY_SIZE = int(os.environ.get("TICKETS_CHANGES_HISTORY", "10000"))
+# Événements en attente max par abonné avant déconnexion
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+# État d'un ticket vu par les filtres : (status, priority, tags normalisés)
+State = Tuple[Any, Any, FrozenSet[str]]
+
+
+def ticket_state(ticket: Dict[str, Any]) -> State:
+    return ticket.get("status"), ticket.get("priority"), frozenset(ticket_tags(ticket))
+
+
+class ChangeEvent:
+    """Un événement du flux, sérialisé une seule fois pour tous les abonnés."""
+
+    __slots__ = ("seq", "id", "op", "states", "payload")
+
+    def __init__(self, feed_id: str, seq: int, op: str, body: Dict[str, Any], states: Tuple[State, ...] = ()):
+        self.seq = seq
+        self.id = f"{feed_id}-{seq}"
+        self.op = op
+        # états avant/après : un patch qui fait sortir un ticket d'un filtre est aussi envoyé
+        self.states = states
+        self.payload = dumps({"seq": seq, "event_id": self.id, "op": op, **body})
+
+    def matches(self, filters: "ChangeFilters") -> bool:
+        if not self.states:
+            return True  # reset : concerne tout le monde
+        return any(filters.accepts(state) for state in self.states)
+
+
+class ChangeFilters:
+    """Filtres serveur d'un abonné (mêmes critères que GET /tickets)."""
+
+    __slots__ = ("status", "priority", "tag")
+
+    def __init__(self, status: Optional[str] = None, priority: Optional[str] = None, tag: Optional[str] = None):
+        self.status = status
+        self.priority = priority
+        self.tag = normalize_tag(tag) if tag is not None else None
+
+    def accepts(self, state: State) -> bool:
+        status, priority, tags = state
+        return (
+            (self.status is None or status == self.status)
+            and (self.priority is None or priority == self.priority)
+            and (self.tag is None or self.tag in tags)
+        )
+
+
+class Subscription:
+    """Abonné au flux, lié à la boucle asyncio qui le consomme."""
+
+    def __init__(self, feed: "ChangeFeed", loop: asyncio.AbstractEventLoop, filters: ChangeFilters):
+        self.feed = feed
+        self.loop = loop
+        self.filters = filters
+        self.backlog: Deque[ChangeEvent] = deque()
+        self.queue: "asyncio.Queue[Optional[ChangeEvent]]" = asyncio.Queue(SUBSCRIBER_QUEUE_SIZE)
+        # Dernier identifiant reçu (ou point de départ) : reprise après une coupure
+        self.last_id = feed.event_id(feed.seq)
+        self.overflowed = False
+        self.closed = False
+
+    def _deliver(self, events: List[ChangeEvent]) -> None:
+        """Appelé dans la boucle de l'abonné : ne bloque jamais."""
+        if self.closed:
+            return
+        for event in events:
+            if not event.matches(self.filters):
+                continue
+            try:
+                self.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Consommateur trop lent : on vide sa file et on le déconnecte
+                self.overflowed = True
+                while not self.queue.empty():
+                    self.queue.get_nowait()
+                self.queue.put_nowait(None)
+                self.close()
+                return
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[ChangeEvent]:
+        """
+        Prochain événement. None si l'abonné a été déconnecté (overflow).
+        asyncio.TimeoutError si rien n'arrive avant timeout.
+        """
+        if self.backlog:
+            event = self.backlog.popleft()
+        else:
+            event = await asyncio.wait_for(self.queue.get(), timeout)
+        if event is not None:
+            self.last_id = event.id
+        return event
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.feed.unsubscribe(self)
+
+
+class ChangeFeed:
+    """Historique des événements + abonnés, alimenté par le store."""
+
+    def __init__(self, history_size: int = HISTORY_SIZE):
+        # Identifiant du flux : les numéros de séquence n'ont de sens que pour lui
+        self.id = uuid.uuid4().hex[:8]
+        self._history: Deque[ChangeEvent] = deque(maxlen=history_size)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._subscribers: Dict[asyncio.AbstractEventLoop, Set[Subscription]] = {}
+
+    @property
+    def seq(self) -> int:
+        """Numéro du dernier événement publié."""
+        return self._seq
+
+    def event_id(self, seq: int) -> str:
+        """Identifiant de reprise de l'événement seq de ce flux."""
+        return f"{self.id}-{seq}"
+
+    def _parse_id(self, event_id: str) -> Optional[int]:
+        """Numéro de séquence d'un identifiant de ce flux ; None s'il vient d'ailleurs."""
+        feed_id, _, seq = event_id.rpartition("-")
+        if feed_id != self.id or not seq.isdigit():
+            return None
+        return int(seq)
+
+    # ---------------- Publication (thread écrivain) ----------------
+    def publish(self, changes: List[Tuple[str, Dict[str, Any], Tuple[State, ...]]]) -> None:
+        """changes : (op, corps de l'événement, états avant/après du ticket)."""
+        if not changes:
+            return
+        with self._lock:
+            events = []
+            for op, body, states in changes:
+                self._seq += 1
+                events.append(ChangeEvent(self.id, self._seq, op, body, states))
+            self._history.extend(events)
+            targets = [(loop, list(subs)) for loop, subs in self._subscribers.items() if subs]
+        for loop, subs in targets:
+            try:
+                loop.call_soon_threadsafe(self._fan_out, subs, events)
+            except RuntimeError:
+                # Boucle fermée (arrêt du serveur) : ses abonnés disparaissent
+                for sub in subs:
+                    sub.close()
+
+    def publish_reset(self) -> None:
+        """Données rechargées depuis le disque (modification externe) : les clients doivent relire."""
+        self.publish([("reset", {}, ())])
+
+    @staticmethod
+    def _fan_out(subs: List[Subscription], events: List[ChangeEvent]) -> None:
+        for sub in subs:
+            sub._deliver(events)
+
+    # ---------------- Abonnements (boucle asyncio) ----------------
+    def subscribe(self, filters: ChangeFilters, since: Optional[str] = None) -> Subscription:
+        """
+        Nouvel abonné. since : dernier identifiant reçu ; les événements
+        suivants encore dans l'historique sont rejoués avant le direct.
+        """
+        sub = Subscription(self, asyncio.get_running_loop(), filters)
+        with self._lock:
+            if since is not None:
+                seq = self._parse_id(since)
+                oldest = self._history[0].seq if self._history else self._seq + 1
+                if seq is None or seq > self._seq or seq < oldest - 1:
+                    # Autre process, redémarrage ou historique insuffisant : relecture complète
+                    sub.backlog.append(ChangeEvent(self.id, self._seq, "reset", {}))
+                else:
+                    sub.backlog.extend(e for e in self._history if e.seq > seq and e.matches(filters))
+                    sub.last_id = self.event_id(seq)
+            self._subscribers.setdefault(sub.loop, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            subs = self._subscribers.get(sub.loop)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._subscribers[sub.loop]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subs) for subs in self._subscribers.values())
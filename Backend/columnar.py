@@ -0,0 +1,414 @@
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+# NumPy (dépendance optionnelle) n'est importé qu'au premier appel de
+# available() : inutile de le payer au démarrage avec le moteur python
+np = None
+
+try:
+    from .indexes import normalize_tag, ticket_tags
+    from .sorting import SortSpec
+    from .stats import TicketStats, label
+    from .timing import stage
+except ImportError:
+    from indexes import normalize_tag, ticket_tags
+    from sorting import SortSpec
+    from stats import TicketStats, label
+    from timing import stage
+
+""" Moteur de requêtes en colonnes NumPy (TICKETS_QUERY_ENGINE=numpy).
+
+Le store garde, en plus de ses dicts, une colonne NumPy par champ utile aux
+requêtes, une ligne par ticket dans l'ordre du cache (id croissant) :
+- id, createdAt (numéro de jour), poids de priorité et de statut (ceux de
+  sorting.sort_values) ;
+- codes de statut, de priorité et de jour (petits entiers, table de valeurs) ;
+- tags au format CSR : pour la ligne i, tag_ids[tag_ptr[i]:tag_ptr[i + 1]].
+
+GET /tickets devient alors :
+- filtres : masques booléens (status == code, tag par recherche dans tag_ids) ;
+- tri : np.lexsort sur les colonnes de poids (titre : rang dans la liste triée
+  des titres, recalculé seulement après un changement de titre) ;
+- pagination par curseur : comparaison lexicographique vectorisée.
+Les compteurs de stats.py sont construits au chargement par np.bincount.
+
+Mutations (thread écrivain) : une création ajoute une ligne (les ids
+croissent, l'ordre est conservé), une modification réécrit sa ligne, une
+suppression la marque morte. Les tags modifiés vont dans un petit
+dictionnaire ligne -> codes, fusionné dans le CSR quand il grossit ; les
+lignes mortes sont retirées quand elles dépassent la moitié.
+
+Les résultats sont exactement ceux du chemin Python (même ordre, même
+total, mêmes curseurs) : voir benchmarks/check_columnar.py. Sans NumPy,
+le store reste sur le chemin Python.
+"""
+
+QUERY_ENGINE = os.environ.get("TICKETS_QUERY_ENGINE", "python").lower()
+
+
+def available() -> bool:
+    """NumPy est-il installé ? (l'importe au premier appel)"""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:  # dépendance optionnelle
+            return False
+        np = numpy
+    return True
+
+
+class _Codes:
+    """Valeur -> petit entier, dans l'ordre de première apparition."""
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self._codes: Dict[Any, int] = {}
+
+    def code(self, value: Any) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def get(self, value: Any) -> Optional[int]:
+        return self._codes.get(value)
+
+    def pairs(self, counts) -> List[Tuple[Any, int]]:
+        """(valeur, nombre) à partir d'un np.bincount sur les codes."""
+        return [(value, int(n)) for value, n in zip(self.values, counts)]
+
+
+# Colonnes numériques et leur type
+_DTYPES = {
+    "id": "int64",
+    "created": "int32",
+    "priority_w": "int8",
+    "status_w": "int8",
+    "status": "int32",
+    "priority": "int32",
+    "day": "int32",
+    "alive": "bool",
+}
+# Champ de tri -> colonne (title : rangs, voir _title_ranks)
+_SORT_COLUMNS = {"id": "id", "createdAt": "created", "priority": "priority_w", "status": "status_w"}
+
+
+class ColumnarIndex:
+    """Colonnes NumPy des tickets du store (voir l'en-tête du module)."""
+
+    MIN_CAPACITY = 1024
+
+    def __init__(self):
+        self.status_codes = _Codes()
+        self.priority_codes = _Codes()
+        self.day_codes = _Codes()
+        self.tag_codes = _Codes()
+        self._cols: Dict[str, Any] = {name: np.zeros(self.MIN_CAPACITY, dtype) for name, dtype in _DTYPES.items()}
+        self._n = 0
+        self._dead = 0
+        # Ligne -> ticket du store (None si supprimé) et titre en minuscules
+        self._tickets: List[Any] = []
+        self._titles: List[Optional[str]] = []
+        self._title_rank = None
+        self._title_sorted: List[str] = []
+        # Tags : CSR des lignes [0, _csr_rows) ; _tag_overflow prime sur le CSR
+        self._tag_ptr = np.zeros(1, np.int64)
+        self._tag_ids = np.zeros(0, np.int32)
+        self._csr_rows = 0
+        self._tag_overflow: Dict[int, Tuple[int, ...]] = {}
+        # Requêtes (threads du pool) et mutations (thread écrivain)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_tickets(cls, tickets: Sequence[Any], values_of: Callable[[Any], Tuple]) -> "ColumnarIndex":
+        """tickets triés par id croissant, sans doublon ; values_of : clés de sorting.sort_values."""
+        index = cls()
+        columns: Dict[str, List[int]] = {name: [] for name in _DTYPES if name != "alive"}
+        tag_ptr = [0]
+        tag_ids: List[int] = []
+        tag_code = index.tag_codes.code
+        for t in tickets:
+            values = values_of(t)
+            for name, value in index._row_values(t, values).items():
+                columns[name].append(value)
+            index._titles.append(values[4])
+            tag_ids.extend(tag_code(tag) for tag in ticket_tags(t))
+            tag_ptr.append(len(tag_ids))
+        n = len(tickets)
+        capacity = max(cls.MIN_CAPACITY, n + n // 8)
+        for name, dtype in _DTYPES.items():
+            col = np.zeros(capacity, dtype)
+            col[:n] = True if name == "alive" else columns[name]
+            index._cols[name] = col
+        index._n = n
+        index._tickets = list(tickets)
+        index._tag_ptr = np.array(tag_ptr, np.int64)
+        index._tag_ids = np.array(tag_ids, np.int32)
+        index._csr_rows = n
+        return index
+
+    # ---------------- Mise à jour incrémentale (thread écrivain) ----------------
+    def _row_values(self, ticket: Any, values: Tuple) -> Dict[str, int]:
+        return {
+            "id": values[0],
+            "created": values[1],
+            "priority_w": values[2],
+            "status_w": values[3],
+            "status": self.status_codes.code(ticket.get("status")),
+            "priority": self.priority_codes.code(ticket.get("priority")),
+            "day": self.day_codes.code(label(ticket.get("createdAt"))),
+        }
+
+    def _set_row(self, row: int, ticket: Any, values: Tuple) -> None:
+        for name, value in self._row_values(ticket, values).items():
+            self._cols[name][row] = value
+        if self._titles[row] != values[4]:
+            self._titles[row] = values[4]
+            self._title_rank = None
+
+    def _row(self, ticket_id: int) -> Optional[int]:
+        """Ligne (vivante) d'un id : dichotomie sur la colonne id, triée."""
+        ids = self._cols["id"][:self._n]
+        row = int(np.searchsorted(ids, ticket_id))
+        if row < self._n and ids[row] == ticket_id and self._cols["alive"][row]:
+            return row
+        return None
+
+    def _row_tags(self, row: int) -> Tuple[int, ...]:
+        if row in self._tag_overflow:
+            return self._tag_overflow[row]
+        if row < self._csr_rows:
+            return tuple(self._tag_ids[self._tag_ptr[row]:self._tag_ptr[row + 1]].tolist())
+        return ()
+
+    def add(self, ticket: Any, values: Tuple) -> None:
+        """Nouveau ticket, d'id supérieur à tous les autres (les ids ne sont jamais réutilisés)."""
+        with self._lock:
+            row = self._n
+            if row == len(self._cols["id"]):
+                self._grow(2 * row)
+            self._tickets.append(ticket)
+            self._titles.append(None)
+            self._set_row(row, ticket, values)
+            self._cols["alive"][row] = True
+            tags = tuple(self.tag_codes.code(tag) for tag in ticket_tags(ticket))
+            if tags:
+                self._tag_overflow[row] = tags
+            self._n += 1
+            self._title_rank = None
+            self._maybe_merge_tags()
+
+    def update(self, ticket: Any, values: Tuple) -> None:
+        with self._lock:
+            row = self._row(values[0])
+            if row is None:
+                return
+            self._set_row(row, ticket, values)
+            tags = tuple(self.tag_codes.code(tag) for tag in ticket_tags(ticket))
+            if set(tags) != set(self._row_tags(row)):
+                self._tag_overflow[row] = tags
+                self._maybe_merge_tags()
+
+    def remove(self, ticket_id: int) -> None:
+        with self._lock:
+            row = self._row(ticket_id)
+            if row is None:
+                return
+            self._cols["alive"][row] = False
+            self._tickets[row] = None
+            self._titles[row] = None
+            self._tag_overflow.pop(row, None)
+            self._dead += 1
+            if self._dead > self._n // 2 and self._n > self.MIN_CAPACITY:
+                self._drop_dead_rows()
+
+    def _grow(self, capacity: int) -> None:
+        for name, col in self._cols.items():
+            new = np.zeros(capacity, col.dtype)
+            new[:self._n] = col[:self._n]
+            self._cols[name] = new
+
+    def _drop_dead_rows(self) -> None:
+        """Plus de lignes mortes que vivantes : on ne garde que les vivantes (ordre conservé)."""
+        keep = np.flatnonzero(self._cols["alive"][:self._n])
+        rows = keep.tolist()
+        # Tags lus avec les anciens numéros de ligne, avant renumérotation
+        tags = [self._row_tags(row) for row in rows]
+        capacity = max(self.MIN_CAPACITY, 2 * len(rows))
+        for name, col in self._cols.items():
+            new = np.zeros(capacity, col.dtype)
+            new[:len(rows)] = col[keep]
+            self._cols[name] = new
+        self._tickets = [self._tickets[i] for i in rows]
+        self._titles = [self._titles[i] for i in rows]
+        self._n = len(rows)
+        self._dead = 0
+        self._title_rank = None
+        self._set_tags(tags)
+
+    def _maybe_merge_tags(self) -> None:
+        if len(self._tag_overflow) > max(self.MIN_CAPACITY, self._n // 16):
+            self._rebuild_tags()
+
+    def _rebuild_tags(self) -> None:
+        """Fusionne le dictionnaire de débordement dans le CSR."""
+        self._set_tags([self._row_tags(row) for row in range(self._n)])
+
+    def _set_tags(self, tags: List[Tuple[int, ...]]) -> None:
+        """CSR à partir des codes de tags de chaque ligne."""
+        ptr = [0]
+        ids: List[int] = []
+        for codes in tags:
+            ids.extend(codes)
+            ptr.append(len(ids))
+        self._tag_ptr = np.array(ptr, np.int64)
+        self._tag_ids = np.array(ids, np.int32)
+        self._csr_rows = self._n
+        self._tag_overflow = {}
+
+    # ---------------- Requêtes ----------------
+    def _title_ranks(self):
+        """Rang de chaque titre (minuscules) dans la liste triée des titres distincts."""
+        if self._title_rank is None or len(self._title_rank) != self._n:
+            uniq = sorted({t for t in self._titles if t is not None})
+            rank_of = {t: i for i, t in enumerate(uniq)}
+            self._title_rank = np.fromiter((rank_of.get(t, -1) for t in self._titles), np.int64, self._n)
+            self._title_sorted = uniq
+        return self._title_rank
+
+    def _tag_mask(self, tag: str):
+        mask = np.zeros(self._n, bool)
+        code = self.tag_codes.get(tag)
+        if code is None:
+            return mask
+        hits = np.flatnonzero(self._tag_ids == code)
+        mask[np.searchsorted(self._tag_ptr, hits, side="right") - 1] = True
+        for row, codes in self._tag_overflow.items():
+            mask[row] = code in codes
+        return mask
+
+    def _select(
+        self,
+        status: Optional[str],
+        priority: Optional[str],
+        tag: Optional[str],
+        ids: Optional[Set[int]],
+        days: Optional[Tuple[int, int]] = None,
+    ):
+        """Lignes vivantes correspondant aux filtres (ordre croissant = id croissant)."""
+        n = self._n
+        mask = self._cols["alive"][:n].copy()
+        for value, codes, name in (
+            (status, self.status_codes, "status"),
+            (priority, self.priority_codes, "priority"),
+        ):
+            if value is not None:
+                code = codes.get(value)
+                if code is None:
+                    return np.zeros(0, np.int64)
+                mask &= self._cols[name][:n] == code
+        if tag is not None:
+            mask &= self._tag_mask(normalize_tag(tag))
+        if ids is not None:
+            found = np.zeros(n, bool)
+            if ids:
+                wanted = np.fromiter(ids, np.int64, len(ids))
+                rows = np.searchsorted(self._cols["id"][:n], wanted)
+                ok = rows < n
+                rows, wanted = rows[ok], wanted[ok]
+                found[rows[self._cols["id"][rows] == wanted]] = True
+            mask &= found
+        if days is not None:
+            created = self._cols["created"][:n]
+            mask &= (created >= days[0]) & (created <= days[1])
+        return np.flatnonzero(mask)
+
+    def _sort_column(self, field: str):
+        if field == "title":
+            return self._title_ranks()
+        return self._cols[_SORT_COLUMNS[field]][:self._n].astype(np.int64)
+
+    def _after_mask(self, columns: List[Any], spec: SortSpec, after: Sequence[Any]):
+        """Lignes dont la clé de tri est strictement après le curseur (ordre lexicographique)."""
+        greater = np.zeros(len(columns[0]), bool)
+        equal = np.ones(len(columns[0]), bool)
+        for col, (field, desc), bound in zip(columns, spec.fields, after):
+            if field == "title":
+                # Le titre du curseur peut ne plus exister : on compare aux rangs qui l'encadrent
+                lo = bisect_left(self._title_sorted, bound)
+                hi = bisect_right(self._title_sorted, bound)
+                below, same, above = col < lo, (col >= lo) & (col < hi), col >= hi
+            else:
+                below, same, above = col < bound, col == bound, col > bound
+            greater |= equal & (below if desc else above)
+            equal &= same
+        return greater
+
+    def query(
+        self,
+        status: Optional[str],
+        priority: Optional[str],
+        tag: Optional[str],
+        ids: Optional[Set[int]],
+        predicate: Optional[Callable[[Any], bool]],
+        spec: SortSpec,
+        offset: int,
+        limit: int,
+        after: Optional[Sequence[Any]] = None,
+        days: Optional[Tuple[int, int]] = None,
+    ) -> Tuple[List[Any], int, bool]:
+        """
+        Équivalent de filter + select_page du store : (page, total, reste-t-il des tickets ?).
+        ids : résultat de l'index plein texte ; predicate : recherche exacte, ticket par ticket ;
+        days : bornes incluses de createdAt (numéros de jour, voir sorting.day_range).
+        """
+        with self._lock:
+            with stage("filter"):
+                rows = self._select(status, priority, tag, ids, days)
+                if predicate is not None:
+                    tickets = self._tickets
+                    rows = rows[np.fromiter((predicate(tickets[r]) for r in rows), bool, len(rows))]
+            total = len(rows)
+            with stage("sort"):
+                columns = [self._sort_column(field)[rows] for field, _ in spec.fields]
+                if after is not None:
+                    keep = self._after_mask(columns, spec, after)
+                    rows = rows[keep]
+                    columns = [col[keep] for col in columns]
+                # lexsort : la dernière clé est la principale ; décroissant = opposé
+                keys = [-col if desc else col for col, (_, desc) in zip(columns, spec.fields)]
+                order = np.lexsort(keys[::-1])
+                wanted = offset + limit
+                page = rows[order[offset:wanted]]
+                return [self._tickets[r] for r in page.tolist()], total, len(order) > wanted
+
+    def stats(self) -> TicketStats:
+        """Compteurs de stats.py par np.bincount sur les colonnes de codes."""
+        with self._lock:
+            n = self._n
+            alive = self._cols["alive"][:n]
+
+            def counts(codes: _Codes, name: str):
+                return codes.pairs(np.bincount(self._cols[name][:n][alive], minlength=len(codes.values)))
+
+            entry_rows = np.repeat(np.arange(self._csr_rows), np.diff(self._tag_ptr))
+            valid = alive[entry_rows]
+            if self._tag_overflow:
+                overridden = np.zeros(n, bool)
+                overridden[list(self._tag_overflow)] = True
+                valid &= ~overridden[entry_rows]
+            tag_counts = np.bincount(self._tag_ids[valid], minlength=len(self.tag_codes.values))
+            for row, codes in self._tag_overflow.items():
+                for code in codes:
+                    tag_counts[code] += 1
+            return TicketStats.from_counts(
+                int(alive.sum()),
+                counts(self.status_codes, "status"),
+                counts(self.priority_codes, "priority"),
+                self.tag_codes.pairs(tag_counts),
+                counts(self.day_codes, "day"),
+            )
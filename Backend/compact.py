@@ -0,0 +1,237 @@
+import os
+import threading
+from collections.abc import MutableMapping
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from .models import ALLOWED_PRIORITY, ALLOWED_STATUS
+    from .sorting import PRIORITY_WEIGHT, STATUS_WEIGHT
+except ImportError:
+    from models import ALLOWED_PRIORITY, ALLOWED_STATUS
+    from sorting import PRIORITY_WEIGHT, STATUS_WEIGHT
+
+""" Représentation compacte des tickets en mémoire (TICKETS_COMPACT=1).
+
+Un ticket du store devient un TicketRecord à __slots__ au lieu d'un dict :
+- priority et status : petit entier (index dans PRIORITIES / STATUSES) ;
+- tags : tuple d'identifiants de tags internés (chaque tag distinct n'existe
+  qu'une fois en mémoire) ;
+- createdAt : numéro de jour (date.toordinal), partagé entre les tickets du même jour ;
+- title, description, id : tels quels.
+
+TicketRecord se lit et se modifie comme un dict (get, [], update, items...),
+donc index, stats, tri et flux de modifications n'ont pas à le connaître.
+Les valeurs hors format (priorité inconnue, date non AAAA-MM-JJ, champ
+supplémentaire d'un fichier édité à la main) sont gardées telles quelles
+dans un petit dict annexe : la conversion aller-retour est exacte.
+Aux frontières (API, fichiers) : to_dict(), ou serialization.dumps qui
+sait encoder un TicketRecord.
+"""
+
+COMPACT_TICKETS = os.environ.get("TICKETS_COMPACT", "0").lower() in ("1", "true", "yes")
+
+# Ordre stable (celui des poids de tri) : le code d'une valeur ne change pas d'un démarrage à l'autre
+PRIORITIES: Tuple[str, ...] = tuple(sorted(ALLOWED_PRIORITY, key=PRIORITY_WEIGHT.get))
+STATUSES: Tuple[str, ...] = tuple(sorted(ALLOWED_STATUS, key=STATUS_WEIGHT.get))
+_PRIORITY_CODE = {v: i for i, v in enumerate(PRIORITIES)}
+_STATUS_CODE = {v: i for i, v in enumerate(STATUSES)}
+
+FIELDS = ("id", "title", "description", "priority", "status", "tags", "createdAt")
+
+
+class _Absent:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<absent>"
+
+
+# Champ absent du slot (absent du ticket, ou valeur hors format rangée dans _extra)
+_ABSENT = _Absent()
+
+
+class TagTable:
+    """Tags internés : chaque tag distinct a un identifiant et une seule copie en mémoire."""
+
+    def __init__(self):
+        self.names: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def id_of(self, tag: str) -> int:
+        tag_id = self._ids.get(tag)
+        if tag_id is None:
+            with self._lock:
+                tag_id = self._ids.get(tag)
+                if tag_id is None:
+                    tag_id = self._ids[tag] = len(self.names)
+                    self.names.append(tag)
+        return tag_id
+
+
+TAGS = TagTable()
+
+# Numéro de jour <-> "AAAA-MM-JJ", un seul objet par jour distinct
+_ordinals: Dict[str, int] = {}
+_iso_days: Dict[int, str] = {}
+
+
+def _day_ordinal(value: Any) -> Optional[int]:
+    if type(value) is not str:
+        return None
+    ordinal = _ordinals.get(value)
+    if ordinal is None:
+        try:
+            ordinal = date.fromisoformat(value).toordinal()
+        except ValueError:
+            return None
+        iso = date.fromordinal(ordinal).isoformat()
+        if iso != value:  # "20240101" est accepté par fromisoformat : on garde le texte d'origine
+            return None
+        _iso_days.setdefault(ordinal, iso)
+        _ordinals[value] = ordinal
+    return ordinal
+
+
+def _encode_tags(value: Any) -> Optional[Tuple[int, ...]]:
+    if type(value) is not list:
+        return None
+    ids = []
+    for tag in value:
+        if type(tag) is not str:
+            return None
+        ids.append(TAGS.id_of(tag))
+    return tuple(ids)
+
+
+class TicketRecord(MutableMapping):
+    """Ticket compact, utilisable comme un dict (voir l'en-tête du module)."""
+
+    __slots__ = ("_id", "_title", "_description", "_priority", "_status", "_tags", "_created", "_extra")
+
+    def __init__(self, data: Dict[str, Any]):
+        self._id = self._title = self._description = _ABSENT
+        self._priority = self._status = self._tags = self._created = _ABSENT
+        self._extra: Optional[Dict[str, Any]] = None
+        for key, value in data.items():
+            self[key] = value
+
+    # ---------------- Accès comme un dict ----------------
+    def _slot_value(self, key: str) -> Any:
+        """Valeur décodée d'un champ standard, ou _ABSENT."""
+        if key == "id":
+            return self._id
+        if key == "title":
+            return self._title
+        if key == "description":
+            return self._description
+        if key == "priority":
+            code = self._priority
+            return PRIORITIES[code] if code is not _ABSENT else _ABSENT
+        if key == "status":
+            code = self._status
+            return STATUSES[code] if code is not _ABSENT else _ABSENT
+        if key == "tags":
+            tags = self._tags
+            return [TAGS.names[i] for i in tags] if tags is not _ABSENT else _ABSENT
+        if key == "createdAt":
+            ordinal = self._created
+            return _iso_days[ordinal] if ordinal is not _ABSENT else _ABSENT
+        return _ABSENT
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._slot_value(key)
+        if value is not _ABSENT:
+            return value
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # Sans passer par KeyError : appelé en boucle par les index et le tri
+        value = self._slot_value(key)
+        if value is not _ABSENT:
+            return value
+        if self._extra is not None:
+            return self._extra.get(key, default)
+        return default
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        encoded: Any = _ABSENT
+        if key == "id":
+            encoded = value if type(value) is int else _ABSENT
+            self._id = encoded
+        elif key == "title":
+            encoded = value if type(value) is str else _ABSENT
+            self._title = encoded
+        elif key == "description":
+            encoded = value if type(value) is str else _ABSENT
+            self._description = encoded
+        elif key == "priority":
+            encoded = _PRIORITY_CODE.get(value, _ABSENT) if type(value) is str else _ABSENT
+            self._priority = encoded
+        elif key == "status":
+            encoded = _STATUS_CODE.get(value, _ABSENT) if type(value) is str else _ABSENT
+            self._status = encoded
+        elif key == "tags":
+            tags = _encode_tags(value)
+            encoded = tags if tags is not None else _ABSENT
+            self._tags = encoded
+        elif key == "createdAt":
+            ordinal = _day_ordinal(value)
+            encoded = ordinal if ordinal is not None else _ABSENT
+            self._created = encoded
+
+        if encoded is _ABSENT:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+            if not self._extra:
+                self._extra = None
+
+    def __delitem__(self, key: str) -> None:
+        found = False
+        if key in FIELDS and self._slot_value(key) is not _ABSENT:
+            setattr(self, "_" + {"createdAt": "created"}.get(key, key), _ABSENT)
+            found = True
+        if self._extra is not None and key in self._extra:
+            del self._extra[key]
+            if not self._extra:
+                self._extra = None
+            found = True
+        if not found:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in FIELDS:
+            if self._slot_value(key) is not _ABSENT:
+                yield key
+        if self._extra is not None:
+            for key in self._extra:
+                if key not in FIELDS or self._slot_value(key) is _ABSENT:
+                    yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    # ---------------- Conversions ----------------
+    def to_dict(self) -> Dict[str, Any]:
+        """Ticket au format de l'API et des fichiers (nouveau dict)."""
+        out: Dict[str, Any] = {}
+        for key in FIELDS:
+            value = self._slot_value(key)
+            if value is not _ABSENT:
+                out[key] = value
+        if self._extra is not None:
+            out.update(self._extra)
+        return out
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TicketRecord":
+        return cls(data)
+
+    def __repr__(self) -> str:
+        return f"TicketRecord({self.to_dict()!r})"
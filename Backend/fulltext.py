@@ -0,0 +1,173 @@
+import re
+import unicodedata
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+""" Index plein texte pour le paramètre `search` de GET /tickets.
+
+Le titre, la description et les tags sont découpés en tokens, en minuscules
+et sans accents ("Priorité" -> "priorite"). Chaque token pointe vers les IDs
+des tickets qui le contiennent ; le vocabulaire est gardé trié pour servir
+les recherches par préfixe avec bisect. L'index est mis à jour
+incrémentalement par le store à chaque mutation.
+
+Chaque token distinct n'est gardé qu'en un exemplaire (table _tokens) :
+les tokens retenus par ticket pour la désindexation sont des tuples de
+références vers ces chaînes partagées, pas des copies.
+"""
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Modes de recherche exposés par l'API
+SEARCH_MODES = {"prefix", "exact"}
+
+
+def fold(text: str) -> str:
+    """Minuscules + suppression des accents (é -> e, ç -> c...)."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(fold(text))
+
+
+def normalize_tags(ticket: Dict[str, Any]) -> List[str]:
+    """Retourne les tags du ticket en lowercase, sans crash si absent."""
+    raw = ticket.get("tags") or []
+    return [str(t).strip().lower() for t in raw if str(t).strip()]
+
+
+def contains_text(ticket: Dict[str, Any], needle: str) -> bool:
+    """
+    Recherche exacte (search_mode=exact), insensible à la casse, par sous-chaîne dans:
+    - title
+    - description
+    - tags
+    """
+    needle = needle.lower()
+
+    hay_title = str(ticket.get("title", "")).lower()
+    hay_desc = str(ticket.get("description", "")).lower()
+    hay_tags = normalize_tags(ticket)
+
+    return (
+        needle in hay_title
+        or needle in hay_desc
+        or any(needle in t for t in hay_tags)
+    )
+
+
+def uses_index(needle: str, search_mode: str) -> bool:
+    """
+    La recherche peut-elle passer par l'index ? Non en mode exact, ni pour une
+    requête sans aucun mot (ponctuation seule) : seule la sous-chaîne a un sens.
+    """
+    return bool(needle) and search_mode == "prefix" and bool(tokenize(needle))
+
+
+def ticket_tokens(ticket: Dict[str, Any]) -> FrozenSet[str]:
+    """Tokens indexés d'un ticket : titre, description et tags."""
+    parts = [str(ticket.get("title", "")), str(ticket.get("description", ""))]
+    parts.extend(str(t) for t in ticket.get("tags") or [])
+    return frozenset(tokenize(" ".join(parts)))
+
+
+class SearchIndex:
+    """Index inversé token -> IDs, avec recherche par préfixe."""
+
+    def __init__(self):
+        self.postings: Dict[str, Set[int]] = defaultdict(set)
+        self.vocabulary: List[str] = []  # tokens triés
+        self._doc_tokens: Dict[int, Tuple[str, ...]] = {}
+        # token -> son exemplaire unique (clé de postings)
+        self._tokens: Dict[str, str] = {}
+
+    def _shared(self, tokens: FrozenSet[str]) -> Tuple[str, ...]:
+        """Tokens d'un ticket, remplacés par leur exemplaire partagé."""
+        shared = self._tokens.setdefault
+        return tuple([shared(tok, tok) for tok in tokens])
+
+    @classmethod
+    def from_tickets(cls, tickets: Iterable[Dict[str, Any]]) -> "SearchIndex":
+        index = cls()
+        for t in tickets:
+            index.add(t, keep_sorted=False)
+        index.sort_vocabulary()
+        return index
+
+    # ---------------- Snapshot (voir snapshot.py) ----------------
+    def state(self) -> Tuple:
+        """Contenu de l'index en types de base (sérialisable par marshal)."""
+        return dict(self.postings), self.vocabulary, self._doc_tokens
+
+    @classmethod
+    def from_state(cls, state: Tuple) -> "SearchIndex":
+        """
+        marshal garde les références partagées : les tokens des tuples de
+        _doc_tokens restent les mêmes chaînes que les clés de postings.
+        """
+        postings, vocabulary, doc_tokens = state
+        index = cls()
+        index.postings.update(postings)
+        index.vocabulary = list(vocabulary)
+        index._doc_tokens = doc_tokens
+        index._tokens = {tok: tok for tok in index.postings}
+        return index
+
+    def sort_vocabulary(self) -> None:
+        """Trie le vocabulaire d'un coup, après des add(keep_sorted=False)."""
+        self.vocabulary = sorted(self.postings)
+
+    # ---------------- Mise à jour incrémentale ----------------
+    def add(self, ticket: Dict[str, Any], keep_sorted: bool = True) -> None:
+        """keep_sorted=False (chargement en masse) : appeler sort_vocabulary() à la fin."""
+        tid = int(ticket.get("id", -1))
+        tokens = self._shared(ticket_tokens(ticket))
+        self._doc_tokens[tid] = tokens
+        postings = self.postings
+        for tok in tokens:
+            if keep_sorted and tok not in postings:
+                insort(self.vocabulary, tok)
+            postings[tok].add(tid)
+
+    def remove(self, ticket: Dict[str, Any]) -> None:
+        tid = int(ticket.get("id", -1))
+        for tok in self._doc_tokens.pop(tid, ()):
+            ids = self.postings.get(tok)
+            if ids is None:
+                continue
+            ids.discard(tid)
+            if not ids:
+                del self.postings[tok]
+                self._tokens.pop(tok, None)
+                i = bisect_left(self.vocabulary, tok)
+                if i < len(self.vocabulary) and self.vocabulary[i] == tok:
+                    del self.vocabulary[i]
+
+    # ---------------- Requêtes ----------------
+    def _prefix_ids(self, prefix: str) -> Set[int]:
+        """Union des IDs de tous les tokens commençant par prefix."""
+        lo = bisect_left(self.vocabulary, prefix)
+        hi = bisect_left(self.vocabulary, prefix + "\U0010ffff", lo)
+        sets = [self.postings.get(tok) for tok in self.vocabulary[lo:hi]]
+        return set().union(*[s for s in sets if s])
+
+    def search(self, query: str) -> Optional[Set[int]]:
+        """
+        IDs des tickets dont chaque mot de la requête préfixe un token.
+        None si la requête ne contient aucun mot (ponctuation seule...) :
+        l'appelant doit alors revenir à la recherche exacte.
+        """
+        words = sorted(set(tokenize(query)), key=len, reverse=True)
+        if not words:
+            return None
+        # Les mots les plus longs sont les plus sélectifs : on commence par eux
+        result: Optional[Set[int]] = None
+        for w in words:
+            ids = self._prefix_ids(w)
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+        return result
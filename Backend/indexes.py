@@ -0,0 +1,114 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+""" Index inversés en mémoire pour les filtres de GET /tickets.
+
+statut -> ids, priorité -> ids, tag normalisé -> ids. Ils sont tenus à jour
+incrémentalement par le store (add/remove à chaque mutation) : un filtre
+coûte alors la taille du résultat, pas celle du corpus.
+"""
+
+# Champs indexés : nom du critère -> attribut de TicketIndex
+INDEXED_FIELDS = {"status": "by_status", "priority": "by_priority", "tags": "by_tag"}
+
+
+def normalize_tag(value: Any) -> str:
+    """Même normalisation que le filtre historique : strip + lowercase."""
+    return str(value).strip().lower()
+
+
+def ticket_tags(ticket: Dict[str, Any]) -> Set[str]:
+    """Tags normalisés (sans doublon ni vide) d'un ticket."""
+    tags = set()
+    for t in ticket.get("tags") or []:
+        tt = normalize_tag(t)
+        if tt:
+            tags.add(tt)
+    return tags
+
+
+class TicketIndex:
+    """Index inversés status/priority/tag -> ensemble d'IDs."""
+
+    def __init__(self):
+        self.by_status: Dict[Any, Set[int]] = defaultdict(set)
+        self.by_priority: Dict[Any, Set[int]] = defaultdict(set)
+        self.by_tag: Dict[str, Set[int]] = defaultdict(set)
+
+    @classmethod
+    def from_tickets(cls, tickets: Iterable[Dict[str, Any]]) -> "TicketIndex":
+        index = cls()
+        for t in tickets:
+            index.add(t)
+        return index
+
+    # ---------------- Snapshot (voir snapshot.py) ----------------
+    def state(self) -> Tuple:
+        """Contenu de l'index en types de base (sérialisable par marshal)."""
+        return dict(self.by_status), dict(self.by_priority), dict(self.by_tag)
+
+    @classmethod
+    def from_state(cls, state: Tuple) -> "TicketIndex":
+        index = cls()
+        for target, values in zip((index.by_status, index.by_priority, index.by_tag), state):
+            target.update(values)
+        return index
+
+    # ---------------- Mise à jour incrémentale ----------------
+    def add(self, ticket: Dict[str, Any]) -> None:
+        tid = int(ticket.get("id", -1))
+        self.by_status[ticket.get("status")].add(tid)
+        self.by_priority[ticket.get("priority")].add(tid)
+        for tag in ticket_tags(ticket):
+            self.by_tag[tag].add(tid)
+
+    def remove(self, ticket: Dict[str, Any]) -> None:
+        """À appeler AVANT de modifier le ticket (on retire ses anciennes valeurs)."""
+        tid = int(ticket.get("id", -1))
+        self._discard(self.by_status, ticket.get("status"), tid)
+        self._discard(self.by_priority, ticket.get("priority"), tid)
+        for tag in ticket_tags(ticket):
+            self._discard(self.by_tag, tag, tid)
+
+    @staticmethod
+    def _discard(index: Dict[Any, Set[int]], key: Any, tid: int) -> None:
+        ids = index.get(key)
+        if ids is None:
+            return
+        ids.discard(tid)
+        if not ids:
+            del index[key]
+
+    # ---------------- Requêtes ----------------
+    def lookup(
+        self,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        tag: Optional[str] = None,
+    ) -> Optional[Set[int]]:
+        """
+        IDs correspondant à tous les filtres fournis (intersection, en partant
+        du plus petit ensemble). None si aucun filtre indexé n'est demandé.
+        """
+        sets: List[Set[int]] = []
+        if status is not None:
+            sets.append(self.by_status.get(status, set()))
+        if priority is not None:
+            sets.append(self.by_priority.get(priority, set()))
+        if tag is not None:
+            sets.append(self.by_tag.get(normalize_tag(tag), set()))
+        if not sets:
+            return None
+
+        sets.sort(key=len)
+        result = set(sets[0])
+        for other in sets[1:]:
+            if not result:
+                break
+            result &= other
+        return result
+
+    def values(self, field: str) -> Set[Any]:
+        """Valeurs existantes pour un champ indexé (status, priority, tags)."""
+        index = getattr(self, INDEXED_FIELDS[field])
+        return {key for key, ids in list(index.items()) if ids}
@@ -1,12 +1,42 @@
+import os
+from contextlib import asynccontextmanager
+
+import anyio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 # On importe le routeur que nous venons de créer
-from routers import tickets
+from routers import tickets, tickets_async, changes, metrics
+from serialization import FastJSONResponse
+from storage import get_store, warm_up
+from timing import ENABLED as TIMING_ENABLED, TimingMiddleware
 
 """ Son seul rôle est de configurer l'app et d'importer les routeurs."""
 
+# --- CONFIGURATION ---
+# "sync" : handlers `def` (un thread du pool par requête) ; "async" : handlers `async def` (tickets_async.py)
+HANDLERS = os.environ.get("TICKETS_HANDLERS", "sync")
+# Threads du pool anyio (handlers `def`, dépendances `def`, I/O disque déportées) ; 40 par défaut
+THREADPOOL_SIZE = int(os.environ.get("TICKETS_THREADPOOL_SIZE", "40"))
+# 0 : pas de chargement au démarrage, la première requête paie le chargement du store
+WARMUP = os.environ.get("TICKETS_WARMUP", "1").lower() not in ("0", "false", "no")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    if WARMUP:
+        # Store chargé (depuis le snapshot des index s'il est à jour) avant la première requête
+        await anyio.to_thread.run_sync(warm_up)
+    yield
+    # Arrêt : snapshot à jour, le prochain démarrage n'aura rien à réindexer
+    store = get_store()
+    if hasattr(store, "save_snapshot"):
+        await anyio.to_thread.run_sync(store.save_snapshot)
+
+
 # --- INITIALISATION ---
-app = FastAPI(title="Ticketing API System")
+# Rendu JSON via orjson/ujson quand ils sont installés (voir serialization.py)
+app = FastAPI(title="Ticketing API System", default_response_class=FastJSONResponse, lifespan=lifespan)
 
 # --- CONFIGURATION CORS ---
 app.add_middleware(
@@ -15,10 +45,27 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Lisibles par le front (revalidation de GET /tickets avec If-None-Match)
+    expose_headers=["ETag", "Last-Modified", "Server-Timing"],
 )
 
+# --- CHRONOMÉTRAGE ---
+# Histogrammes sur /metrics + en-tête Server-Timing (TICKETS_TIMING=0 pour désactiver).
+# Ajouté après CORS : il l'enveloppe et mesure donc la requête entière.
+if TIMING_ENABLED:
+    app.add_middleware(TimingMiddleware)
+
 # --- INCLUSION DES ROUTES ---
 # C'est ici qu'on "branche" le fichier tickets.py sur l'application principale
+if HANDLERS == "async":
+    # Les routes async remplacent leurs équivalents `def` ; le reste de tickets.py est gardé
+    app.include_router(tickets_async.router)
+    replaced = {(r.path, frozenset(r.methods)) for r in tickets_async.router.routes}
+    tickets.router.routes = [
+        r for r in tickets.router.routes if (r.path, frozenset(r.methods)) not in replaced
+    ]
 app.include_router(tickets.router)
+app.include_router(changes.router)
+app.include_router(metrics.router)
 
 # Note : Plus besoin de définir les fonctions load_tickets ou les classes ici !
\ No newline at end of file
@@ -0,0 +1,96 @@
+import bisect
+import threading
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+""" Métriques exposées sur GET /metrics (format texte Prometheus).
+
+Chaque module enregistre une fonction de collecte qui renvoie ses
+échantillons au moment du scrape : rien n'est calculé entre deux scrapes.
+Les durées et tailles mesurées requête par requête (timing.py) sont des
+histogrammes : observe() ne fait qu'incrémenter un compteur de bucket.
+"""
+
+# (nom, type prometheus, aide, valeur)
+Sample = Tuple[str, str, str, float]
+
+_collectors: List[Callable[[], Iterable[Sample]]] = []
+_histograms: List["Histogram"] = []
+_collectors_lock = threading.Lock()
+
+# Bornes par défaut (secondes), de 0,5 ms à 10 s
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Bornes pour des tailles (octets, nombre de tickets)
+SIZE_BUCKETS = (0, 1, 10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """Histogramme Prometheus (buckets cumulés, _sum, _count) par jeu de labels."""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # labels -> [compteurs par bucket (+Inf en dernier), somme]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, labels: Tuple[str, ...] = ()) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][i] += 1
+            series[1] += value
+
+    def lines(self) -> List[str]:
+        with self._lock:
+            series = [(labels, list(counts), total) for labels, (counts, total) in self._series.items()]
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, counts, total in sorted(series):
+            pairs = [f'{k}="{_escape(v)}"' for k, v in zip(self.labelnames, labels)]
+            prefix = ",".join(pairs) + "," if pairs else ""
+            suffix = "{" + ",".join(pairs) + "}" if pairs else ""
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{self.name}_bucket{{{prefix}le="{le}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{suffix} {total}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+def register(collector: Callable[[], Iterable[Sample]]) -> None:
+    """Ajoute une fonction de collecte (appelée à chaque GET /metrics)."""
+    with _collectors_lock:
+        _collectors.append(collector)
+
+
+def histogram(name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+    """Crée un histogramme et l'ajoute à l'exposition de GET /metrics."""
+    hist = Histogram(name, help_text, labelnames, buckets)
+    with _collectors_lock:
+        _histograms.append(hist)
+    return hist
+
+
+def render() -> str:
+    """Toutes les métriques, au format d'exposition texte de Prometheus."""
+    with _collectors_lock:
+        collectors = list(_collectors)
+        histograms = list(_histograms)
+    lines: List[str] = []
+    for collector in collectors:
+        for name, kind, help_text, value in collector():
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {value}")
+    for hist in histograms:
+        lines.extend(hist.lines())
+    return "\n".join(lines) + "\n"
@@ -1,6 +1,6 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 
 # ------------------------------------------------------------
 # Constantes métiers : une seule source de vérité
@@ -8,6 +8,8 @@ from pydantic import BaseModel, Field
 # ------------------------------------------------------------
 ALLOWED_PRIORITY = {"Low", "Medium", "High"}
 ALLOWED_STATUS = {"Open", "In progress", "Closed"}
+DEFAULT_PRIORITY = "Low"
+DEFAULT_STATUS = "Open"
 
 # Limites anti-champs "infinis" (ajuste si besoin)
 MAX_TITLE_LEN = 120
@@ -15,6 +17,10 @@ MAX_DESC_LEN = 2000
 MAX_TAGS = 20
 MAX_TAG_LEN = 30
 
+# Messages d'erreur, construits une seule fois
+PRIORITY_ERROR = f"Priorité invalide. Valeurs possibles: {sorted(ALLOWED_PRIORITY)}"
+STATUS_ERROR = f"Statut invalide. Valeurs possibles: {sorted(ALLOWED_STATUS)}"
+
 
 # ------------------------------------------------------------
 # Compat Pydantic v1/v2 pour les validators
@@ -27,6 +33,13 @@ except Exception:
     from pydantic import validator as _validator
 
 
+try:
+    # Pydantic v2 : validation par lots en un appel (voir plus bas)
+    from pydantic import TypeAdapter
+except ImportError:
+    TypeAdapter = None
+
+
 def _clean_text(v: str) -> str:
     """Nettoie une string: strip + refuse vide."""
     if not isinstance(v, str):
@@ -62,6 +75,18 @@ def _clean_tags(tags: Optional[List[str]]) -> List[str]:
     return cleaned
 
 
+def _check_priority(v: str) -> str:
+    if v not in ALLOWED_PRIORITY:
+        raise ValueError(PRIORITY_ERROR)
+    return v
+
+
+def _check_status(v: str) -> str:
+    if v not in ALLOWED_STATUS:
+        raise ValueError(STATUS_ERROR)
+    return v
+
+
 # ------------------------------------------------------------
 # Modèles
 # ------------------------------------------------------------
@@ -73,8 +98,8 @@ class TicketCreate(BaseModel):
     title: str = Field(..., min_length=1, max_length=MAX_TITLE_LEN)
     description: str = Field(..., min_length=1, max_length=MAX_DESC_LEN)
 
-    priority: str = Field(default="Low", description="Low | Medium | High")
-    status: str = Field(default="Open", description="Open | In progress | Closed")
+    priority: str = Field(default=DEFAULT_PRIORITY, description="Low | Medium | High")
+    status: str = Field(default=DEFAULT_STATUS, description="Open | In progress | Closed")
 
     tags: List[str] = Field(default_factory=list, description="Liste de tags (ex: bug, ui, backend)")
 
@@ -89,15 +114,11 @@ class TicketCreate(BaseModel):
 
     @_validator("priority")
     def validate_priority(cls, v: str):
-        if v not in ALLOWED_PRIORITY:
-            raise ValueError(f"Priorité invalide. Valeurs possibles: {sorted(ALLOWED_PRIORITY)}")
-        return v
+        return _check_priority(v)
 
     @_validator("status")
     def validate_status(cls, v: str):
-        if v not in ALLOWED_STATUS:
-            raise ValueError(f"Statut invalide. Valeurs possibles: {sorted(ALLOWED_STATUS)}")
-        return v
+        return _check_status(v)
 
     @_validator("tags")
     def validate_tags(cls, tags: List[str]):
@@ -134,17 +155,13 @@ class TicketUpdate(BaseModel):
     def validate_priority_optional(cls, v):
         if v is None:
             return v
-        if v not in ALLOWED_PRIORITY:
-            raise ValueError(f"Priorité invalide. Valeurs possibles: {sorted(ALLOWED_PRIORITY)}")
-        return v
+        return _check_priority(v)
 
     @_validator("status")
     def validate_status_optional(cls, v):
         if v is None:
             return v
-        if v not in ALLOWED_STATUS:
-            raise ValueError(f"Statut invalide. Valeurs possibles: {sorted(ALLOWED_STATUS)}")
-        return v
+        return _check_status(v)
 
     @_validator("tags")
     def validate_tags_optional(cls, tags):
@@ -153,11 +170,136 @@ class TicketUpdate(BaseModel):
         return _clean_tags(tags)
 
 
-def payload_to_dict(payload: TicketUpdate) -> Dict[str, Any]:
+class TicketFilter(BaseModel):
+    """
+    Sélection de tickets par critères, pour les lots (PATCH / DELETE /tickets).
+    Mêmes filtres et même sémantique que GET /tickets.
+    """
+
+    status: Optional[str] = None
+    priority: Optional[str] = None
+    tag: Optional[str] = None
+    search: Optional[str] = None
+    search_mode: str = Field(default="prefix", description="prefix | exact")
+
+    @_validator("priority")
+    def validate_priority_filter(cls, v):
+        if v is None:
+            return v
+        return _check_priority(v)
+
+    @_validator("status")
+    def validate_status_filter(cls, v):
+        if v is None:
+            return v
+        return _check_status(v)
+
+    @_validator("search_mode")
+    def validate_search_mode(cls, v):
+        if v not in ("prefix", "exact"):
+            raise ValueError("search_mode invalide (prefix/exact).")
+        return v
+
+    def is_empty(self) -> bool:
+        return all(v is None for v in (self.status, self.priority, self.tag, self.search))
+
+
+class TicketBatchItem(TicketUpdate):
+    """Un élément de PATCH /tickets : l'ID du ticket et les champs à modifier."""
+
+    id: int
+
+
+class TicketBatchUpdate(BaseModel):
+    """
+    PATCH /tickets, au choix :
+    - items : liste de {id, champs à modifier} ;
+    - filter + update : mêmes champs appliqués à tous les tickets du filtre.
+    """
+
+    items: Optional[List[TicketBatchItem]] = None
+    filter: Optional[TicketFilter] = None
+    update: Optional[TicketUpdate] = None
+
+
+class TicketBatchDelete(BaseModel):
+    """DELETE /tickets, au choix : ids (liste d'IDs) ou filter."""
+
+    ids: Optional[List[int]] = None
+    filter: Optional[TicketFilter] = None
+
+
+# Pydantic v2 : model_dump, v1 : dict (choisi une fois, pas à chaque appel)
+_DUMP = "model_dump" if hasattr(BaseModel, "model_dump") else "dict"
+
+
+def payload_to_dict(payload: BaseModel, exclude_unset: bool = True) -> Dict[str, Any]:
     """
     Convertit l'objet Pydantic en dict.
     exclude_unset=True = ne garde que les champs réellement envoyés.
     """
-    if hasattr(payload, "model_dump"):  # Pydantic v2
-        return payload.model_dump(exclude_unset=True)
-    return payload.dict(exclude_unset=True)  # Pydantic v1
+    return getattr(payload, _DUMP)(exclude_unset=exclude_unset)
+
+
+# ------------------------------------------------------------
+# Validation par lots (import NDJSON, PATCH /tickets)
+# ------------------------------------------------------------
+# Pydantic v2 : un TypeAdapter sur une liste des modèles ci-dessus valide tout
+# un paquet en un seul appel (mêmes règles, mêmes validators et mêmes erreurs
+# que POST /tickets ou PATCH, puisque ce sont les mêmes modèles). Pydantic v1 : élément par élément.
+if TypeAdapter is not None:
+    _CREATE_ADAPTER = TypeAdapter(List[TicketCreate])
+    _BATCH_ITEM_ADAPTER = TypeAdapter(List[TicketBatchItem])
+else:
+    _CREATE_ADAPTER = _BATCH_ITEM_ADAPTER = None
+
+
+def _validate_batch(
+    adapter,
+    model,
+    exclude_unset: bool,
+    items: List[Dict[str, Any]],
+) -> Tuple[List[Tuple[int, Dict[str, Any]]], List[Tuple[int, List[Dict[str, Any]]]]]:
+    errors: Dict[int, List[Dict[str, Any]]] = {}
+    if adapter is None:
+        valid: List[Tuple[int, Dict[str, Any]]] = []
+        for i, item in enumerate(items):
+            try:
+                valid.append((i, payload_to_dict(model(**item), exclude_unset=exclude_unset)))
+            except ValidationError as e:
+                errors[i] = e.errors()
+        return valid, list(errors.items())
+
+    def validate(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Validation puis conversion en dicts : un appel chacune pour tout le paquet
+        return adapter.dump_python(adapter.validate_python(batch), exclude_unset=exclude_unset)
+
+    try:
+        return list(enumerate(validate(items))), []
+    except ValidationError as e:
+        # loc commence par l'indice dans la liste : retiré (mêmes loc que le modèle seul)
+        for err in e.errors():
+            errors.setdefault(err["loc"][0], []).append({**err, "loc": err["loc"][1:]})
+    # Les autres éléments sont valides : revalidés en un appel
+    kept = [i for i in range(len(items)) if i not in errors]
+    return list(zip(kept, validate([items[i] for i in kept]))), sorted(errors.items())
+
+
+def validate_creates(
+    items: List[Dict[str, Any]]
+) -> Tuple[List[Tuple[int, Dict[str, Any]]], List[Tuple[int, List[Dict[str, Any]]]]]:
+    """
+    Valide une liste de dicts avec TicketCreate
+    -> ([(indice, champs du ticket)], [(indice, erreurs pydantic)]).
+    """
+    return _validate_batch(_CREATE_ADAPTER, TicketCreate, False, items)
+
+
+def validate_batch_items(
+    items: List[Dict[str, Any]]
+) -> Tuple[List[Tuple[int, Dict[str, Any]]], List[Tuple[int, List[Dict[str, Any]]]]]:
+    """
+    Valide une liste de dicts {id, champs à modifier} avec TicketBatchItem
+    -> ([(indice, champs envoyés, id compris)], [(indice, erreurs pydantic)]).
+    """
+    return _validate_batch(_BATCH_ITEM_ADAPTER, TicketBatchItem, True, items)
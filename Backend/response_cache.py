@@ -0,0 +1,89 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from email.utils import formatdate
+from typing import Any, Hashable, Optional, Tuple
+
+""" Cache HTTP de GET /tickets : ETag, Last-Modified et réponses déjà sérialisées.
+
+La clé d'une réponse est (version du store, paramètres normalisés) : une
+mutation change la version, les anciennes entrées ne peuvent donc plus être
+servies et sont vidées au premier accès avec la nouvelle version.
+"""
+
+# Nombre de réponses gardées (TICKETS_RESPONSE_CACHE_SIZE, 0 = désactivé)
+RESPONSE_CACHE_SIZE = int(os.environ.get("TICKETS_RESPONSE_CACHE_SIZE", "128"))
+
+
+def make_etag(version: str, query: Tuple[Any, ...]) -> str:
+    """ETag fort : empreinte de la version des données et de la requête normalisée."""
+    digest = hashlib.blake2b(repr((version, query)).encode("utf-8"), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def http_date(timestamp: float) -> str:
+    """Date au format HTTP (Last-Modified)."""
+    return formatdate(timestamp, usegmt=True)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match contient-il etag ? (liste, "*", comparaison faible W/ comme le veut la RFC 9110)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class ResponseCache:
+    """LRU (version, requête) -> corps de réponse, avec compteurs de hits/misses."""
+
+    def __init__(self, maxsize: int = RESPONSE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Hashable, bytes]" = OrderedDict()
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, version: str, query: Hashable) -> Optional[bytes]:
+        with self._lock:
+            if version != self._version:
+                # Données modifiées : plus aucune entrée n'est valable
+                self._entries.clear()
+                self._version = version
+            body = self._entries.get(query)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(query)
+            self.hits += 1
+            return body
+
+    def put(self, version: str, query: Hashable, body: bytes) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if version != self._version:
+                return  # calculé pendant une mutation : déjà périmé
+            self._entries[query] = body
+            self._entries.move_to_end(query)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -0,0 +1,143 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+# ------------------------------------------------------------
+# Imports robustes (package vs lancement direct)
+# ------------------------------------------------------------
+try:
+    from ..models import ALLOWED_PRIORITY, ALLOWED_STATUS
+    from ..storage import TicketStore, get_store
+    from ..changefeed import ChangeFilters
+    from .. import metrics
+except Exception:
+    from models import ALLOWED_PRIORITY, ALLOWED_STATUS
+    from storage import TicketStore, get_store
+    from changefeed import ChangeFilters
+    import metrics
+
+
+router = APIRouter()
+
+# Commentaire SSE envoyé en l'absence d'événement (détecte les clients partis)
+KEEPALIVE_SECONDS = 15.0
+# Identifiant de reprise (<flux>-<seq>) : au-delà, forcément invalide
+MAX_EVENT_ID_LEN = 64
+
+
+def _changes_metrics():
+    feed = get_store().changes
+    return [
+        ("tickets_changes_subscribers", "gauge", "Abonnés connectés à /tickets/changes.", feed.subscriber_count()),
+        ("tickets_changes_seq", "counter", "Numéro du dernier événement publié.", feed.seq),
+    ]
+
+
+metrics.register(_changes_metrics)
+
+
+def _check_filters(status: Optional[str], priority: Optional[str]) -> Optional[str]:
+    """Message d'erreur si un filtre est invalide, sinon None."""
+    if status is not None and status not in ALLOWED_STATUS:
+        return "Paramètre status invalide."
+    if priority is not None and priority not in ALLOWED_PRIORITY:
+        return "Paramètre priority invalide."
+    return None
+
+
+@router.get("/tickets/changes")
+async def stream_changes(
+    request: Request,
+    status: Optional[str] = Query(default=None),
+    priority: Optional[str] = Query(default=None),
+    tag: Optional[str] = Query(default=None),
+    # Reprise : dernier identifiant reçu (ou en-tête SSE standard Last-Event-ID)
+    since: Optional[str] = Query(default=None, max_length=MAX_EVENT_ID_LEN),
+    last_event_id: Optional[str] = Header(default=None, max_length=MAX_EVENT_ID_LEN),
+    store: TicketStore = Depends(get_store),
+):
+    """
+    Flux Server-Sent Events des créations, modifications et suppressions.
+    Chaque message : id = identifiant de reprise (<flux>-<seq>), event = create
+    | patch | delete | reset | overflow, data = JSON de l'événement. Un
+    identifiant d'un autre worker ou d'avant un redémarrage donne un reset.
+    """
+    error = _check_filters(status, priority)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    if since is None:
+        since = last_event_id
+
+    sub = store.changes.subscribe(ChangeFilters(status, priority, tag), since)
+
+    async def events():
+        try:
+            # Donne le numéro courant : un client peut reprendre même sans événement reçu
+            yield f"retry: 3000\nid: {sub.last_id}\n\n".encode("utf-8")
+            while True:
+                try:
+                    event = await sub.get(timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield b": keepalive\n\n"
+                    continue
+                if event is None:
+                    # Trop lent : on coupe, le client reprend avec Last-Event-ID
+                    yield f'event: overflow\ndata: {{"resume_from": "{sub.last_id}"}}\n\n'.encode("utf-8")
+                    return
+                yield b"id: %s\nevent: %s\ndata: %s\n\n" % (event.id.encode("ascii"), event.op.encode("ascii"), event.payload)
+        finally:
+            sub.close()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/tickets/changes")
+async def websocket_changes(
+    websocket: WebSocket,
+    status: Optional[str] = Query(default=None),
+    priority: Optional[str] = Query(default=None),
+    tag: Optional[str] = Query(default=None),
+    since: Optional[str] = Query(default=None, max_length=MAX_EVENT_ID_LEN),
+    store: TicketStore = Depends(get_store),
+):
+    """Même flux en WebSocket : un message texte JSON par événement (reprise : since=event_id)."""
+    error = _check_filters(status, priority)
+    if error:
+        await websocket.close(code=1008, reason=error)
+        return
+    await websocket.accept()
+    sub = store.changes.subscribe(ChangeFilters(status, priority, tag), since)
+
+    async def wait_disconnect():
+        # Les messages du client sont ignorés ; seule la fermeture compte
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    closed = asyncio.ensure_future(wait_disconnect())
+    try:
+        while True:
+            next_event = asyncio.ensure_future(sub.get())
+            done, _ = await asyncio.wait({next_event, closed}, return_when=asyncio.FIRST_COMPLETED)
+            if closed in done:
+                next_event.cancel()
+                return
+            event = next_event.result()
+            if event is None:
+                await websocket.send_text(f'{{"op": "overflow", "resume_from": "{sub.last_id}"}}')
+                # 1013 : réessayer plus tard (avec since=resume_from)
+                await websocket.close(code=1013)
+                return
+            await websocket.send_text(event.payload.decode("utf-8"))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        closed.cancel()
+        sub.close()
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+# ------------------------------------------------------------
+# Imports robustes (package vs lancement direct)
+# ------------------------------------------------------------
+try:
+    from .. import metrics
+except Exception:
+    import metrics
+
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Métriques au format texte Prometheus."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -1,70 +1,84 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional, Dict, Any, List
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Optional, Dict, Any, List, NamedTuple, Tuple
 from datetime import datetime
+from functools import lru_cache
 
 # ------------------------------------------------------------
 # Imports robustes (package vs lancement direct)
 # ------------------------------------------------------------
 try:
     from ..models import (
-        TicketCreate, TicketUpdate, payload_to_dict,
-        ALLOWED_PRIORITY, ALLOWED_STATUS
+        TicketCreate, TicketUpdate, TicketFilter, TicketBatchUpdate, TicketBatchDelete,
+        payload_to_dict, validate_creates, validate_batch_items, ALLOWED_PRIORITY, ALLOWED_STATUS
+    )
+    from ..storage import TicketStore, get_store
+    from ..async_store import AsyncTicketStore
+    from ..fulltext import SEARCH_MODES
+    from ..indexes import normalize_tag
+    from ..serialization import dumps, loads, encode_list_response
+    from ..response_cache import ResponseCache, make_etag, etag_matches, http_date
+    from .. import metrics
+    from ..timing import stage, observe_result_size
+    from ..sorting import (
+        PRIORITY_WEIGHT, STATUS_WEIGHT, ALLOWED_SORT_BY, ALLOWED_ORDER,
+        SortSpec, parse_date_yyyy_mm_dd, encode_cursor, decode_cursor
     )
-    from ..storage import load_tickets, save_tickets, next_id
 except Exception:
     from models import (
-        TicketCreate, TicketUpdate, payload_to_dict,
-        ALLOWED_PRIORITY, ALLOWED_STATUS
+        TicketCreate, TicketUpdate, TicketFilter, TicketBatchUpdate, TicketBatchDelete,
+        payload_to_dict, validate_creates, validate_batch_items, ALLOWED_PRIORITY, ALLOWED_STATUS
+    )
+    from storage import TicketStore, get_store
+    from async_store import AsyncTicketStore
+    from fulltext import SEARCH_MODES
+    from indexes import normalize_tag
+    from serialization import dumps, loads, encode_list_response
+    from response_cache import ResponseCache, make_etag, etag_matches, http_date
+    import metrics
+    from timing import stage, observe_result_size
+    from sorting import (
+        PRIORITY_WEIGHT, STATUS_WEIGHT, ALLOWED_SORT_BY, ALLOWED_ORDER,
+        SortSpec, parse_date_yyyy_mm_dd, encode_cursor, decode_cursor
     )
-    from storage import load_tickets, save_tickets, next_id
 
 
 router = APIRouter()
 
-# Tri métier (évite "alphabétique")
-PRIORITY_WEIGHT = {"Low": 1, "Medium": 2, "High": 3}
-STATUS_WEIGHT = {"Open": 1, "In progress": 2, "Closed": 3}
+# GET /tickets : taille max d'une page
+MAX_PAGE_SIZE = 500
 
-ALLOWED_SORT_BY = {"id", "createdAt", "priority", "status", "title"}
-ALLOWED_ORDER = {"asc", "desc"}
-
-
-def parse_date_yyyy_mm_dd(value: str) -> datetime:
-    """Parse YYYY-MM-DD. Si invalide, renvoie une date ancienne."""
-    try:
-        return datetime.strptime(value, "%Y-%m-%d")
-    except Exception:
-        return datetime(1970, 1, 1)
+# Import NDJSON : nombre de lignes validées par paquet, erreurs détaillées max
+BULK_CHUNK_LINES = 500
+MAX_BULK_ERRORS = 1000
 
+# PATCH / DELETE /tickets : nombre max de tickets par lot (liste ou filtre)
+MAX_BATCH_SIZE = int(os.environ.get("TICKETS_MAX_BATCH", 1000))
 
-def normalize_tags(ticket: Dict[str, Any]) -> List[str]:
-    """Retourne les tags du ticket en lowercase, sans crash si absent."""
-    raw = ticket.get("tags") or []
-    return [str(t).strip().lower() for t in raw if str(t).strip()]
+# Réponses sérialisées de GET /tickets, par (version du store, requête)
+response_cache = ResponseCache()
 
 
-def contains_text(ticket: Dict[str, Any], needle: str) -> bool:
-    """
-    Recherche insensible à la casse dans:
-    - title
-    - description
-    - tags   ✅ (ça corrige ton test SECURITY qui retournait vide)
-    """
-    needle = needle.lower()
+def _response_cache_metrics():
+    return [
+        ("tickets_response_cache_hits_total", "counter", "Réponses GET /tickets servies depuis le cache.", response_cache.hits),
+        ("tickets_response_cache_misses_total", "counter", "Réponses GET /tickets recalculées.", response_cache.misses),
+        ("tickets_response_cache_hit_ratio", "gauge", "Part des GET /tickets servis depuis le cache.", response_cache.hit_rate),
+        ("tickets_count", "gauge", "Nombre de tickets du store.", get_store().get_stats()["total"]),
+    ]
 
-    hay_title = str(ticket.get("title", "")).lower()
-    hay_desc = str(ticket.get("description", "")).lower()
-    hay_tags = normalize_tags(ticket)
 
-    return (
-        needle in hay_title
-        or needle in hay_desc
-        or any(needle in t for t in hay_tags)
-    )
+metrics.register(_response_cache_metrics)
 
 
 def build_sort_key(field: str):
-    """Retourne la key() adaptée au champ trié."""
+    """
+    Retourne la key() adaptée au champ trié.
+    (Référence : get_tickets utilise les clés précalculées de sorting.py.)
+    """
     if field == "id":
         return lambda t: int(t.get("id", -1))
     if field == "title":
@@ -78,13 +92,31 @@ def build_sort_key(field: str):
     return lambda t: int(t.get("id", -1))
 
 
-@router.get("/tickets")
-def get_tickets(
+class TicketsQuery(NamedTuple):
+    """Paramètres validés de GET /tickets."""
+    # Paramètres normalisés : clé du cache de réponses et de l'ETag
+    key: Tuple
+    spec: SortSpec
+    # Valeurs brutes du curseur
+    after: Optional[List[Any]]
+
+    @property
+    def archive_query(self) -> Dict[str, Any]:
+        """Filtres qui décident si la page peut lire l'archive (TicketStore.archive_hit)."""
+        return {"status": self.key[0], "created_from": self.key[-2], "created_to": self.key[-1]}
+
+
+async def tickets_query(
     # ---------------- FILTRES ----------------
     status: Optional[str] = Query(default=None),
     priority: Optional[str] = Query(default=None),
     tag: Optional[str] = Query(default=None),
     search: Optional[str] = Query(default=None),
+    # prefix : index plein texte (mots, sans accents) | exact : sous-chaîne (historique)
+    search_mode: str = Query(default="prefix"),
+    # Date de création (YYYY-MM-DD, bornes incluses) ; inclut les tickets archivés
+    created_from: Optional[str] = Query(default=None),
+    created_to: Optional[str] = Query(default=None),
 
     # ---------------- TRI ----------------
     sort_by: str = Query(default="id"),
@@ -95,12 +127,42 @@ def get_tickets(
     then_order: str = Query(default="desc"),
 
     # ---------------- PAGINATION ----------------
-    limit: int = Query(default=200, ge=1, le=500),
+    limit: int = Query(default=200, ge=1, le=MAX_PAGE_SIZE),
     offset: int = Query(default=0, ge=0),
-):
-    tickets = load_tickets()
+    # Pagination par curseur : valeur next_cursor de la page précédente
+    cursor: Optional[str] = Query(default=None),
+) -> TicketsQuery:
+    """
+    Dépendance commune aux handlers sync et async de GET /tickets.
+    async def : exécutée dans la boucle, sans prendre de thread du pool.
+    """
+    return parse_tickets_query(
+        status, priority, tag, search, search_mode, sort_by, order, then_by, then_order, limit, offset, cursor,
+        created_from, created_to,
+    )
+
 
-    # 1) Validations params
+def parse_tickets_query(
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    tag: Optional[str] = None,
+    search: Optional[str] = None,
+    search_mode: str = "prefix",
+    sort_by: str = "id",
+    order: str = "desc",
+    then_by: Optional[str] = None,
+    then_order: str = "desc",
+    limit: int = 200,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+) -> TicketsQuery:
+    """Validation des paramètres de GET /tickets (partagée avec la CLI de script.py)."""
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"Paramètre limit invalide (1 à {MAX_PAGE_SIZE}).")
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="Paramètre offset invalide.")
     if status is not None and status not in ALLOWED_STATUS:
         raise HTTPException(status_code=400, detail="Paramètre status invalide.")
     if priority is not None and priority not in ALLOWED_PRIORITY:
@@ -113,50 +175,283 @@ def get_tickets(
         raise HTTPException(status_code=400, detail="Paramètre then_by invalide.")
     if then_order not in ALLOWED_ORDER:
         raise HTTPException(status_code=400, detail="Paramètre then_order invalide (asc/desc).")
-
-    # 2) Filtrage
-    results = tickets
-
-    if status is not None:
-        results = [t for t in results if t.get("status") == status]
-
-    if priority is not None:
-        results = [t for t in results if t.get("priority") == priority]
-
+    if search_mode not in SEARCH_MODES:
+        raise HTTPException(status_code=400, detail="Paramètre search_mode invalide (prefix/exact).")
+    for name, value in (("created_from", created_from), ("created_to", created_to)):
+        if value is not None and not _is_day(value):
+            raise HTTPException(status_code=400, detail=f"Paramètre {name} invalide (YYYY-MM-DD).")
+    if cursor is not None and offset:
+        raise HTTPException(status_code=400, detail="Paramètres cursor et offset incompatibles.")
+
+    # Forme canonique (celle qu'appliquent les stores) : deux requêtes équivalentes
+    # partagent l'entrée du cache de réponses et l'ETag
     if tag is not None:
-        tag_lc = tag.strip().lower()
-        results = [t for t in results if tag_lc in normalize_tags(t)]
-
+        tag = normalize_tag(tag)
     if search is not None:
-        needle = search.strip().lower()
-        if needle:
-            results = [t for t in results if contains_text(t, needle)]
+        search = search.strip().lower() or None
+    if search is None:
+        search_mode = "prefix"
+    # Tri secondaire ignoré par SortSpec : même tri que sans then_by
+    if sort_by == "id" or then_by == sort_by:
+        then_by = None
+    if then_by is None:
+        then_order = "desc"
+
+    spec = SortSpec(sort_by, order, then_by, then_order)
+    after = None
+    if cursor is not None:
+        try:
+            after = decode_cursor(spec, cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Paramètre cursor invalide.")
+
+    key = (
+        status, priority, tag, search, search_mode, sort_by, order, then_by, then_order, limit, offset, cursor,
+        created_from, created_to,
+    )
+    return TicketsQuery(key, spec, after)
+
 
-    total = len(results)
+def cache_headers(version: str, modified_at: float, q: TicketsQuery) -> Dict[str, str]:
+    """ETag (version des données + requête) et Last-Modified d'une réponse de GET /tickets."""
+    return {
+        "ETag": make_etag(version, q.key),
+        "Last-Modified": http_date(modified_at),
+        # Le client peut garder la réponse mais doit la revalider (If-None-Match)
+        "Cache-Control": "no-cache",
+    }
 
-    # 3) Tri multi-critères (stable)
-    if then_by is not None:
-        results.sort(key=build_sort_key(then_by), reverse=(then_order == "desc"))
-    results.sort(key=build_sort_key(sort_by), reverse=(order == "desc"))
 
-    # 4) Pagination
-    paged = results[offset: offset + limit]
+@router.get("/tickets")
+def get_tickets(
+    q: TicketsQuery = Depends(tickets_query),
+    # ---------------- CACHE HTTP ----------------
+    if_none_match: Optional[str] = Header(default=None),
+    store: TicketStore = Depends(get_store),
+):
+    # 1) Validations params : tickets_query
+
+    # 2) Cache HTTP : même version des données + même requête = même réponse
+    version, modified_at = store.version()
+    headers = cache_headers(version, modified_at, q)
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    body = response_cache.get(version, q.key)
+    if body is None:
+        body = tickets_page_body(store, q)
+        # Lot écrit pendant le calcul (lecture commencée avant lui) : page pas gardée sous l'ancienne version
+        if response_cache.maxsize > 0 and store.version()[0] == version:
+            response_cache.put(version, q.key, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def tickets_page_body(store: TicketStore, q: TicketsQuery) -> bytes:
+    """Filtrage, tri multi-critères et pagination (délégués au store), puis sérialisation."""
+    (status, priority, tag, search, search_mode, sort_by, order, then_by, then_order, limit, offset, cursor,
+     created_from, created_to) = q.key
+    page = store.query(
+        status=status, priority=priority, tag=tag, search=search, search_mode=search_mode,
+        sort=q.spec, offset=offset, limit=limit, after=q.after, created_from=created_from, created_to=created_to,
+    )
+    observe_result_size(page.total)
+    next_cursor = encode_cursor(q.spec, page.next_after) if page.next_after is not None else None
 
-    return {
-        "items": paged,
-        "total": total,
+    # Réponse assemblée à partir des tickets déjà encodés (cache du store) :
+    # pas de jsonable_encoder sur chaque ticket
+    meta = {
+        "total": page.total,
         "limit": limit,
         "offset": offset,
         "sort_by": sort_by,
         "order": order,
         "then_by": then_by,
         "then_order": then_order,
-        "filters": {"status": status, "priority": priority, "tag": tag, "search": search},
+        "cursor": cursor,
+        "next_cursor": next_cursor,
+        "filters": {
+            "status": status, "priority": priority, "tag": tag, "search": search, "search_mode": search_mode,
+            "created_from": created_from, "created_to": created_to,
+        },
+    }
+    with stage("serialize"):
+        return encode_list_response((store.encoded(t) for t in page.items), meta)
+
+
+# :int : /tickets/stats, /tickets/export, /tickets/changes... ne sont jamais pris pour un ID
+@router.get("/tickets/{ticket_id:int}")
+def get_ticket(ticket_id: int, store: TicketStore = Depends(get_store)):
+    """Un ticket par son ID (index id -> ticket du store, sans parcourir la liste)."""
+    ticket = store.get(ticket_id)
+    if ticket is None:
+        raise HTTPException(status_code=404, detail="Ce ticket n'existe pas.")
+    return Response(content=store.encoded(ticket), media_type="application/json")
+
+
+@router.get("/tickets/stats")
+def get_ticket_stats(store: TicketStore = Depends(get_store)):
+    """
+    Compteurs par statut, priorité, tag et jour de création.
+    Maintenus incrémentalement par le store : pas de parcours des tickets.
+    """
+    return store.get_stats()
+
+
+@router.get("/tickets/export")
+def export_tickets(store: TicketStore = Depends(get_store)):
+    """
+    Tous les tickets en NDJSON (un objet JSON par ligne), par id croissant.
+    Le corps est produit paquet par paquet : ni la liste complète ni la
+    réponse entière ne sont construites en mémoire.
+    """
+    def lines():
+        for chunk in store.iter_tickets():
+            yield b"".join(dumps(t) + b"\n" for t in chunk)
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="tickets.ndjson"'},
+    )
+
+
+@lru_cache(maxsize=4096)
+def _is_day(value: str) -> bool:
+    """YYYY-MM-DD valide ? (mis en cache : un import répète souvent les mêmes dates)"""
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+        return True
+    except ValueError:
+        return False
+
+
+def _created_at(raw: Dict[str, Any], today: str) -> str:
+    """createdAt fourni (YYYY-MM-DD) conservé à l'import, sinon la date du jour."""
+    value = raw.get("createdAt")
+    if isinstance(value, str) and _is_day(value):
+        return value
+    return today
+
+
+def _decode_lines(
+    lines: List[Tuple[int, bytes]], errors: List[Dict[str, Any]]
+) -> Tuple[List[int], List[Dict[str, Any]]]:
+    """Lignes NDJSON -> (numéros de ligne, objets JSON) ; les lignes illisibles vont dans errors."""
+    line_nos: List[int] = []
+    raws: List[Dict[str, Any]] = []
+    for line_no, line in lines:
+        try:
+            raw = loads(line)
+        except ValueError as e:
+            errors.append({"line": line_no, "errors": [{"loc": [], "msg": f"JSON invalide: {e}"}]})
+            continue
+        if not isinstance(raw, dict):
+            errors.append({"line": line_no, "errors": [{"loc": [], "msg": "Chaque ligne doit être un objet JSON."}]})
+            continue
+        line_nos.append(line_no)
+        raws.append(raw)
+    return line_nos, raws
+
+
+def _line_errors(line_no: int, errs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {"line": line_no, "errors": [{"loc": list(err.get("loc", ())), "msg": err.get("msg", "")} for err in errs]}
+
+
+def validate_lines(lines: List[Tuple[int, bytes]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Valide un paquet de lignes NDJSON avec les règles de TicketCreate -> (tickets, erreurs)."""
+    errors: List[Dict[str, Any]] = []
+    line_nos, raws = _decode_lines(lines, errors)
+    # Tout le paquet en un appel (voir models.validate_creates)
+    valid, invalid = validate_creates(raws)
+    today = datetime.now().strftime("%Y-%m-%d")
+    tickets: List[Dict[str, Any]] = []
+    for i, ticket in valid:
+        ticket["createdAt"] = _created_at(raws[i], today)
+        tickets.append(ticket)
+    if invalid:
+        errors.extend(_line_errors(line_nos[i], errs) for i, errs in invalid)
+        errors.sort(key=lambda e: e["line"])
+    return tickets, errors
+
+
+def validate_update_lines(
+    lines: List[Tuple[int, bytes]]
+) -> Tuple[List[Tuple[int, Dict[str, Any]]], List[Dict[str, Any]]]:
+    """
+    Valide des lignes NDJSON {id, champs à modifier} (items de PATCH /tickets)
+    -> ([(id, champs)], erreurs).
+    """
+    errors: List[Dict[str, Any]] = []
+    line_nos, raws = _decode_lines(lines, errors)
+    valid, invalid = validate_batch_items(raws)
+    errors.extend(_line_errors(line_nos[i], errs) for i, errs in invalid)
+    changes: List[Tuple[int, Dict[str, Any]]] = []
+    for i, data in valid:
+        ticket_id = data.pop("id")
+        if not data:
+            errors.append({"line": line_nos[i], "errors": [{"loc": [], "msg": f"Aucune donnée reçue pour le ticket {ticket_id}."}]})
+            continue
+        changes.append((ticket_id, data))
+    errors.sort(key=lambda e: e["line"])
+    return changes, errors
+
+
+@router.post("/tickets/bulk")
+async def bulk_create_tickets(request: Request, store: TicketStore = Depends(get_store)):
+    """
+    Import en masse : corps NDJSON, un ticket (format TicketCreate) par ligne.
+    - lignes validées par paquets au fil de la lecture du corps ;
+    - une ligne invalide est signalée (numéro + erreurs) sans bloquer les autres ;
+    - les tickets valides sont créés en une seule écriture (IDs attribués par le store,
+      un éventuel "id" dans la ligne est ignoré).
+    """
+    tickets: List[Dict[str, Any]] = []
+    errors: List[Dict[str, Any]] = []
+    rejected = 0
+    received = 0
+    pending: List[Tuple[int, bytes]] = []
+    buffer = b""
+    line_no = 0
+
+    async def flush() -> None:
+        nonlocal rejected
+        valid, bad = await run_in_threadpool(validate_lines, pending[:])
+        pending.clear()
+        tickets.extend(valid)
+        rejected += len(bad)
+        errors.extend(bad[:MAX_BULK_ERRORS - len(errors)])
+
+    async for data in request.stream():
+        buffer += data
+        *complete, buffer = buffer.split(b"\n")
+        for line in complete:
+            line_no += 1
+            if line.strip():
+                received += 1
+                pending.append((line_no, line))
+        if len(pending) >= BULK_CHUNK_LINES:
+            await flush()
+    if buffer.strip():
+        line_no += 1
+        received += 1
+        pending.append((line_no, buffer))
+    if pending:
+        await flush()
+
+    # Une seule mutation dans la file d'écriture pour tout le lot
+    created = await AsyncTicketStore(store).create_many(tickets)
+    return {
+        "received": received,
+        "created": len(created),
+        "rejected": rejected,
+        "first_id": created[0]["id"] if created else None,
+        "last_id": created[-1]["id"] if created else None,
+        "errors": errors,
     }
 
 
 @router.post("/tickets", status_code=201)
-def create_ticket(payload: TicketCreate):
+def create_ticket(payload: TicketCreate, store: TicketStore = Depends(get_store)):
     """
     Ici on fait confiance à TicketCreate:
     - tailles max
@@ -164,29 +459,119 @@ def create_ticket(payload: TicketCreate):
     - priority/status valides
     - tags propres
     """
-    tickets = load_tickets()
+    # L'ID est attribué par le store, au moment de l'écriture
+    return store.create(new_ticket(payload))
+
 
-    ticket = payload.model_dump() if hasattr(payload, "model_dump") else payload.dict()
-    ticket["id"] = next_id(tickets)
+def new_ticket(payload: TicketCreate) -> Dict[str, Any]:
+    """Dict du ticket à créer (sans ID), avec la date du jour."""
+    ticket = payload_to_dict(payload, exclude_unset=False)
 
     # Optionnel : auto date si absente
     if "createdAt" not in ticket:
         ticket["createdAt"] = datetime.now().strftime("%Y-%m-%d")
-
-    tickets.append(ticket)
-    save_tickets(tickets)
     return ticket
 
 
+# ------------------------------------------------------------
+# Lots : PATCH / DELETE /tickets (une seule écriture par lot)
+# ------------------------------------------------------------
+def check_batch_size(size: int) -> None:
+    if size > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Lot trop grand : {MAX_BATCH_SIZE} tickets maximum.")
+
+
+def filter_ids(store: TicketStore, f: TicketFilter) -> List[int]:
+    """IDs des tickets du filtre (mêmes critères que GET /tickets), 413 au-delà de MAX_BATCH_SIZE."""
+    if f.is_empty():
+        raise HTTPException(status_code=400, detail="Filtre vide : au moins un critère est requis.")
+    page = store.query(
+        status=f.status, priority=f.priority, tag=f.tag, search=f.search, search_mode=f.search_mode,
+        sort=SortSpec("id", "asc"), offset=0, limit=MAX_BATCH_SIZE,
+    )
+    check_batch_size(page.total)
+    return [int(t["id"]) for t in page.items]
+
+
+def check_batch_update(payload: TicketBatchUpdate) -> Tuple[Optional[List[Tuple[int, Dict[str, Any]]]], Dict[str, Any]]:
+    """
+    Valide la forme de PATCH /tickets.
+    -> (changements, {}) pour une liste d'items ; (None, champs communs) pour filter + update.
+    """
+    if (payload.items is None) == (payload.filter is None):
+        raise HTTPException(status_code=400, detail="Fournir soit items, soit filter + update.")
+    if payload.items is not None:
+        if payload.update is not None:
+            raise HTTPException(status_code=400, detail="update s'utilise avec filter, pas avec items.")
+        check_batch_size(len(payload.items))
+        changes = []
+        for item in payload.items:
+            data = payload_to_dict(item)
+            ticket_id = data.pop("id")
+            if not data:
+                raise HTTPException(status_code=400, detail=f"Aucune donnée reçue pour le ticket {ticket_id}.")
+            changes.append((ticket_id, data))
+        return changes, {}
+    data = payload_to_dict(payload.update) if payload.update is not None else {}
+    if not data:
+        raise HTTPException(status_code=400, detail="Aucune donnée reçue.")
+    return None, data
+
+
+def filter_changes(ids: List[int], data: Dict[str, Any]) -> List[Tuple[int, Dict[str, Any]]]:
+    """Mêmes champs pour chaque ticket, copiés : aucun ticket ne partage la liste de tags d'un autre."""
+    return [(tid, {k: list(v) if isinstance(v, list) else v for k, v in data.items()}) for tid in ids]
+
+
+def check_batch_delete(payload: TicketBatchDelete) -> Optional[List[int]]:
+    """Valide la forme de DELETE /tickets -> liste d'IDs, ou None pour un filtre."""
+    if (payload.ids is None) == (payload.filter is None):
+        raise HTTPException(status_code=400, detail="Fournir soit ids, soit filter.")
+    if payload.ids is not None:
+        check_batch_size(len(payload.ids))
+    return payload.ids
+
+
+def batch_report(done: str, ids: List[int], results: List[Any]) -> Dict[str, Any]:
+    """Réponse d'un lot : compteurs + statut par ID, dans l'ordre de la demande."""
+    count = sum(1 for r in results if r)
+    return {
+        "requested": len(ids),
+        done: count,
+        "not_found": len(ids) - count,
+        "results": [{"id": tid, "status": done if r else "not_found"} for tid, r in zip(ids, results)],
+    }
+
+
+@router.patch("/tickets")
+def patch_tickets(payload: TicketBatchUpdate, store: TicketStore = Depends(get_store)):
+    """
+    Modification en lot, appliquée en mémoire puis persistée en une seule écriture :
+    - items : [{id, champs...}, ...] (chaque item validé comme TicketUpdate) ;
+    - filter + update : mêmes champs pour tous les tickets du filtre.
+    """
+    changes, data = check_batch_update(payload)
+    if changes is None:
+        changes = filter_changes(filter_ids(store, payload.filter), data)
+    tickets = store.update_many(changes)
+    return batch_report("updated", [tid for tid, _ in changes], tickets)
+
+
+@router.delete("/tickets")
+def delete_tickets(payload: TicketBatchDelete, store: TicketStore = Depends(get_store)):
+    """Suppression en lot (ids ou filter), en une seule écriture."""
+    ids = check_batch_delete(payload)
+    if ids is None:
+        ids = filter_ids(store, payload.filter)
+    return batch_report("deleted", ids, store.delete_many(ids))
+
+
 @router.patch("/tickets/{ticket_id}")
-def patch_ticket(ticket_id: int, payload: TicketUpdate):
+def patch_ticket(ticket_id: int, payload: TicketUpdate, store: TicketStore = Depends(get_store)):
     """
     Idem : TicketUpdate gère les validations (si champ fourni).
     """
-    tickets = load_tickets()
-
-    ticket = next((t for t in tickets if int(t.get("id", -1)) == ticket_id), None)
-    if ticket is None:
+    if store.get(ticket_id) is None:
         raise HTTPException(status_code=404, detail="Ce ticket n'existe pas.")
 
     data = payload_to_dict(payload)
@@ -194,21 +579,14 @@ def patch_ticket(ticket_id: int, payload: TicketUpdate):
         raise HTTPException(status_code=400, detail="Aucune donnée reçue.")
 
     # applique les champs envoyés
-    for k, v in data.items():
-        ticket[k] = v
-
-    save_tickets(tickets)
+    ticket = store.update(ticket_id, data)
+    if ticket is None:
+        raise HTTPException(status_code=404, detail="Ce ticket n'existe pas.")
     return ticket
 
 
 @router.delete("/tickets/{ticket_id}", status_code=204)
-def delete_ticket(ticket_id: int):
-    tickets = load_tickets()
-    before = len(tickets)
-
-    tickets = [t for t in tickets if int(t.get("id", -1)) != ticket_id]
-    if len(tickets) == before:
+def delete_ticket(ticket_id: int, store: TicketStore = Depends(get_store)):
+    if not store.delete(ticket_id):
         raise HTTPException(status_code=404, detail="Ticket introuvable.")
-
-    save_tickets(tickets)
     return None
@@ -0,0 +1,112 @@
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import Response
+from typing import Optional
+
+# ------------------------------------------------------------
+# Imports robustes (package vs lancement direct)
+# ------------------------------------------------------------
+try:
+    from ..models import TicketCreate, TicketUpdate, TicketBatchUpdate, TicketBatchDelete, payload_to_dict
+    from ..async_store import AsyncTicketStore, get_async_store
+    from ..response_cache import etag_matches
+    from .tickets import (
+        TicketsQuery, tickets_query, cache_headers, tickets_page_body, new_ticket, response_cache,
+        filter_ids, check_batch_update, filter_changes, check_batch_delete, batch_report,
+    )
+except Exception:
+    from models import TicketCreate, TicketUpdate, TicketBatchUpdate, TicketBatchDelete, payload_to_dict
+    from async_store import AsyncTicketStore, get_async_store
+    from response_cache import etag_matches
+    from routers.tickets import (
+        TicketsQuery, tickets_query, cache_headers, tickets_page_body, new_ticket, response_cache,
+        filter_ids, check_batch_update, filter_changes, check_batch_delete, batch_report,
+    )
+
+""" Handlers `async def` des routes principales (TICKETS_HANDLERS=async).
+
+Mêmes routes et mêmes réponses que tickets.py, mais aucune requête ne prend
+de thread du pool : les lectures sont servies depuis la mémoire dans la
+boucle asyncio, les écritures attendent le thread écrivain via un Future
+(voir async_store.py). main.py monte ces routes à la place des versions
+`def` de tickets.py.
+"""
+
+router = APIRouter()
+
+
+@router.get("/tickets")
+async def get_tickets(
+    q: TicketsQuery = Depends(tickets_query),
+    if_none_match: Optional[str] = Header(default=None),
+    store: AsyncTicketStore = Depends(get_async_store),
+):
+    version, modified_at = await store.version()
+    headers = cache_headers(version, modified_at, q)
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    body = response_cache.get(version, q.key)
+    if body is None:
+        body = await store.read(tickets_page_body, store.store, q, query=q.archive_query)
+        if response_cache.maxsize > 0 and (await store.version())[0] == version:
+            response_cache.put(version, q.key, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/tickets/{ticket_id:int}")
+async def get_ticket(ticket_id: int, store: AsyncTicketStore = Depends(get_async_store)):
+    ticket = await store.get(ticket_id)
+    if ticket is None:
+        raise HTTPException(status_code=404, detail="Ce ticket n'existe pas.")
+    return Response(content=store.store.encoded(ticket), media_type="application/json")
+
+
+@router.get("/tickets/stats")
+async def get_ticket_stats(store: AsyncTicketStore = Depends(get_async_store)):
+    return await store.get_stats()
+
+
+@router.post("/tickets", status_code=201)
+async def create_ticket(payload: TicketCreate, store: AsyncTicketStore = Depends(get_async_store)):
+    return await store.create(new_ticket(payload))
+
+
+@router.patch("/tickets")
+async def patch_tickets(payload: TicketBatchUpdate, store: AsyncTicketStore = Depends(get_async_store)):
+    changes, data = check_batch_update(payload)
+    if changes is None:
+        changes = filter_changes(
+            await store.read(filter_ids, store.store, payload.filter, query={"status": payload.filter.status}), data
+        )
+    tickets = await store.update_many(changes)
+    return batch_report("updated", [tid for tid, _ in changes], tickets)
+
+
+@router.delete("/tickets")
+async def delete_tickets(payload: TicketBatchDelete, store: AsyncTicketStore = Depends(get_async_store)):
+    ids = check_batch_delete(payload)
+    if ids is None:
+        ids = await store.read(filter_ids, store.store, payload.filter, query={"status": payload.filter.status})
+    return batch_report("deleted", ids, await store.delete_many(ids))
+
+
+@router.patch("/tickets/{ticket_id}")
+async def patch_ticket(ticket_id: int, payload: TicketUpdate, store: AsyncTicketStore = Depends(get_async_store)):
+    if await store.get(ticket_id) is None:
+        raise HTTPException(status_code=404, detail="Ce ticket n'existe pas.")
+
+    data = payload_to_dict(payload)
+    if not data:
+        raise HTTPException(status_code=400, detail="Aucune donnée reçue.")
+
+    ticket = await store.update(ticket_id, data)
+    if ticket is None:
+        raise HTTPException(status_code=404, detail="Ce ticket n'existe pas.")
+    return ticket
+
+
+@router.delete("/tickets/{ticket_id}", status_code=204)
+async def delete_ticket(ticket_id: int, store: AsyncTicketStore = Depends(get_async_store)):
+    if not await store.delete(ticket_id):
+        raise HTTPException(status_code=404, detail="Ticket introuvable.")
+    return None
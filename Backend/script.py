@@ -1,39 +1,49 @@
+import argparse
 import json
-import os
+import sys
 from datetime import datetime
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
 
-# Constante pour le nom du fichier
-FICHIER_DONNEES = 'structure_ticket.json'
+from fastapi import HTTPException
+from pydantic import ValidationError
 
-# --- GESTION DES FICHIERS ---
+try:
+    from .serialization import dumps, loads
+    from .models import TicketCreate, TicketUpdate, payload_to_dict, ALLOWED_PRIORITY, ALLOWED_STATUS
+    from .sorting import ALLOWED_SORT_BY, ALLOWED_ORDER, SortSpec
+    from .storage import DATA_FILE, get_store, iter_file
+    from .streaming import stream_tickets, write_ndjson
+    from .routers.tickets import (
+        parse_tickets_query, tickets_page_body, new_ticket, validate_lines, validate_update_lines, batch_report
+    )
+except ImportError:
+    from serialization import dumps, loads
+    from models import TicketCreate, TicketUpdate, payload_to_dict, ALLOWED_PRIORITY, ALLOWED_STATUS
+    from sorting import ALLOWED_SORT_BY, ALLOWED_ORDER, SortSpec
+    from storage import DATA_FILE, get_store, iter_file
+    from streaming import stream_tickets, write_ndjson
+    from routers.tickets import (
+        parse_tickets_query, tickets_page_body, new_ticket, validate_lines, validate_update_lines, batch_report
+    )
 
-def open_read_JSON():
-    """Lit le fichier JSON et retourne la liste des tickets."""
-    if not os.path.exists(FICHIER_DONNEES):
-        return []
-    try:
-        with open(FICHIER_DONNEES, 'r', encoding='utf-8') as fichier:
-            return json.load(fichier)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return []
+# Fichier de données de l'API (TICKETS_DATA_FILE), quel que soit le dossier courant
+FICHIER_DONNEES = DATA_FILE
 
-def save_JSON(data):
-    """Sauvegarde la liste des données dans le fichier JSON."""
-    with open(FICHIER_DONNEES, 'w', encoding='utf-8') as file:
-        json.dump(data, file, ensure_ascii=False, indent=4)
+# Critères du menu "Filtrer" -> compteurs de get_stats() donnant les valeurs existantes
+FILTRES_MENU = {"status": "by_status", "priority": "by_priority", "tag": "by_tag"}
 
 # --- FONCTIONS LOGIQUES (MÉTIER) ---
 # Ces fonctions ne contiennent aucun print() ni input()
 
-def count_tic_stat(liste_tickets):
-    """Compte le nombre de tickets par statut."""
+def count_tic_stat(stats):
+    """
+    Compte le nombre de tickets par statut (clés en minuscules), à partir
+    des compteurs de store.get_stats() : aucun parcours des tickets.
+    """
     resultats = {}
-    for ticket in liste_tickets:
-        s = ticket.get('status', 'inconnu').lower()
-        if s in resultats:
-            resultats[s] += 1
-        else:
-            resultats[s] = 1
+    for status, n in stats["by_status"].items():
+        s = status.lower()
+        resultats[s] = resultats.get(s, 0) + n
     return resultats
 
 def trier(liste_tickets, critere='priority'):
@@ -41,72 +51,282 @@ def trier(liste_tickets, critere='priority'):
     # On utilise str() pour éviter les crashs si la valeur n'est pas une string
     return sorted(liste_tickets, key=lambda x: str(x.get(critere, '')).lower())
 
-def filtre(liste_tickets, critere, valeur):
-    """Filtre la liste pour ne garder que les tickets correspondant à la valeur."""
-    return [ticket for ticket in liste_tickets if str(ticket.get(critere, '')).lower() == valeur.lower()]
 
-def ajouter_ticket(data, title, description, priority, status, tags):
-    """Crée un ticket, l'ajoute à la liste et sauvegarde."""
-    if data:
-        # On s'assure que l'ID est bien un entier pour l'incrémentation
-        last_id = int(data[-1]['id'])
-        new_id = last_id + 1
-    else:
-        new_id = 1
-    
-    new_ticket = {
-        "id": new_id,
-        "title": title,
-        "description": description,
-        "priority": priority,
-        "status": status,
-        "tags": tags,
-        "createdAt": datetime.now().strftime("%Y-%m-%d")
-    }
-    
-    data.append(new_ticket)
-    save_JSON(data)
-    return new_ticket
-
-def mettre_a_jour_ticket_logique(data, ticket_id, modifications):
+# --- COMMANDES (sous-commandes, pour les scripts et les tâches cron) ---
+# Même store, mêmes index et mêmes validations que l'API : aucune requête HTTP.
+# Code de sortie : 0 OK, 1 lignes rejetées ou tickets introuvables, 2 paramètres invalides.
+
+def _numbered_lines(stream: BinaryIO) -> List[Tuple[int, bytes]]:
+    """Lignes non vides d'un flux NDJSON, avec leur numéro (pour les erreurs)."""
+    return [(line_no, line) for line_no, line in enumerate(stream, 1) if line.strip()]
+
+
+def _import_lines(path: str) -> List[Tuple[int, bytes]]:
     """
-    Met à jour un ticket spécifique.
-    modifications est un dictionnaire contenant les champs à changer.
+    Tickets d'un fichier à importer, au format de validate_lines : NDJSON,
+    ou tableau JSON (décodé en flux, numéro = position dans le tableau).
     """
-    ticket_trouve = None
-    for ticket in data:
-        if ticket['id'] == ticket_id:
-            ticket_trouve = ticket
-            break
-    
-    if ticket_trouve:
-        # On applique les modifications seulement si elles ne sont pas vides
-        for cle, valeur in modifications.items():
-            if valeur: # Si la valeur n'est pas vide
-                ticket_trouve[cle] = valeur
-        
-        save_JSON(data)
-        return ticket_trouve
-    return None
+    if path == "-":
+        return _numbered_lines(sys.stdin.buffer)
+    with open(path, "rb") as f:
+        first = f.read(64).lstrip()[:1]
+        f.seek(0)
+        if first != b"[":
+            return _numbered_lines(f)
+    return [(pos, dumps(ticket)) for pos, ticket in enumerate(iter_file(path), 1)]
+
+
+def _write(out: BinaryIO, data: Any, pretty: bool = False) -> None:
+    """Écrit un résultat JSON (bytes déjà encodés ou objet) suivi d'un saut de ligne."""
+    if pretty:
+        text = json.dumps(loads(data) if isinstance(data, bytes) else data, ensure_ascii=False, indent=2)
+        data = text.encode("utf-8")
+    elif not isinstance(data, bytes):
+        data = dumps(data)
+    out.write(data + b"\n")
+
+
+def _validation_errors(e: ValidationError) -> List[Dict[str, Any]]:
+    return [{"loc": list(err.get("loc", ())), "msg": err.get("msg", "")} for err in e.errors()]
+
+
+def _fields(args: argparse.Namespace) -> Dict[str, Any]:
+    """Champs d'un ticket donnés en options (tags séparés par des virgules)."""
+    fields = {k: getattr(args, k) for k in ("title", "description", "priority", "status") if getattr(args, k) is not None}
+    if args.tags is not None:
+        fields["tags"] = [tag.strip() for tag in args.tags.split(",") if tag.strip()]
+    return fields
+
+
+def _creation_report(store, lines: List[Tuple[int, bytes]], out: BinaryIO) -> int:
+    """Valide les lignes et crée les tickets valides en une seule écriture (comme POST /tickets/bulk)."""
+    tickets, errors = validate_lines(lines)
+    created = store.create_many(tickets) if tickets else []
+    _write(out, {
+        "received": len(lines),
+        "created": len(created),
+        "rejected": len(errors),
+        "first_id": created[0]["id"] if created else None,
+        "last_id": created[-1]["id"] if created else None,
+        "errors": errors,
+    })
+    return 1 if errors else 0
+
+
+def cmd_list(store, args: argparse.Namespace, out: BinaryIO) -> int:
+    """Même corps que GET /tickets pour les mêmes paramètres."""
+    q = parse_tickets_query(
+        args.status, args.priority, args.tag, args.search, args.search_mode,
+        args.sort_by, args.order, args.then_by, args.then_order, args.limit, args.offset, args.cursor,
+        args.created_from, args.created_to,
+    )
+    _write(out, tickets_page_body(store, q), args.pretty)
+    return 0
+
+
+def cmd_stats(store, args: argparse.Namespace, out: BinaryIO) -> int:
+    """Même corps que GET /tickets/stats."""
+    _write(out, store.get_stats(), args.pretty)
+    return 0
+
+
+def cmd_add(store, args: argparse.Namespace, out: BinaryIO) -> int:
+    """Un ticket donné en options, ou un lot NDJSON lu sur l'entrée standard."""
+    fields = _fields(args)
+    if not fields:
+        return _creation_report(store, _numbered_lines(sys.stdin.buffer), out)
+    try:
+        payload = TicketCreate(**fields)
+    except ValidationError as e:
+        _write(sys.stderr.buffer, {"errors": _validation_errors(e)})
+        return 2
+    _write(out, store.create(new_ticket(payload)), args.pretty)
+    return 0
+
+
+def cmd_update(store, args: argparse.Namespace, out: BinaryIO) -> int:
+    """
+    Un ticket (ID + champs en options), ou un lot NDJSON {id, champs} lu sur
+    l'entrée standard, appliqué en une seule écriture (comme PATCH /tickets).
+    """
+    if args.id is None:
+        changes, errors = validate_update_lines(_numbered_lines(sys.stdin.buffer))
+        results = store.update_many(changes) if changes else []
+        report = batch_report("updated", [tid for tid, _ in changes], results)
+        report["rejected"] = len(errors)
+        report["errors"] = errors
+        _write(out, report, args.pretty)
+        return 1 if errors or report["not_found"] else 0
+    try:
+        data = payload_to_dict(TicketUpdate(**_fields(args)))
+    except ValidationError as e:
+        _write(sys.stderr.buffer, {"errors": _validation_errors(e)})
+        return 2
+    if not data:
+        raise HTTPException(status_code=400, detail="Aucune donnée reçue.")
+    ticket = store.update(args.id, data)
+    if ticket is None:
+        print(f"Ticket {args.id} introuvable.", file=sys.stderr)
+        return 1
+    _write(out, ticket, args.pretty)
+    return 0
+
+
+def cmd_import(store, args: argparse.Namespace, out: BinaryIO) -> int:
+    """Import d'un fichier (tableau JSON ou NDJSON) : nouveaux IDs, createdAt conservé, une seule écriture."""
+    return _creation_report(store, _import_lines(args.path), out)
+
+
+def _query_export(store, args: argparse.Namespace) -> Iterator[bytes]:
+    """Tickets filtrés et triés comme GET /tickets, sans pagination, par paquets de lignes."""
+    # Validation et tri identiques à GET /tickets (la taille de page ne sert pas ici)
+    q = parse_tickets_query(
+        args.status, args.priority, args.tag, args.search, args.search_mode,
+        args.sort_by, args.order, args.then_by, args.then_order, 1,
+        created_from=args.created_from, created_to=args.created_to,
+    )
+    page = store.query(
+        status=args.status, priority=args.priority, tag=args.tag, search=args.search,
+        search_mode=args.search_mode, sort=q.spec, offset=0, limit=max(1, store.get_stats()["total"]),
+        created_from=args.created_from, created_to=args.created_to,
+    )
+    for start in range(0, len(page.items), 1000):
+        yield b"".join(store.encoded(t) + b"\n" for t in page.items[start:start + 1000])
+
+
+def cmd_export(store, args: argparse.Namespace, out: BinaryIO) -> int:
+    """
+    Tickets en NDJSON. Sans option : comme GET /tickets/export (tous, par id
+    croissant). Avec des filtres ou un tri : même sélection et même ordre que
+    GET /tickets. --source : filtre un fichier en flux, sans le charger.
+    """
+    filters = {"status": args.status, "priority": args.priority, "tag": args.tag,
+               "search": args.search, "search_mode": args.search_mode,
+               "created_from": args.created_from, "created_to": args.created_to}
+    if args.source is not None:
+        # Ordre du fichier : un tri demanderait de tout garder en mémoire
+        if (args.sort_by, args.order, args.then_by) != ("id", "asc", None):
+            raise HTTPException(status_code=400, detail="--source exporte dans l'ordre du fichier, sans tri.")
+        write_ndjson(stream_tickets(args.source, **filters), out)
+        return 0
+    if any(filters[k] is not None for k in ("status", "priority", "tag", "search", "created_from", "created_to")) \
+            or (args.sort_by, args.order, args.then_by) != ("id", "asc", None):
+        chunks: Iterable[bytes] = _query_export(store, args)
+    else:
+        chunks = (b"".join(dumps(t) + b"\n" for t in chunk) for chunk in store.iter_tickets())
+    for chunk in chunks:
+        out.write(chunk)
+    return 0
 
-# --- FONCTIONS UTILITAIRES ---
 
-def check_crit(liste_tickets, critere):
-    """Renvoie les valeurs uniques existantes pour un critère donné."""
-    valeurs_possibles = set()
-    for ticket in liste_tickets:
-        if critere in ticket:
-            valeurs_possibles.add(ticket[critere])
-    return valeurs_possibles
+def cmd_archive(store, args: argparse.Namespace, out: BinaryIO) -> int:
+    """Archive tout de suite les tickets Closed anciens (sinon : au démarrage du serveur, puis toutes les heures)."""
+    if getattr(store, "archive", None) is None:
+        print("Archive désactivée (TICKETS_ARCHIVE_DAYS=0 ou backend sqlite).", file=sys.stderr)
+        return 1
+    _write(out, {"archived": store.archive_closed()}, args.pretty)
+    return 0
 
-# --- INTERFACE UTILISATEUR (CLI) ---
+
+def _day(value: str) -> str:
+    """Type argparse des options de date (mêmes dates que GET /tickets)."""
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"date invalide : {value} (YYYY-MM-DD)")
+    return value
+
+
+def _filter_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--status", choices=sorted(ALLOWED_STATUS))
+    parser.add_argument("--priority", choices=sorted(ALLOWED_PRIORITY))
+    parser.add_argument("--tag")
+    parser.add_argument("--search")
+    parser.add_argument("--search-mode", default="prefix", choices=["prefix", "exact"])
+    parser.add_argument("--created-from", type=_day, help="createdAt minimal (YYYY-MM-DD, inclus)")
+    parser.add_argument("--created-to", type=_day, help="createdAt maximal (YYYY-MM-DD, inclus)")
+
+
+def _sort_options(parser: argparse.ArgumentParser, order: str) -> None:
+    parser.add_argument("--sort-by", default="id", choices=sorted(ALLOWED_SORT_BY))
+    parser.add_argument("--order", default=order, choices=sorted(ALLOWED_ORDER))
+    parser.add_argument("--then-by", choices=sorted(ALLOWED_SORT_BY))
+    parser.add_argument("--then-order", default="desc", choices=sorted(ALLOWED_ORDER))
+
+
+def _ticket_options(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--title")
+    parser.add_argument("--description")
+    parser.add_argument("--priority", choices=sorted(ALLOWED_PRIORITY))
+    parser.add_argument("--status", choices=sorted(ALLOWED_STATUS))
+    parser.add_argument("--tags", help="tags séparés par des virgules")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Gestion des tickets sans passer par HTTP (même store que l'API). Sans commande : menu interactif."
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    p = commands.add_parser("list", help="une page de tickets, comme GET /tickets")
+    _filter_options(p)
+    _sort_options(p, "desc")
+    p.add_argument("--limit", type=int, default=200)
+    p.add_argument("--offset", type=int, default=0)
+    p.add_argument("--cursor", help="next_cursor de la page précédente")
+    p.add_argument("--pretty", action="store_true", help="JSON indenté")
+    p.set_defaults(func=cmd_list)
+
+    p = commands.add_parser("stats", help="compteurs, comme GET /tickets/stats")
+    p.add_argument("--pretty", action="store_true", help="JSON indenté")
+    p.set_defaults(func=cmd_stats)
+
+    p = commands.add_parser("add", help="crée un ticket (options), ou un lot NDJSON lu sur stdin")
+    _ticket_options(p)
+    p.add_argument("--pretty", action="store_true", help="JSON indenté")
+    p.set_defaults(func=cmd_add)
+
+    p = commands.add_parser("update", help="modifie un ticket (ID + options), ou un lot NDJSON {id, ...} lu sur stdin")
+    p.add_argument("id", type=int, nargs="?")
+    _ticket_options(p)
+    p.add_argument("--pretty", action="store_true", help="JSON indenté")
+    p.set_defaults(func=cmd_update)
+
+    p = commands.add_parser("import", help="importe un fichier de tickets (tableau JSON ou NDJSON, - pour stdin)")
+    p.add_argument("path")
+    p.set_defaults(func=cmd_import)
+
+    p = commands.add_parser("export", help="tickets en NDJSON (filtres et tri de GET /tickets)")
+    _filter_options(p)
+    _sort_options(p, "asc")
+    p.add_argument("--source", help="fichier de tickets à filtrer en flux, à la place du store")
+    p.add_argument("--output", "-o", help="fichier de sortie (stdout par défaut)")
+    p.set_defaults(func=cmd_export)
+
+    p = commands.add_parser("archive", help="archive les tickets Closed anciens (TICKETS_ARCHIVE_DAYS)")
+    p.add_argument("--pretty", action="store_true", help="JSON indenté")
+    p.set_defaults(func=cmd_archive)
+    return parser
+
+
+def run_command(store, args: argparse.Namespace) -> int:
+    """Exécute la sous-commande ; les erreurs de validation de l'API deviennent le code de sortie 2."""
+    try:
+        if getattr(args, "output", None):
+            with open(args.output, "wb") as out:
+                return args.func(store, args, out)
+        return args.func(store, args, sys.stdout.buffer)
+    except HTTPException as e:
+        print(f"Erreur : {e.detail}", file=sys.stderr)
+        return 2
+
+
+# --- INTERFACE UTILISATEUR (menu interactif) ---
 # Tout ce qui concerne l'interaction humaine est ici
 
-if __name__ == "__main__":
+def interactive(store):
     print("--- Démarrage du script en mode CLI ---")
-    data = open_read_JSON()
-    
-    if not data:
+    if not store.get_stats()["total"]:
         print("Attention : Aucune donnée chargée ou fichier vide.")
 
     while True:
@@ -122,6 +342,8 @@ if __name__ == "__main__":
 
         if choix == '1':
             critere = input("Critère de tri (id, status, priority, tags, createdAt) : ")
+            # Copie de tous les tickets (archivés compris), seulement pour ce choix
+            data = [t for chunk in store.iter_tickets() for t in chunk]
             # Correction du bug logique 'or' que tu avais
             if critere in ['id', 'status', 'priority', 'tags', 'createdAt']:
                 res = trier(data, critere)
@@ -131,12 +353,20 @@ if __name__ == "__main__":
                 print(json.dumps(trier(data), indent=2, ensure_ascii=False))
 
         elif choix == '2':
-            critere = input("Critère (status, priority) : ")
-            possibles = check_crit(data, critere)
+            critere = input("Critère (status, priority, tag) : ")
+            if critere not in FILTRES_MENU:
+                print("Critère inconnu.")
+                continue
+            # Valeurs existantes : compteurs du store (tickets archivés compris), aucun parcours
+            stats = store.get_stats()
+            possibles = set(stats[FILTRES_MENU[critere]])
             print(f"Valeurs existantes : {possibles}")
-            valeur = input("Valeur recherchée : ")
-            res = filtre(data, critere, valeur)
-            print(json.dumps(res, indent=2, ensure_ascii=False))
+            valeur = input("Valeur recherchée : ").strip()
+            # Comparaison sans casse ; les tags sont normalisés par le store
+            valeur = next((v for v in possibles if v.lower() == valeur.lower()), valeur)
+            # Mêmes index que GET /tickets, par id croissant
+            page = store.query(**{critere: valeur}, sort=SortSpec("id", "asc"), limit=max(1, stats["total"]))
+            print(json.dumps([dict(t) for t in page.items], indent=2, ensure_ascii=False))
 
         elif choix == '3':
             # On pose les questions ICI, pas dans la fonction
@@ -154,8 +384,13 @@ if __name__ == "__main__":
             tags_input = input("Tags (séparés par des virgules) : ")
             tags_list = [tag.strip() for tag in tags_input.split(',')]
             
-            # Appel de la fonction pure
-            ticket = ajouter_ticket(data, t, d, p, s, tags_list)
+            try:
+                payload = TicketCreate(title=t, description=d, priority=p, status=s, tags=tags_list)
+            except ValidationError as e:
+                print(f"❌ Ticket invalide : {_validation_errors(e)}")
+                continue
+            # Une écriture via le store : index et fichier (ou journal) à jour
+            ticket = store.create(new_ticket(payload))
             print(f"✅ Ticket ajouté : ID {ticket['id']}")
 
         elif choix == '4':
@@ -168,34 +403,52 @@ if __name__ == "__main__":
                 new_desc = input("Nouvelle description : ")
                 new_p = input("Nouvelle priorité : ").capitalize()
                 new_s = input("Nouveau statut : ").capitalize()
-                
-                # On vérifie la validité des champs restreints si l'utilisateur a tapé quelque chose
-                if new_p and new_p not in ['Low', 'Medium', 'High']:
-                    print("Priorité invalide, ignorée.")
-                    new_p = None
-                
-                if new_s and new_s not in ['Open', 'In progress', 'Closed']:
-                    print("Statut invalide, ignoré.")
-                    new_s = None
 
-                # On construit le dictionnaire de modifications
+                # On ne garde que les champs saisis
                 updates = {
                     "title": new_title,
                     "description": new_desc,
                     "priority": new_p,
                     "status": new_s
                 }
-                
-                resultat = mettre_a_jour_ticket_logique(data, tid, updates)
-                if resultat:
-                    print(f"✅ Ticket {tid} mis à jour.")
-                else:
+                updates = {cle: valeur for cle, valeur in updates.items() if valeur}
+                # Mêmes règles que PATCH /tickets/{id} (titre vide, priorité ou statut invalides refusés)
+                try:
+                    updates = payload_to_dict(TicketUpdate(**updates))
+                except ValidationError as e:
+                    print(f"❌ Modification invalide : {_validation_errors(e)}")
+                    continue
+
+                # Recherche par l'index id -> ticket du store, pas de parcours de la liste
+                if store.get(tid) is None:
                     print("❌ ID introuvable.")
+                elif updates:
+                    store.update(tid, updates)
+                    print(f"✅ Ticket {tid} mis à jour.")
             except ValueError:
                 print("Erreur : L'ID doit être un nombre.")
 
         elif choix == '5':
-            print(count_tic_stat(data))
+            # Compteurs du store (tickets archivés compris), comme GET /tickets/stats
+            stats = store.get_stats()
+            print(count_tic_stat(stats))
 
         elif choix == 'q':
-            break
\ No newline at end of file
+            break
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    store = get_store()
+    try:
+        if args.command is None:
+            interactive(store)
+            return 0
+        return run_command(store, args)
+    finally:
+        # Attend les écritures en attente (thread écrivain) avant de quitter
+        store.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+import codecs
+import json
+import os
+import re
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from fastapi.responses import Response
+
+""" Sérialisation JSON rapide (réponses HTTP et fichiers de données).
+
+orjson si installé, sinon ujson, sinon le module json standard : mêmes
+fonctions dumps()/loads(), qui travaillent en bytes UTF-8 (accents non
+échappés, comme ensure_ascii=False).
+
+Sur le disque, les fichiers sont compacts par défaut ; TICKETS_JSON_INDENT=1
+garde l'indentation (2 espaces) pour un fichier lisible à la main.
+
+Les Mapping autres que dict (TicketRecord de compact.py) sont encodés
+comme des objets JSON.
+"""
+
+try:
+    import orjson
+except ImportError:  # dépendance optionnelle
+    orjson = None
+
+try:
+    import ujson
+except ImportError:  # dépendance optionnelle
+    ujson = None
+
+if orjson is not None:
+    JSON_LIB = "orjson"
+elif ujson is not None:
+    JSON_LIB = "ujson"
+else:
+    JSON_LIB = "json"
+
+# Indentation des fichiers écrits par le store (lisibilité vs taille/temps)
+INDENT_ON_DISK = os.environ.get("TICKETS_JSON_INDENT", "0").lower() in ("1", "true", "yes")
+
+
+# ------------------------------------------------------------
+# Encodage / décodage
+# ------------------------------------------------------------
+def _default(obj: Any) -> Any:
+    """Types que les libs JSON ne connaissent pas : Mapping -> dict."""
+    if isinstance(obj, Mapping):
+        to_dict = getattr(obj, "to_dict", None)
+        return to_dict() if to_dict is not None else dict(obj)
+    raise TypeError(f"Type {type(obj).__name__} non sérialisable en JSON")
+
+
+def dumps(obj: Any, indent: bool = False, lib: Optional[str] = None) -> bytes:
+    """Encode obj en JSON (bytes UTF-8). indent=True : 2 espaces."""
+    lib = lib or JSON_LIB
+    if lib == "orjson":
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_INDENT_2 if indent else 0)
+    if lib == "ujson":
+        return ujson.dumps(
+            obj, ensure_ascii=False, escape_forward_slashes=False, indent=2 if indent else 0, default=_default
+        ).encode("utf-8")
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2, default=_default).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def loads(data: Any, lib: Optional[str] = None) -> Any:
+    """Décode du JSON (bytes ou str). ValueError si invalide, quelle que soit la lib."""
+    lib = lib or JSON_LIB
+    if lib == "orjson":
+        return orjson.loads(data)
+    if lib == "ujson":
+        return ujson.loads(data)
+    return json.loads(data)
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Suite possible d'un nombre coupé par la fin du morceau ("12", "1.", "3e-")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+\-]*")
+_DECODER = json.JSONDecoder()
+
+# Taille de lecture du flux ; au-delà de MAX_ITEM_CHARS, un élément illisible
+# est une erreur de syntaxe (et non un élément coupé par la fin du morceau)
+STREAM_CHUNK_SIZE = 1 << 20
+MAX_ITEM_CHARS = 16 << 20
+
+
+def iter_array(stream: Any, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Décode un tableau JSON élément par élément depuis un flux binaire
+    (fichier ouvert en "rb", mmap...) : un générateur qui ne garde en mémoire
+    que le morceau en cours de lecture, quelle que soit la taille du fichier.
+    Module json standard (orjson et ujson n'ont pas de décodage incrémental).
+    ValueError si le JSON est invalide, TypeError si ce n'est pas un tableau.
+    """
+    read = stream.read
+    decode_utf8 = codecs.getincrementaldecoder("utf-8")().decode
+    decode = _DECODER.raw_decode
+    skip = _WHITESPACE.match
+    buf, pos, eof = "", 0, False
+
+    def more() -> None:
+        # Garde la fin non lue (pos repart de 0) et ajoute un morceau
+        nonlocal buf, pos, eof
+        chunk = read(chunk_size)
+        eof = not chunk
+        buf = buf[pos:] + decode_utf8(chunk, final=eof)
+        pos = 0
+
+    def next_char() -> str:
+        """Premier caractère non blanc à partir de pos ("" en fin de flux)."""
+        nonlocal pos
+        while True:
+            pos = skip(buf, pos).end()
+            if pos < len(buf) or eof:
+                return buf[pos:pos + 1]
+            more()
+
+    if next_char() != "[":
+        raise TypeError("Tableau JSON attendu")
+    pos += 1
+    if next_char() == "]":
+        pos += 1
+    else:
+        while True:
+            next_char()
+            while True:
+                try:
+                    obj, end = decode(buf, pos)
+                except ValueError:
+                    # Élément coupé par la fin du morceau : on lit la suite
+                    if eof or len(buf) - pos > MAX_ITEM_CHARS:
+                        raise
+                    more()
+                    continue
+                # Un nombre en fin de morceau peut continuer dans le suivant
+                if not eof and _NUMBER_TAIL.match(buf, end).end() == len(buf):
+                    more()
+                    continue
+                break
+            pos = end
+            yield obj
+            sep = next_char()
+            pos += 1
+            if sep == "]":
+                break
+            if sep != ",":
+                raise ValueError(f"',' ou ']' attendu dans le tableau JSON, trouvé {sep!r}")
+    if next_char():
+        raise ValueError("Données en trop après le tableau JSON")
+
+
+def dumps_file(tickets: Any) -> bytes:
+    """Contenu d'un fichier de données (compact, ou indenté si TICKETS_JSON_INDENT)."""
+    return dumps(tickets, indent=INDENT_ON_DISK)
+
+
+# ------------------------------------------------------------
+# Réponses HTTP
+# ------------------------------------------------------------
+class FastJSONResponse(Response):
+    """JSONResponse dont le rendu passe par dumps() (orjson/ujson si dispo)."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def encode_list_response(items: Iterable[bytes], meta: Dict[str, Any], key: str = "items") -> bytes:
+    """
+    Corps JSON {"<key>": [...], **meta} assemblé à partir de tickets déjà
+    encodés : ni jsonable_encoder, ni ré-encodage des tickets.
+    """
+    body = dumps(meta)
+    head = b'{"' + key.encode("utf-8") + b'":[' + b",".join(items) + b"]"
+    if body == b"{}":
+        return head + b"}"
+    # body commence par "{" : on le colle derrière la liste
+    return head + b"," + body[1:]
@@ -0,0 +1,48 @@
+import mmap
+import os
+import struct
+
+""" Compteur de version partagé entre process (plusieurs workers uvicorn).
+
+Un petit fichier de 8 octets (<fichier>.version) est mappé en mémoire par
+chaque worker. Le worker qui écrit incrémente le compteur sous le verrou de
+fichier, après avoir persisté ses opérations ; les autres comparent la valeur
+lue dans la mémoire partagée à la dernière qu'ils ont vue. Une lecture du
+compteur ne fait aucun appel système : c'est le test fait à chaque requête.
+"""
+
+_FORMAT = "<Q"
+_SIZE = struct.calcsize(_FORMAT)
+
+
+class SharedVersion:
+    """Entier 64 bits dans un fichier mappé en mémoire, créé à zéro si absent."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._map = None
+
+    def _mapped(self) -> mmap.mmap:
+        if self._map is None:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if os.fstat(fd).st_size < _SIZE:
+                    os.ftruncate(fd, _SIZE)  # complété par des zéros
+                self._map = mmap.mmap(fd, _SIZE)
+            finally:
+                os.close(fd)  # le mapping reste valide après close
+        return self._map
+
+    def value(self) -> int:
+        return struct.unpack_from(_FORMAT, self._mapped())[0]
+
+    def bump(self) -> int:
+        """Incrémente et renvoie la nouvelle valeur (verrou de fichier tenu par l'appelant)."""
+        value = self.value() + 1
+        struct.pack_into(_FORMAT, self._mapped(), 0, value)
+        return value
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
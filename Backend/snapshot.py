@@ -0,0 +1,126 @@
+import gc
+import hashlib
+import marshal
+import mmap
+import os
+import struct
+import sys
+import threading
+import zlib
+from typing import Any, Optional, Tuple
+
+try:
+    from . import indexes, fulltext, sorting, stats
+except ImportError:
+    import indexes, fulltext, sorting, stats
+
+""" Snapshot binaire du store : tickets parsés + index, relus au démarrage.
+
+Au lieu de décoder le fichier JSON puis de reconstruire tous les index
+(l'essentiel du temps de démarrage), le store relit <fichier>.snap : un
+en-tête fixe puis l'état sérialisé par marshal (types de base uniquement :
+dicts, listes, sets, tuples, str, int ; aucun code exécuté à la lecture,
+contrairement à pickle).
+
+En-tête (HEADER, 40 octets) : magic, version du format, version de Python,
+empreinte du code des index, taille et CRC32 de la charge utile. Le fichier
+est lu via mmap : la somme de contrôle et marshal travaillent directement
+sur les pages du fichier, sans copie intermédiaire.
+
+Un snapshot est ignoré (chargement normal) si l'en-tête ne correspond pas :
+autre format, autre Python, code des index modifié (tokenisation, clés de
+tri...), fichier tronqué ou corrompu. Qu'il corresponde aux données sur le
+disque est vérifié par le backend (source / resume, voir storage.py).
+
+Écriture : fichier temporaire propre au process puis os.replace, jamais de
+fichier à moitié écrit sous le nom final. Pas de fsync : un snapshot perdu
+se reconstruit au prochain démarrage.
+"""
+
+MAGIC = b"TKSNAP\x00\x00"
+# À incrémenter quand la forme de l'état change (voir TicketStore.save_snapshot)
+FORMAT_VERSION = 1
+# magic, format, version de Python, empreinte du code, taille, CRC32
+HEADER = struct.Struct("<8sHH16sQI")
+
+_fingerprint: Optional[bytes] = None
+
+
+def code_fingerprint() -> bytes:
+    """
+    Empreinte des modules qui calculent le contenu des index : un snapshot
+    écrit par une autre version du code n'est jamais relu.
+    """
+    global _fingerprint
+    if _fingerprint is None:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(marshal.dumps(marshal.version))
+        for module in (indexes, fulltext, sorting, stats):
+            try:
+                with open(module.__file__, "rb") as f:
+                    digest.update(f.read())
+            except (OSError, TypeError):
+                digest.update(module.__name__.encode())
+        _fingerprint = digest.digest()
+    return _fingerprint
+
+
+def _python_tag() -> int:
+    return sys.version_info[0] * 100 + sys.version_info[1]
+
+
+def encode_snapshot(source: Any, state: Any) -> bytes:
+    """En-tête + charge utile ; source identifie l'état du disque que décrit state."""
+    payload = marshal.dumps((source, state))
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, _python_tag(), code_fingerprint(), len(payload), zlib.crc32(payload))
+    return header + payload
+
+
+def write_snapshot(path: str, data: bytes) -> None:
+    """Remplace le snapshot de façon atomique (fichier temporaire + os.replace)."""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        # Snapshot facultatif : au pire, le prochain démarrage relit le JSON
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def read_snapshot(path: str) -> Optional[Tuple[Any, Any]]:
+    """(source, état) du snapshot, ou None s'il est absent, d'un autre format ou corrompu."""
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                magic, version, python, fingerprint, length, crc = HEADER.unpack_from(m)
+                if (magic, version, python, fingerprint) != (MAGIC, FORMAT_VERSION, _python_tag(), code_fingerprint()):
+                    return None
+                if length != size - HEADER.size:
+                    return None
+                view = memoryview(m)[HEADER.size:]
+                try:
+                    if zlib.crc32(view) != crc:
+                        return None
+                    # Le store suspend déjà le ramasse-miettes pendant un chargement ;
+                    # sans lui, il parcourrait les conteneurs créés sans rien libérer
+                    enabled = gc.isenabled()
+                    gc.disable()
+                    try:
+                        source, state = marshal.loads(view)
+                    finally:
+                        if enabled:
+                            gc.enable()
+                finally:
+                    view.release()
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, EOFError, TypeError):
+        return None
+    return source, state
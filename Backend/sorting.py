@@ -0,0 +1,254 @@
+import base64
+import heapq
+import json
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from functools import total_ordering
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+""" Tri et pagination de GET /tickets.
+
+- Les clés de tri de chaque ticket sont précalculées une fois (par le store)
+  au lieu d'appeler strptime/lower() dans chaque comparaison.
+- Quand offset + limit est petit devant le nombre de résultats, on fait une
+  sélection partielle (heapq) au lieu d'un tri complet.
+- Pagination par curseur (keyset) : le curseur opaque encode la clé de tri
+  du dernier ticket renvoyé ; la page suivante commence strictement après.
+
+L'ordre est celui de l'ancien double tri stable : sort_by, puis then_by,
+puis id croissant pour les égalités.
+"""
+
+# Tri métier (évite "alphabétique")
+PRIORITY_WEIGHT = {"Low": 1, "Medium": 2, "High": 3}
+STATUS_WEIGHT = {"Open": 1, "In progress": 2, "Closed": 3}
+
+ALLOWED_SORT_BY = {"id", "createdAt", "priority", "status", "title"}
+ALLOWED_ORDER = {"asc", "desc"}
+
+# Ordre des valeurs dans le tuple renvoyé par sort_values()
+SORT_FIELDS = ("id", "createdAt", "priority", "status", "title")
+_POS = {field: i for i, field in enumerate(SORT_FIELDS)}
+
+# Au-delà de cette fraction du total, un tri complet bat heapq
+_TOPK_RATIO = 0.25
+
+
+def parse_date_yyyy_mm_dd(value: str) -> datetime:
+    """Parse YYYY-MM-DD. Si invalide, renvoie une date ancienne."""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except Exception:
+        return datetime(1970, 1, 1)
+
+
+def day_range(created_from: Optional[str], created_to: Optional[str]) -> Optional[Tuple[int, int]]:
+    """
+    Bornes incluses, en numéros de jour (comme sort_values), des filtres
+    created_from / created_to de GET /tickets (YYYY-MM-DD déjà validés).
+    None : pas de filtre de date.
+    """
+    if created_from is None and created_to is None:
+        return None
+    low = parse_date_yyyy_mm_dd(created_from).toordinal() if created_from is not None else 1
+    high = parse_date_yyyy_mm_dd(created_to).toordinal() if created_to is not None else datetime.max.toordinal()
+    return low, high
+
+
+def sort_values(ticket: Dict[str, Any]) -> Tuple[int, int, int, int, str]:
+    """Clés de tri précalculées d'un ticket, dans l'ordre de SORT_FIELDS."""
+    return (
+        int(ticket.get("id", -1)),
+        parse_date_yyyy_mm_dd(str(ticket.get("createdAt", ""))).toordinal(),
+        PRIORITY_WEIGHT.get(ticket.get("priority"), 0),
+        STATUS_WEIGHT.get(ticket.get("status"), 0),
+        str(ticket.get("title", "")).lower(),
+    )
+
+
+@total_ordering
+class _Desc:
+    """Inverse l'ordre d'une valeur non numérique (titre en tri descendant)."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __lt__(self, other: "_Desc") -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Desc) and self.value == other.value
+
+
+class SortSpec:
+    """Critères de tri d'une requête, transformés en une clé ascendante unique."""
+
+    def __init__(self, sort_by: str, order: str, then_by: Optional[str] = None, then_order: str = "desc"):
+        # (champ, descendant ?) ; l'id croissant départage toujours les égalités
+        self.fields: List[Tuple[str, bool]] = [(sort_by, order == "desc")]
+        if sort_by != "id":
+            if then_by is not None and then_by != sort_by:
+                self.fields.append((then_by, then_order == "desc"))
+            if then_by != "id":
+                self.fields.append(("id", False))
+        self._pos = [(_POS[f], desc) for f, desc in self.fields]
+        # Un titre en ordre décroissant ne se "négative" pas : clé objet (_Desc),
+        # trop lente pour heapq, on passe alors par des tris stables successifs
+        self.has_desc_text = any(f == "title" and desc for f, desc in self.fields)
+
+    @property
+    def primary(self) -> Tuple[str, bool]:
+        """(champ, descendant ?) du critère principal."""
+        return self.fields[0]
+
+    @property
+    def signature(self) -> str:
+        return ",".join(f"{f}:{'d' if desc else 'a'}" for f, desc in self.fields)
+
+    def raw(self, values: Sequence[Any]) -> List[Any]:
+        """Valeurs (non transformées) des champs de tri, pour le curseur."""
+        return [values[pos] for pos, _ in self._pos]
+
+    def key(self, raw: Sequence[Any]) -> Tuple:
+        """Clé comparable en ordre croissant à partir des valeurs brutes."""
+        parts = []
+        for value, (_, desc) in zip(raw, self._pos):
+            if desc:
+                value = _Desc(value) if isinstance(value, str) else -value
+            parts.append(value)
+        return tuple(parts)
+
+    def key_func(self, values_of: Callable[[Dict[str, Any]], Sequence[Any]]) -> Callable:
+        pos = self._pos
+        if len(pos) == 1:
+            # Tri sur l'id seul (unique) : pas besoin de tuple
+            p, desc = pos[0]
+            return (lambda t: -values_of(t)[p]) if desc else (lambda t: values_of(t)[p])
+        return lambda t: self.key(self.raw(values_of(t)))
+
+    def sort(self, items: List[Dict[str, Any]], values_of: Callable) -> List[Dict[str, Any]]:
+        """
+        Tri complet par passes stables successives (du critère le moins
+        important au plus important). items est supposé trié par id croissant
+        (listes du store) : la passe de départage par id est alors inutile.
+        """
+        passes = self._pos
+        if len(passes) > 1 and passes[-1] == (_POS["id"], False):
+            passes = passes[:-1]
+        vals = [values_of(t) for t in items]
+        order = list(range(len(items)))
+        for pos, desc in reversed(passes):
+            order.sort(key=lambda i: vals[i][pos], reverse=desc)
+        return [items[i] for i in order]
+
+
+# ------------------------------------------------------------
+# Curseurs opaques
+# ------------------------------------------------------------
+def encode_cursor(spec: SortSpec, raw: Sequence[Any]) -> str:
+    payload = json.dumps({"s": spec.signature, "v": list(raw)}, separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(spec: SortSpec, cursor: str) -> List[Any]:
+    """Valeurs brutes encodées dans le curseur. ValueError si invalide ou pour un autre tri."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        raw = data["v"]
+        signature = data["s"]
+    except Exception:
+        raise ValueError("curseur illisible")
+    if signature != spec.signature or not isinstance(raw, list) or len(raw) != len(spec.fields):
+        raise ValueError("curseur d'un autre tri")
+    for value, (field, _) in zip(raw, spec.fields):
+        expected = str if field == "title" else int
+        if not isinstance(value, expected) or isinstance(value, bool):
+            raise ValueError("curseur invalide")
+    return raw
+
+
+# ------------------------------------------------------------
+# Sélection d'une page
+# ------------------------------------------------------------
+class Page(NamedTuple):
+    """Résultat de store.query()."""
+    items: List[Dict[str, Any]]
+    total: int
+    # Valeurs brutes de la clé de tri du dernier ticket, s'il reste une suite
+    next_after: Optional[List[Any]]
+
+
+def select_page(
+    items: List[Dict[str, Any]],
+    values_of: Callable[[Dict[str, Any]], Sequence[Any]],
+    spec: SortSpec,
+    offset: int,
+    limit: int,
+    after: Optional[Sequence[Any]] = None,
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Renvoie (page, reste-t-il des tickets après ?).
+    items (trié par id croissant) n'est pas modifié. after : valeurs brutes du curseur.
+    """
+    key = spec.key_func(values_of)
+    if after is not None:
+        bound = spec.key(after)
+        if len(spec.fields) == 1:
+            bound = bound[0]
+        items = [t for t in items if key(t) > bound]
+
+    wanted = offset + limit
+    if wanted < len(items) * _TOPK_RATIO and not spec.has_desc_text:
+        # +1 : savoir s'il reste quelque chose après la page sans tout trier
+        top = heapq.nsmallest(wanted + 1, items, key=key)
+        return top[offset:wanted], len(top) > wanted
+    ordered = spec.sort(items, values_of)
+    return ordered[offset:wanted], len(ordered) > wanted
+
+
+def page_by_id(
+    items: List[Dict[str, Any]],
+    desc: bool,
+    offset: int,
+    limit: int,
+    after: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Page d'une liste déjà triée par id croissant (le cache du store) :
+    bisect + tranche, sans copier ni trier la liste.
+    """
+    def id_of(t):
+        return int(t.get("id", -1))
+
+    if desc:
+        end = len(items) if after is None else bisect_left(items, after, key=id_of)
+        stop = max(end - offset, 0)
+        start = max(stop - limit, 0)
+        page = items[start:stop]
+        page.reverse()
+        return page, start > 0
+    begin = 0 if after is None else bisect_right(items, after, key=id_of)
+    start = begin + offset
+    page = items[start:start + limit]
+    return page, start + limit < len(items)
+
+
+def merge_pages(
+    parts: List[Tuple[List[Dict[str, Any]], bool]],
+    values_of: Callable[[Dict[str, Any]], Sequence[Any]],
+    spec: SortSpec,
+    offset: int,
+    limit: int,
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Page d'une réunion de listes disjointes (partition active + archive, voir
+    archive.py). Chaque partie est (ses offset + limit premiers tickets dans
+    l'ordre de spec, en reste-t-il après ?), obtenue avec le même curseur.
+    """
+    key = lambda t: spec.key(spec.raw(values_of(t)))  # noqa: E731
+    merged = list(heapq.merge(*(items for items, _ in parts), key=key))
+    wanted = offset + limit
+    return merged[offset:wanted], len(merged) > wanted or any(more for _, more in parts)
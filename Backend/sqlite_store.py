@@ -0,0 +1,551 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+try:
+    from .fulltext import tokenize, uses_index
+    from .indexes import normalize_tag
+    from .sorting import Page, SortSpec, sort_values, day_range
+    from .stats import UNKNOWN
+    from .serialization import dumps
+    from .changefeed import ChangeFeed, ticket_state
+    from .locking import FileLock
+    from .timing import stage, storage_op
+except ImportError:
+    from fulltext import tokenize, uses_index
+    from indexes import normalize_tag
+    from sorting import Page, SortSpec, sort_values, day_range
+    from stats import UNKNOWN
+    from serialization import dumps
+    from changefeed import ChangeFeed, ticket_state
+    from locking import FileLock
+    from timing import stage, storage_op
+
+""" Backend SQLite (TICKETS_BACKEND=sqlite), module standard sqlite3 en mode WAL.
+
+Même contrat que TicketStore (get/query/get_stats/create/update/delete), mais
+chaque mutation est une opération sur une ligne, et le filtrage, le tri et
+LIMIT/OFFSET de GET /tickets sont faits en SQL :
+- index sur status, priority et createdAt ;
+- table de jointure ticket_tags (tag normalisé indexé) ;
+- table FTS5 pour search (mêmes tokens sans accents que fulltext.py).
+
+Les connexions sont réutilisées via un petit pool. Au premier démarrage, la
+base est remplie depuis structure_ticket.json (migration en une fois) : schéma
+et import dans une même transaction, sous un verrou de fichier (plusieurs
+workers), et marqués faits par la ligne 'migrated_from' de meta. Une
+migration qui échoue ne laisse donc pas une base vide prise pour migrée.
+Elle peut aussi se lancer à la main :
+
+    python sqlite_store.py migrate [structure_ticket.json] [structure_ticket.db]
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    title       TEXT NOT NULL,
+    description TEXT NOT NULL,
+    priority    TEXT,
+    status      TEXT,
+    created_at  TEXT,
+    -- clés de tri précalculées (voir sorting.sort_values)
+    created_ord INTEGER NOT NULL,
+    priority_w  INTEGER NOT NULL,
+    status_w    INTEGER NOT NULL,
+    title_lc    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tickets_status ON tickets(status);
+CREATE INDEX IF NOT EXISTS idx_tickets_priority ON tickets(priority);
+CREATE INDEX IF NOT EXISTS idx_tickets_created ON tickets(created_ord);
+
+CREATE TABLE IF NOT EXISTS ticket_tags (
+    ticket_id INTEGER NOT NULL REFERENCES tickets(id) ON DELETE CASCADE,
+    position  INTEGER NOT NULL,
+    tag       TEXT NOT NULL,
+    tag_norm  TEXT NOT NULL,
+    PRIMARY KEY (ticket_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_ticket_tags_norm ON ticket_tags(tag_norm, ticket_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS tickets_fts
+    USING fts5(body, tokenize = "unicode61 remove_diacritics 2 tokenchars '_'");
+
+-- Version des données (ETag), incrémentée par chaque transaction d'écriture
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+INSERT OR IGNORE INTO meta (key, value) VALUES
+    ('instance', lower(hex(randomblob(4)))),
+    ('version', 0),
+    ('modified_at', CAST(strftime('%s', 'now') AS REAL));
+"""
+
+# Champ de tri de l'API -> colonne SQL
+SORT_COLUMNS = {
+    "id": "t.id",
+    "createdAt": "t.created_ord",
+    "priority": "t.priority_w",
+    "status": "t.status_w",
+    "title": "t.title_lc",
+}
+
+_TICKET_COLUMNS = "t.id, t.title, t.description, t.priority, t.status, t.created_at"
+
+TEXT_FIELDS = ("title", "description", "tags")
+
+
+def _fts_body(ticket: Dict[str, Any]) -> str:
+    """Texte indexé : tokens sans accents du titre, de la description et des tags."""
+    parts = [str(ticket.get("title", "")), str(ticket.get("description", ""))]
+    parts.extend(str(t) for t in ticket.get("tags") or [])
+    return " ".join(tokenize(" ".join(parts)))
+
+
+def _fts_query(needle: str) -> str:
+    """Chaque mot doit préfixer un token (même sémantique que SearchIndex)."""
+    return " AND ".join(f'"{w}"*' for w in tokenize(needle))
+
+
+def _py_lower(value: Optional[str]) -> Optional[str]:
+    # lower() de SQLite ne gère que l'ASCII : on garde celui de Python
+    return value.lower() if value is not None else None
+
+
+class SqliteTicketStore:
+    """Store adossé à une base SQLite (pool de connexions)."""
+
+    # Chaque lecture interroge la base (voir async_store.py)
+    in_memory = False
+
+    def __init__(self, path: str, migrate_from: Optional[str] = None):
+        self.path = path
+        self._idle: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
+        self._closed = False
+
+        # Flux des modifications faites par ce process (GET /tickets/changes)
+        self.changes = ChangeFeed()
+        self._publish_lock = threading.Lock()
+
+        with FileLock(path + ".lock"), self._conn() as conn:
+            # Schéma et migration : tout ou rien, un seul worker à la fois
+            conn.executescript("BEGIN IMMEDIATE;" + SCHEMA)
+            try:
+                if migrate_from and os.path.exists(migrate_from) and not self._migrated(conn):
+                    for t in _read_file(migrate_from):
+                        self._insert(conn, t, keep_id=True)
+                    conn.execute(
+                        "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from', ?)",
+                        (os.path.abspath(migrate_from),),
+                    )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    @staticmethod
+    def _migrated(conn: sqlite3.Connection) -> bool:
+        """Migration déjà faite : marqueur dans meta, ou base d'avant le marqueur déjà remplie."""
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_from'").fetchone():
+            return True
+        return conn.execute("SELECT 1 FROM tickets LIMIT 1").fetchone() is not None
+
+    # ---------------- Connexions ----------------
+    def _open(self) -> sqlite3.Connection:
+        # isolation_level=None : les transactions sont ouvertes explicitement
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.create_function("py_lower", 1, _py_lower, deterministic=True)
+        return conn
+
+    @contextmanager
+    def _conn(self) -> Iterator[sqlite3.Connection]:
+        """
+        Emprunte une connexion au pool le temps d'une opération. Les threads
+        du threadpool changent (un par boucle asyncio côté TestClient) : une
+        connexion par thread en laisserait fuir autant.
+        """
+        with self._pool_lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._open()
+        try:
+            yield conn
+        finally:
+            with self._pool_lock:
+                if self._closed:
+                    conn.close()
+                else:
+                    self._idle.append(conn)
+
+    def _write(self, fn):
+        """
+        Exécute fn(conn, changes) dans une transaction d'écriture, puis publie
+        les événements ajoutés à changes. COMMIT et publication se font sous
+        un même verrou : le flux suit l'ordre des commits.
+        """
+        changes: List[Tuple] = []
+        try:
+            with storage_op("save", "sqlite"), self._conn() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    result = fn(conn, changes)
+                    conn.execute(
+                        "UPDATE meta SET value = CASE key WHEN 'version' THEN value + 1 ELSE ? END"
+                        " WHERE key IN ('version', 'modified_at')",
+                        (time.time(),),
+                    )
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                with self._publish_lock:
+                    conn.execute("COMMIT")
+                    self.changes.publish(changes)
+                return result
+        except sqlite3.Error as e:
+            raise HTTPException(status_code=500, detail=f"Erreur SQLite: {e}")
+
+    def close(self) -> None:
+        with self._pool_lock:
+            self._closed = True
+            for conn in self._idle:
+                conn.close()
+            self._idle.clear()
+
+    # ---------------- Conversion ligne <-> ticket ----------------
+    @staticmethod
+    def _row_to_ticket(row: Tuple, tags: List[str]) -> Dict[str, Any]:
+        tid, title, description, priority, status, created_at = row[:6]
+        ticket = {
+            "id": tid,
+            "title": title,
+            "description": description,
+            "priority": priority,
+            "status": status,
+            "tags": tags,
+        }
+        if created_at is not None:
+            ticket["createdAt"] = created_at
+        return ticket
+
+    def _tickets_from_rows(self, conn: sqlite3.Connection, rows: List[Tuple]) -> List[Dict[str, Any]]:
+        ids = [row[0] for row in rows]
+        tags: Dict[int, List[str]] = {tid: [] for tid in ids}
+        # Paquets de 500 : limite du nombre de paramètres SQLite
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            for tid, tag in conn.execute(
+                f"SELECT ticket_id, tag FROM ticket_tags WHERE ticket_id IN ({marks}) ORDER BY ticket_id, position",
+                chunk,
+            ):
+                tags[tid].append(tag)
+        return [self._row_to_ticket(row, tags[row[0]]) for row in rows]
+
+    @staticmethod
+    def _columns(ticket: Dict[str, Any]) -> Tuple:
+        _, created_ord, priority_w, status_w, title_lc = sort_values(ticket)
+        return (
+            ticket.get("title", ""), ticket.get("description", ""), ticket.get("priority"),
+            ticket.get("status"), ticket.get("createdAt"), created_ord, priority_w, status_w, title_lc,
+        )
+
+    @staticmethod
+    def _write_tags(conn: sqlite3.Connection, tid: int, tags: List[Any]) -> None:
+        conn.execute("DELETE FROM ticket_tags WHERE ticket_id = ?", (tid,))
+        conn.executemany(
+            "INSERT INTO ticket_tags (ticket_id, position, tag, tag_norm) VALUES (?, ?, ?, ?)",
+            [(tid, i, str(tag), normalize_tag(tag)) for i, tag in enumerate(tags or [])],
+        )
+
+    @staticmethod
+    def _write_fts(conn: sqlite3.Connection, tid: int, ticket: Dict[str, Any]) -> None:
+        conn.execute("DELETE FROM tickets_fts WHERE rowid = ?", (tid,))
+        conn.execute("INSERT INTO tickets_fts (rowid, body) VALUES (?, ?)", (tid, _fts_body(ticket)))
+
+    # ---------------- Lecture ----------------
+    def version(self) -> Tuple[str, float]:
+        """(étiquette de version, date de dernière modification), partagées entre process."""
+        with self._conn() as conn:
+            meta = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        return f"{meta['instance']}-{meta['version']}", float(meta["modified_at"])
+
+    def tickets(self) -> List[Dict[str, Any]]:
+        """Tous les tickets, par id croissant."""
+        with self._conn() as conn:
+            rows = conn.execute(f"SELECT {_TICKET_COLUMNS} FROM tickets t ORDER BY t.id").fetchall()
+            return self._tickets_from_rows(conn, rows)
+
+    def get(self, ticket_id: int) -> Optional[Dict[str, Any]]:
+        with self._conn() as conn:
+            row = conn.execute(f"SELECT {_TICKET_COLUMNS} FROM tickets t WHERE t.id = ?", (ticket_id,)).fetchone()
+            if row is None:
+                return None
+            return self._tickets_from_rows(conn, [row])[0]
+
+    def iter_tickets(self, chunk_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Tous les tickets par id croissant, par paquets (export). Pagination
+        par id : aucune connexion n'est gardée entre deux paquets.
+        """
+        last_id = 0
+        while True:
+            with self._conn() as conn:
+                rows = conn.execute(
+                    f"SELECT {_TICKET_COLUMNS} FROM tickets t WHERE t.id > ? ORDER BY t.id LIMIT ?",
+                    (last_id, chunk_size),
+                ).fetchall()
+                chunk = self._tickets_from_rows(conn, rows)
+            if not chunk:
+                return
+            yield chunk
+            last_id = chunk[-1]["id"]
+
+    def encoded(self, ticket: Dict[str, Any]) -> bytes:
+        """Ticket encodé en JSON (pas de cache : la ligne est relue à chaque requête)."""
+        return dumps(ticket)
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        tag: Optional[str] = None,
+        search: Optional[str] = None,
+        search_mode: str = "prefix",
+        sort: Optional[SortSpec] = None,
+        offset: int = 0,
+        limit: int = 200,
+        after: Optional[List[Any]] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+    ) -> Page:
+        """Même contrat que TicketStore.query(), exécuté en SQL."""
+        sort = sort if sort is not None else SortSpec("id", "desc")
+        where: List[str] = []
+        params: List[Any] = []
+
+        if status is not None:
+            where.append("t.status = ?")
+            params.append(status)
+        if priority is not None:
+            where.append("t.priority = ?")
+            params.append(priority)
+        if tag is not None:
+            where.append("t.id IN (SELECT ticket_id FROM ticket_tags WHERE tag_norm = ?)")
+            params.append(normalize_tag(tag))
+        days = day_range(created_from, created_to)
+        if days is not None:
+            where.append("t.created_ord BETWEEN ? AND ?")
+            params.extend(days)
+
+        needle = search.strip().lower() if search is not None else ""
+        if needle and uses_index(needle, search_mode):
+            where.append("t.id IN (SELECT rowid FROM tickets_fts WHERE tickets_fts MATCH ?)")
+            params.append(_fts_query(needle))
+        elif needle:
+            # search_mode=exact : sous-chaîne, comme fulltext.contains_text
+            where.append(
+                "(instr(py_lower(t.title), ?) > 0 OR instr(py_lower(t.description), ?) > 0"
+                " OR EXISTS (SELECT 1 FROM ticket_tags g WHERE g.ticket_id = t.id AND instr(g.tag_norm, ?) > 0))"
+            )
+            params.extend([needle, needle, needle])
+
+        where_sql = " WHERE " + " AND ".join(where) if where else ""
+
+        # Curseur : (k1, k2, id) "après" la clé donnée, chaque champ dans son sens
+        page_where = list(where)
+        page_params = list(params)
+        columns = [(SORT_COLUMNS[f], desc) for f, desc in sort.fields]
+        if after is not None:
+            ors = []
+            for i, (col, desc) in enumerate(columns):
+                eqs = [f"{c} = ?" for c, _ in columns[:i]]
+                ors.append("(" + " AND ".join(eqs + [f"{col} {'<' if desc else '>'} ?"]) + ")")
+                page_params.extend(list(after[:i]) + [after[i]])
+            page_where.append("(" + " OR ".join(ors) + ")")
+
+        order_sql = ", ".join(f"{col} {'DESC' if desc else 'ASC'}" for col, desc in columns)
+        page_where_sql = " WHERE " + " AND ".join(page_where) if page_where else ""
+        sort_cols = ", ".join(col for col, _ in columns)
+        with stage("query"), self._conn() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM tickets t{where_sql}", params).fetchone()[0]
+            rows = conn.execute(
+                f"SELECT {_TICKET_COLUMNS}, {sort_cols} FROM tickets t{page_where_sql}"
+                f" ORDER BY {order_sql} LIMIT ? OFFSET ?",
+                page_params + [limit + 1, offset],
+            ).fetchall()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            items = self._tickets_from_rows(conn, rows)
+        next_after = list(rows[-1][6:]) if has_more and rows else None
+        return Page(items, total, next_after)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Compteurs calculés par GROUP BY sur les colonnes indexées."""
+        with self._conn() as conn:
+
+            def grouped(sql: str) -> Dict[str, int]:
+                counts: Dict[str, int] = {}
+                for key, n in conn.execute(sql):
+                    key = str(key) if key not in (None, "") else UNKNOWN
+                    counts[key] = counts.get(key, 0) + n
+                return counts
+
+            by_tag = grouped(
+                "SELECT tag_norm, COUNT(DISTINCT ticket_id) FROM ticket_tags WHERE tag_norm != '' GROUP BY tag_norm"
+            )
+            return {
+                "total": conn.execute("SELECT COUNT(*) FROM tickets").fetchone()[0],
+                "by_status": grouped("SELECT status, COUNT(*) FROM tickets GROUP BY status"),
+                "by_priority": grouped("SELECT priority, COUNT(*) FROM tickets GROUP BY priority"),
+                "by_tag": dict(sorted(by_tag.items(), key=lambda kv: -kv[1])),
+                "by_day": dict(sorted(grouped("SELECT created_at, COUNT(*) FROM tickets GROUP BY created_at").items())),
+            }
+
+    # ---------------- Écriture (une ligne par opération) ----------------
+    def _insert(self, conn: sqlite3.Connection, ticket: Dict[str, Any], keep_id: bool = False) -> int:
+        if keep_id:
+            conn.execute(
+                "INSERT INTO tickets (id, title, description, priority, status, created_at,"
+                " created_ord, priority_w, status_w, title_lc) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (int(ticket["id"]),) + self._columns(ticket),
+            )
+            tid = int(ticket["id"])
+        else:
+            cur = conn.execute(
+                "INSERT INTO tickets (title, description, priority, status, created_at,"
+                " created_ord, priority_w, status_w, title_lc) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._columns(ticket),
+            )
+            tid = cur.lastrowid
+        self._write_tags(conn, tid, ticket.get("tags") or [])
+        self._write_fts(conn, tid, ticket)
+        return tid
+
+    def create(self, ticket: Dict[str, Any]) -> Dict[str, Any]:
+        """Insère le ticket ; l'ID vient de AUTOINCREMENT (jamais réutilisé)."""
+        def apply(conn, changes):
+            ticket["id"] = self._insert(conn, ticket)
+            changes.append(("create", {"id": ticket["id"], "ticket": ticket}, (ticket_state(ticket),)))
+            return ticket
+        return self._write(apply)
+
+    def create_many(self, tickets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Import en masse, en une seule transaction."""
+        def apply(conn, changes):
+            for t in tickets:
+                t["id"] = self._insert(conn, t)
+                changes.append(("create", {"id": t["id"], "ticket": t}, (ticket_state(t),)))
+            return tickets
+        if not tickets:
+            return []
+        return self._write(apply)
+
+    def _update_row(self, conn: sqlite3.Connection, changes: List[Tuple], ticket_id: int,
+                    data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        row = conn.execute(f"SELECT {_TICKET_COLUMNS} FROM tickets t WHERE t.id = ?", (ticket_id,)).fetchone()
+        if row is None:
+            return None
+        ticket = self._tickets_from_rows(conn, [row])[0]
+        before = ticket_state(ticket)
+        ticket.update(data)
+        conn.execute(
+            "UPDATE tickets SET title = ?, description = ?, priority = ?, status = ?, created_at = ?,"
+            " created_ord = ?, priority_w = ?, status_w = ?, title_lc = ? WHERE id = ?",
+            self._columns(ticket) + (ticket_id,),
+        )
+        if "tags" in data:
+            self._write_tags(conn, ticket_id, ticket.get("tags") or [])
+        if not data.keys().isdisjoint(TEXT_FIELDS):
+            self._write_fts(conn, ticket_id, ticket)
+        changes.append(("patch", {"id": ticket_id, "data": data, "ticket": ticket}, (before, ticket_state(ticket))))
+        return ticket
+
+    def _delete_row(self, conn: sqlite3.Connection, changes: List[Tuple], ticket_id: int) -> bool:
+        row = conn.execute(f"SELECT {_TICKET_COLUMNS} FROM tickets t WHERE t.id = ?", (ticket_id,)).fetchone()
+        if row is None:
+            return False
+        before = ticket_state(self._tickets_from_rows(conn, [row])[0])
+        # ticket_tags suit via ON DELETE CASCADE
+        conn.execute("DELETE FROM tickets WHERE id = ?", (ticket_id,))
+        conn.execute("DELETE FROM tickets_fts WHERE rowid = ?", (ticket_id,))
+        changes.append(("delete", {"id": ticket_id}, (before,)))
+        return True
+
+    def update(self, ticket_id: int, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return self._write(lambda conn, changes: self._update_row(conn, changes, ticket_id, data))
+
+    def update_many(self, changes: List[Tuple[int, Dict[str, Any]]]) -> List[Optional[Dict[str, Any]]]:
+        """Modifications en lot, en une seule transaction. None si introuvable."""
+        def apply(conn, events):
+            return [self._update_row(conn, events, tid, data) for tid, data in changes]
+        if not changes:
+            return []
+        return self._write(apply)
+
+    def delete(self, ticket_id: int) -> bool:
+        return self._write(lambda conn, changes: self._delete_row(conn, changes, ticket_id))
+
+    def delete_many(self, ids: List[int]) -> List[bool]:
+        """Suppressions en lot, en une seule transaction. False si introuvable."""
+        def apply(conn, changes):
+            return [self._delete_row(conn, changes, tid) for tid in ids]
+        if not ids:
+            return []
+        return self._write(apply)
+
+    def import_tickets(self, tickets: List[Dict[str, Any]]) -> int:
+        """Insère des tickets en gardant leurs IDs (migration), en une transaction."""
+        def apply(conn, changes):
+            for t in tickets:
+                self._insert(conn, t, keep_id=True)
+            return len(tickets)
+        return self._write(apply)
+
+    def invalidate(self) -> None:
+        """Rien à faire : chaque lecture interroge la base."""
+
+
+def _read_file(path: str) -> List[Dict[str, Any]]:
+    # Import tardif : storage.py instancie le store (et donc ce module) à l'import
+    try:
+        from .storage import _read_file as read
+    except ImportError:
+        from storage import _read_file as read
+    return read(path)
+
+
+# ------------------------------------------------------------
+# Migration en une fois depuis le fichier JSON
+# ------------------------------------------------------------
+def migrate(json_path: str, db_path: str) -> int:
+    """Crée db_path à partir de json_path. Refuse d'écraser une base existante."""
+    if os.path.exists(db_path):
+        raise SystemExit(f"{db_path} existe déjà : migration annulée.")
+    if not os.path.exists(json_path):
+        raise SystemExit(f"{json_path} introuvable : migration annulée.")
+    store = SqliteTicketStore(db_path, migrate_from=json_path)
+    try:
+        return store.get_stats()["total"]
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "migrate":
+        raise SystemExit("Usage : python sqlite_store.py migrate [fichier.json] [base.db]")
+    try:
+        from .storage import DATA_FILE, SQLITE_FILE
+    except ImportError:
+        from storage import DATA_FILE, SQLITE_FILE
+    src = sys.argv[2] if len(sys.argv) > 2 else DATA_FILE
+    dst = sys.argv[3] if len(sys.argv) > 3 else SQLITE_FILE
+    n = migrate(src, dst)
+    print(json.dumps({"migrated": n, "from": src, "to": dst}, ensure_ascii=False))
@@ -0,0 +1,132 @@
+from collections import Counter
+from typing import Any, Dict, Iterable, Tuple
+
+try:
+    from .indexes import ticket_tags
+except ImportError:
+    from indexes import ticket_tags
+
+""" Statistiques agrégées des tickets (GET /tickets/stats, option 5 du CLI).
+
+Les compteurs par statut, priorité, tag et jour de création sont tenus à
+jour incrémentalement (add/remove à chaque mutation) : ils ne sont jamais
+recalculés depuis zéro, sauf au chargement.
+"""
+
+UNKNOWN = "inconnu"
+
+
+def label(value: Any) -> str:
+    """Clé de comptage d'une valeur de champ (vide ou absente : "inconnu")."""
+    return str(value) if value not in (None, "") else UNKNOWN
+
+
+def _key(ticket: Dict[str, Any], field: str) -> str:
+    return label(ticket.get(field))
+
+
+class TicketStats:
+    """Compteurs par statut, priorité, tag normalisé et jour (createdAt)."""
+
+    def __init__(self):
+        self.total = 0
+        self.by_status: Counter = Counter()
+        self.by_priority: Counter = Counter()
+        self.by_tag: Counter = Counter()
+        self.by_day: Counter = Counter()
+
+    @classmethod
+    def from_tickets(cls, tickets: Iterable[Dict[str, Any]]) -> "TicketStats":
+        stats = cls()
+        for t in tickets:
+            stats.add(t)
+        return stats
+
+    @classmethod
+    def from_counts(
+        cls,
+        total: int,
+        by_status: Iterable[Tuple[Any, int]],
+        by_priority: Iterable[Tuple[Any, int]],
+        by_tag: Iterable[Tuple[str, int]],
+        by_day: Iterable[Tuple[Any, int]],
+    ) -> "TicketStats":
+        """
+        Compteurs déjà agrégés (moteur colonnes, voir columnar.py) : paires
+        (valeur brute, nombre) dans l'ordre de première apparition, comme
+        from_tickets. Tags déjà normalisés.
+        """
+        stats = cls()
+        stats.total = total
+        for counter, pairs, key in (
+            (stats.by_status, by_status, label),
+            (stats.by_priority, by_priority, label),
+            (stats.by_tag, by_tag, str),
+            (stats.by_day, by_day, label),
+        ):
+            for value, n in pairs:
+                if n > 0:
+                    counter[key(value)] += n
+        return stats
+
+    def state(self) -> Tuple:
+        """Compteurs en types de base (sérialisables par marshal), ordre conservé."""
+        return self.total, dict(self.by_status), dict(self.by_priority), dict(self.by_tag), dict(self.by_day)
+
+    @classmethod
+    def from_state(cls, state: Tuple) -> "TicketStats":
+        stats = cls()
+        stats.total = state[0]
+        for counter, values in zip((stats.by_status, stats.by_priority, stats.by_tag, stats.by_day), state[1:]):
+            counter.update(values)
+        return stats
+
+    @classmethod
+    def combined(cls, *parts: "TicketStats") -> "TicketStats":
+        """Compteurs de plusieurs ensembles disjoints de tickets (store actif + archive)."""
+        stats = cls()
+        for part in parts:
+            stats.total += part.total
+            for counter, other in (
+                (stats.by_status, part.by_status),
+                (stats.by_priority, part.by_priority),
+                (stats.by_tag, part.by_tag),
+                (stats.by_day, part.by_day),
+            ):
+                counter.update(other)
+        return stats
+
+    def _apply(self, ticket: Dict[str, Any], delta: int) -> None:
+        self.total += delta
+        for counter, key in (
+            (self.by_status, _key(ticket, "status")),
+            (self.by_priority, _key(ticket, "priority")),
+            (self.by_day, _key(ticket, "createdAt")),
+        ):
+            self._bump(counter, key, delta)
+        for tag in ticket_tags(ticket):
+            self._bump(self.by_tag, tag, delta)
+
+    @staticmethod
+    def _bump(counter: Counter, key: str, delta: int) -> None:
+        n = counter[key] + delta
+        if n > 0:
+            counter[key] = n
+        else:
+            del counter[key]
+
+    def add(self, ticket: Dict[str, Any]) -> None:
+        self._apply(ticket, 1)
+
+    def remove(self, ticket: Dict[str, Any]) -> None:
+        """À appeler AVANT de modifier le ticket (on retire ses anciennes valeurs)."""
+        self._apply(ticket, -1)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "by_status": dict(self.by_status),
+            "by_priority": dict(self.by_priority),
+            "by_tag": dict(self.by_tag.most_common()),
+            "by_day": dict(sorted(self.by_day.items())),
+        }
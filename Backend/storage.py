@@ -1,45 +1,1238 @@
-import json
+import gc
+import heapq
+import mmap
 import os
-from typing import List, Dict, Any
+import queue
+import threading
+import time
+import uuid
+import warnings
+from bisect import bisect_left
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Tuple, Callable, Iterator
 from fastapi import HTTPException
 
+try:
+    from .locking import FileLock
+    from .indexes import TicketIndex
+    from .fulltext import SearchIndex, contains_text, uses_index
+    from .sorting import Page, SortSpec, STATUS_WEIGHT, sort_values, select_page, page_by_id, merge_pages, day_range
+    from .stats import TicketStats
+    from .serialization import dumps, dumps_file, loads, iter_array
+    from .changefeed import ChangeFeed, ticket_state
+    from .timing import stage, storage_op, observe_bytes_written
+    from .compact import COMPACT_TICKETS, TicketRecord
+    from .snapshot import encode_snapshot, read_snapshot, write_snapshot
+    from . import columnar
+except ImportError:
+    from locking import FileLock
+    from indexes import TicketIndex
+    from fulltext import SearchIndex, contains_text, uses_index
+    from sorting import Page, SortSpec, STATUS_WEIGHT, sort_values, select_page, page_by_id, merge_pages, day_range
+    from stats import TicketStats
+    from serialization import dumps, dumps_file, loads, iter_array
+    from changefeed import ChangeFeed, ticket_state
+    from timing import stage, storage_op, observe_bytes_written
+    from compact import COMPACT_TICKETS, TicketRecord
+    from snapshot import encode_snapshot, read_snapshot, write_snapshot
+    import columnar
+
 # On définit le nom du fichier ici
-""" Ce fichier gère exclusivement les interactions avec le disque ("Base de données" JSON). 
+""" Ce fichier gère exclusivement les interactions avec le disque ("Base de données" JSON).
 Il contient tes fonctions utilitaires."""
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DATA_FILE = os.path.join(BASE_DIR, "structure_ticket.json")
+# Surchargeable (benchmarks, déploiement) via la variable d'environnement
+DATA_FILE = os.environ.get("TICKETS_DATA_FILE", os.path.join(BASE_DIR, "structure_ticket.json"))
 
-def load_tickets() -> List[Dict[str, Any]]:
-    """Charge les tickets depuis le fichier JSON."""
-    if not os.path.exists(DATA_FILE):
-        return []
 
+# Au-delà de cette taille, le fichier est décodé en flux (mémoire bornée par
+# ticket) plutôt que lu d'un bloc : plus lent, mais le pic mémoire ne compte
+# plus le contenu du fichier (octets + texte décodé) en plus des tickets.
+STREAM_LOAD_BYTES = int(os.environ.get("TICKETS_STREAM_LOAD_BYTES", 64 * 1024 * 1024))
+# 1 : lecture en flux via mmap (pages du cache disque, pas de tampon de lecture)
+USE_MMAP = os.environ.get("TICKETS_MMAP", "0").lower() in ("1", "true", "yes")
+
+
+def iter_file(path: str, use_mmap: bool = USE_MMAP) -> Iterator[Any]:
+    """
+    Tickets d'un fichier de données, un par un (générateur) : le fichier
+    n'est jamais chargé en entier. Base des traitements en flux (filtre,
+    export) sur des fichiers plus gros que la mémoire.
+    """
     try:
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with open(path, "rb") as f:
+            if use_mmap and os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                    if hasattr(m, "madvise"):
+                        m.madvise(mmap.MADV_SEQUENTIAL)
+                    yield from iter_array(m)
+            else:
+                yield from iter_array(f)
+    except TypeError:
+        raise HTTPException(status_code=500, detail="Structure JSON invalide.")
+    except ValueError:  # JSONDecodeError ou UTF-8 invalide
+        raise HTTPException(status_code=500, detail="Fichier JSON corrompu.")
+    except OSError as e:
+        raise HTTPException(status_code=500, detail=f"Erreur système de fichier: {e}")
 
-        if not isinstance(data, list):
-            raise HTTPException(status_code=500, detail="Structure JSON invalide.")
-        return data
 
-    except json.JSONDecodeError:
+def _read_file(path: str, item_hook: Optional[Callable] = None) -> List[Dict[str, Any]]:
+    """
+    Lit et valide le tableau JSON des tickets.
+    item_hook : conversion de chaque ticket pendant la lecture (décodage en
+    flux : le dict intermédiaire est libéré aussitôt).
+    """
+    try:
+        if item_hook is None and os.path.getsize(path) <= STREAM_LOAD_BYTES:
+            # Petit fichier : un seul appel à orjson, le plus rapide
+            with open(path, "rb") as f:
+                data = loads(f.read())
+            if not isinstance(data, list):
+                raise HTTPException(status_code=500, detail="Structure JSON invalide.")
+            return data
+    except ValueError:  # JSONDecodeError (json, orjson, ujson) ou UTF-8 invalide
         raise HTTPException(status_code=500, detail="Fichier JSON corrompu.")
     except OSError as e:
         raise HTTPException(status_code=500, detail=f"Erreur système de fichier: {e}")
+    if item_hook is None:
+        return list(iter_file(path))
+    return [item_hook(t) if type(t) is dict else t for t in iter_file(path)]
 
 
-def save_tickets(tickets: List[Dict[str, Any]]) -> None:
-    """Sauvegarde la liste sur le disque."""
+def _fsync_dir(path: str) -> None:
+    """fsync du dossier parent (rend un rename durable). Sans effet sous Windows."""
+    if os.name != "posix":
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
     try:
-        with open(DATA_FILE, "w", encoding="utf-8") as f:
-            json.dump(tickets, f, ensure_ascii=False, indent=2)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_file(path: str, tickets: List[Dict[str, Any]]) -> int:
+    """
+    Écrit la liste complète des tickets sur le disque, de façon atomique :
+    fichier temporaire + fsync + os.replace. Un lecteur voit soit l'ancien
+    fichier, soit le nouveau, jamais un fichier à moitié écrit.
+    Compact par défaut, indenté si TICKETS_JSON_INDENT (voir serialization.py).
+    Renvoie le nombre d'octets écrits.
+    """
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        data = dumps_file(tickets)
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        _fsync_dir(path)
+        return len(data)
     except OSError as e:
+        if os.path.exists(tmp):
+            os.remove(tmp)
         raise HTTPException(status_code=500, detail=f"Échec de l'écriture disque: {e}")
 
 
+def load_tickets() -> List[Dict[str, Any]]:
+    """Charge les tickets depuis le fichier JSON (en flux au-delà de STREAM_LOAD_BYTES)."""
+    if not os.path.exists(DATA_FILE):
+        return []
+    return _read_file(DATA_FILE)
+
+
+def save_tickets(tickets: List[Dict[str, Any]]) -> None:
+    """Sauvegarde la liste sur le disque."""
+    _write_file(DATA_FILE, tickets)
+
+
+@contextmanager
+def _gc_paused(freeze: bool = False):
+    """
+    Chargement complet du store : des centaines de milliers de conteneurs
+    créés d'un coup, que le ramasse-miettes parcourrait sans rien libérer.
+    Il est suspendu pendant le chargement.
+    freeze=True (démarrage du serveur, voir warm_up) : gc.freeze() sort
+    ensuite ces objets, qui vivent autant que le process, de tous ses
+    passages suivants. Réservé au store unique du process : un objet figé
+    dans un cycle ne serait plus jamais libéré.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            if freeze:
+                gc.freeze()
+            gc.enable()
+
+
+def _snapshot(ticket: Dict[str, Any]) -> Dict[str, Any]:
+    """Copie d'un ticket (listes comprises) : l'événement ne bouge plus après coup."""
+    return {k: list(v) if isinstance(v, list) else v for k, v in ticket.items()}
+
+
 def next_id(tickets: List[Dict[str, Any]]) -> int:
-    """Calcule le prochain ID disponible."""
+    """Calcule le prochain ID disponible (parcours complet : le store utilise IdCounter)."""
     if not tickets:
         return 1
-    return max(int(t.get("id", 0)) for t in tickets) + 1
\ No newline at end of file
+    return max(int(t.get("id", 0)) for t in tickets) + 1
+
+
+def _ticket_id(ticket: Dict[str, Any]) -> int:
+    return int(ticket.get("id", -1))
+
+
+def _as_dict(ticket: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Ticket du cache tel que renvoyé par le store (dict, même en mode compact)."""
+    return ticket.to_dict() if isinstance(ticket, TicketRecord) else ticket
+
+
+class IdCounter:
+    """
+    Prochain ID à attribuer, gardé dans un petit fichier à côté des données
+    (<fichier>.seq). Sans lui, supprimer le ticket le plus récent puis
+    redémarrer redonnerait son ID au prochain ticket créé.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> int:
+        """Valeur enregistrée (0 si absente ou illisible : on repart du plus grand ID)."""
+        try:
+            with open(self.path, "rb") as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def save(self, value: int) -> None:
+        """Écriture atomique et durable (même principe que _write_file)."""
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(str(value).encode("ascii"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            _fsync_dir(self.path)
+        except OSError as e:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise HTTPException(status_code=500, detail=f"Échec de l'écriture disque: {e}")
+
+
+# ------------------------------------------------------------
+# Backends de persistance
+# ------------------------------------------------------------
+# Configuration par variables d'environnement :
+#   TICKETS_BACKEND            json (défaut) | wal | sqlite ; plusieurs workers : wal (ou sqlite),
+#                              json relit tout le fichier après chaque écriture d'un autre worker
+#   TICKETS_WAL_COMPACT_BYTES  taille du journal déclenchant une compaction
+#   TICKETS_SQLITE_FILE        base SQLite (défaut : structure_ticket.db)
+#   TICKETS_COMPACT            1 : tickets en cache compacts (voir compact.py)
+#   TICKETS_QUERY_ENGINE       python (défaut) | numpy (colonnes NumPy, voir columnar.py)
+#   TICKETS_STREAM_LOAD_BYTES  taille de fichier au-delà de laquelle il est décodé en flux
+#   TICKETS_MMAP               1 : décodage en flux via mmap
+#   TICKETS_SNAPSHOT           0 : pas de snapshot binaire des index (<fichier>.snap, voir snapshot.py)
+#   TICKETS_ARCHIVE_DAYS       n > 0 : tickets Closed créés il y a plus de n jours archivés
+#                              hors du store actif (<fichier>.archive/, voir archive.py)
+STORAGE_BACKEND = os.environ.get("TICKETS_BACKEND", "json")
+WAL_COMPACT_BYTES = int(os.environ.get("TICKETS_WAL_COMPACT_BYTES", 8 * 1024 * 1024))
+SQLITE_FILE = os.environ.get("TICKETS_SQLITE_FILE", os.path.splitext(DATA_FILE)[0] + ".db")
+USE_SNAPSHOT = os.environ.get("TICKETS_SNAPSHOT", "1").lower() not in ("0", "false", "no")
+ARCHIVE_DAYS = int(os.environ.get("TICKETS_ARCHIVE_DAYS", 0))
+
+
+def _file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    """Signature d'un fichier : (mtime en ns, taille). None si absent."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        raise HTTPException(status_code=500, detail=f"Erreur système de fichier: {e}")
+    return (st.st_mtime_ns, st.st_size)
+
+
+class JsonFileBackend:
+    """
+    Backend historique : un seul fichier JSON, réécrit en entier
+    à chaque mutation (les opérations sont ignorées).
+    """
+
+    name = "json"
+    # Pas de journal des opérations : une modification externe impose de tout relire
+    incremental = False
+
+    def __init__(self, path: str = DATA_FILE):
+        self.path = path
+        self.lock = FileLock(path + ".lock")
+        self.counter = IdCounter(path + ".seq")
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._warned = False
+
+    def has_changed(self) -> bool:
+        """Le fichier a-t-il été modifié depuis notre dernière lecture/écriture ?"""
+        return _file_stamp(self.path) != self._stamp
+
+    def load(self, item_hook: Optional[Callable] = None) -> List[Dict[str, Any]]:
+        stamp = _file_stamp(self.path)
+        if self._stamp is not None and stamp != self._stamp and not self._warned:
+            # Écrit par un autre process : avec plusieurs workers, chaque écriture d'un autre fait tout relire
+            self._warned = True
+            warnings.warn(
+                f"{self.path} modifié par un autre process : rechargement complet. "
+                "Avec plusieurs workers (uvicorn --workers), utiliser TICKETS_BACKEND=wal.",
+                RuntimeWarning,
+                stacklevel=2,
+            )
+        self._stamp = stamp
+        return _read_file(self.path, item_hook) if self._stamp is not None else []
+
+    def commit(self, tickets: List[Dict[str, Any]], ops: List[Dict[str, Any]]) -> int:
+        written = _write_file(self.path, tickets)
+        self._stamp = _file_stamp(self.path)
+        return written
+
+    # ---------------- Snapshot du store (voir snapshot.py) ----------------
+    def source(self) -> Tuple:
+        """État du disque que reflète le cache du store (enregistré avec le snapshot)."""
+        return (self.name, self._stamp)
+
+    def resume(self, source: Tuple) -> Optional[List[Dict[str, Any]]]:
+        """
+        Reprend à l'état source sans relire le fichier : opérations écrites
+        depuis (aucune ici), ou None si le fichier a changé.
+        """
+        if tuple(source) != (self.name, _file_stamp(self.path)):
+            return None
+        self._stamp = source[1]
+        return []
+
+    def close(self) -> None:
+        pass
+
+
+def make_backend(kind: str = STORAGE_BACKEND, path: str = DATA_FILE):
+    """Instancie le backend demandé ("json" ou "wal")."""
+    if kind == "json":
+        return JsonFileBackend(path)
+    if kind == "wal":
+        try:
+            from .wal import WalBackend
+        except ImportError:
+            from wal import WalBackend
+        return WalBackend(path, compact_bytes=WAL_COMPACT_BYTES)
+    if kind == "sqlite":
+        raise ValueError("sqlite n'est pas un backend de TicketStore : utiliser make_store().")
+    raise ValueError(f"Backend de stockage inconnu: {kind}")
+
+
+# ------------------------------------------------------------
+# Store en mémoire
+# ------------------------------------------------------------
+class TicketStore:
+    """
+    Garde les tickets parsés en mémoire pour tout le process.
+
+    Les lectures sont servies depuis le cache ; il n'est rechargé que si
+    le backend signale une modification faite hors du process (script.py,
+    autre worker, édition à la main...). Avec le backend wal, les écritures
+    d'un autre worker sont rejouées depuis le journal au lieu de tout relire.
+
+    Les mutations (create/update/delete) ne touchent jamais directement au
+    cache : elles sont mises dans une file et appliquées par un unique thread
+    écrivain. Celui-ci regroupe toutes les mutations en attente, les applique
+    dans l'ordre et les persiste en une seule écriture (group commit), sous
+    le verrou de fichier partagé entre process.
+
+    Les index (id -> ticket, index inversés de indexes.py, index plein texte
+    de fulltext.py, clés de tri de sorting.py, compteurs de stats.py) sont
+    reconstruits à chaque chargement et mis à jour incrémentalement par le
+    thread écrivain.
+    Le cache est gardé trié par id croissant.
+
+    compact=True (TICKETS_COMPACT=1) : les tickets en cache sont des
+    TicketRecord (compact.py) au lieu de dicts ; get() et les mutations
+    renvoient toujours des dicts.
+
+    engine="numpy" (TICKETS_QUERY_ENGINE) : filtres, tri et pagination de
+    query() passent par les colonnes de columnar.py, tenues à jour comme
+    les autres index. Sans NumPy, on reste sur le chemin Python.
+
+    snapshot=True (TICKETS_SNAPSHOT) : le premier chargement relit les
+    tickets et les index depuis <fichier>.snap (snapshot.py) s'il correspond
+    encore aux données du disque, au lieu de décoder le JSON et de tout
+    réindexer. save_snapshot() le réécrit (warm_up, arrêt du serveur).
+
+    archive_days > 0 (TICKETS_ARCHIVE_DAYS) : les tickets Closed plus
+    anciens sont déplacés dans une archive (archive.py), lue seulement par
+    les requêtes qui la visent : status=Closed, intervalle de dates, ID.
+    """
+
+    MAX_BATCH = 1000
+    # Lectures servies depuis la mémoire (voir async_store.py), sauf celles
+    # qui passent par l'archive (archive_hit)
+    in_memory = True
+    # Nombre max de tickets gardés pré-encodés (JSON) pour les réponses
+    MAX_ENCODED = 100_000
+
+    def __init__(
+        self,
+        backend=None,
+        compact: bool = COMPACT_TICKETS,
+        engine: str = columnar.QUERY_ENGINE,
+        snapshot: bool = USE_SNAPSHOT,
+        archive_days: int = ARCHIVE_DAYS,
+    ):
+        self.backend = backend if backend is not None else make_backend()
+        self.compact = compact
+        self.engine = "numpy" if engine == "numpy" and columnar.available() else "python"
+        self._tickets: List[Dict[str, Any]] = []
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+        # Prochain ID (jamais réutilisé) et dernière valeur écrite dans backend.counter
+        self._next_id = 1
+        self._saved_next_id = 0
+        self.index = TicketIndex()
+        self.search_index = SearchIndex()
+        self._sort_values: Dict[int, Tuple] = {}
+        self.columns: Optional[columnar.ColumnarIndex] = None
+        # Ticket d'ID ancien ajouté (sorti de l'archive) : colonnes à reconstruire en fin de lot
+        self._columns_stale = False
+        self.stats = TicketStats()
+        self._loaded = False
+        self._lock = threading.RLock()
+        # Thread qui applique un lot (cache et index modifiés, pas encore sur le disque)
+        self._writing: Optional[int] = None
+
+        # Snapshot binaire des index, et version des données qu'il contient
+        path = getattr(self.backend, "path", None)
+        self.snapshot_path = path + ".snap" if snapshot and path and hasattr(self.backend, "resume") else None
+        self._snapshot_version = 0
+
+        # Archive des tickets fermés (partition froide, voir archive.py)
+        self.archive = None
+        self._combined_stats: Optional[Tuple[Tuple, Dict[str, Any]]] = None
+        if archive_days > 0 and path:
+            try:
+                from .archive import TicketArchive
+            except ImportError:
+                from archive import TicketArchive
+            self.archive = TicketArchive(
+                path + ".archive", archive_days, self.backend.lock, self.backend.counter,
+                lambda ticket_id: ticket_id in self._by_id, self.compact, self.engine,
+            )
+
+        # Version des données : +1 à chaque lot de mutations ou rechargement.
+        # _instance distingue deux stores (ou deux démarrages) de même version.
+        self._instance = uuid.uuid4().hex[:8]
+        self._version = 0
+        self._modified_at = time.time()
+
+        # Flux des modifications (GET /tickets/changes), publié après chaque commit
+        self.changes = ChangeFeed()
+        # Événements du lot ou du rejeu en cours : remplacée et remplie seulement sous self._lock
+        self._pending_changes: List[Tuple[str, Dict[str, Any], Tuple]] = []
+
+        # id -> ticket encodé ; _generation change à chaque invalidation
+        self._encoded: Dict[int, bytes] = {}
+        self._encoded_lock = threading.Lock()
+        self._generation = 0
+
+        self._queue: "queue.Queue[Optional[Tuple[Callable, Future]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_start = threading.Lock()
+
+    # ---------------- Lecture ----------------
+    def _ensure_fresh(self) -> None:
+        writing = self._writing
+        if writing is not None and writing != threading.get_ident():
+            # Lot en cours : ses modifications ne se lisent qu'une fois écrites
+            # sur le disque (ou annulées), on attend la fin du lot
+            with self._lock:
+                pass
+        if self._loaded and not self.backend.has_changed():
+            return
+        with self._lock, self.backend.lock:
+            if self._loaded and self.backend.incremental and self.backend.has_changed():
+                # Autre worker (backend wal) : seulement ses opérations, sans tout relire
+                with storage_op("load_changes", self.backend.name):
+                    ops = self.backend.load_changes()
+                if ops is not None:
+                    self._replay(ops)
+                    return
+            if not self._loaded or self.backend.has_changed():
+                with _gc_paused():
+                    # Premier chargement : snapshot des index s'il est encore valable
+                    resumed = None if self._loaded else self._load_snapshot()
+                    if resumed is not None:
+                        tickets, ops = resumed
+                    else:
+                        ops = []
+                        with storage_op("load", self.backend.name):
+                            # Mode compact : tickets convertis pendant la lecture (pas de pic dicts + records)
+                            tickets = self.backend.load(TicketRecord) if self.compact else self.backend.load()
+                        if self.compact:
+                            # Restent en dicts : tickets rejoués depuis le journal (wal)
+                            for i, t in enumerate(tickets):
+                                if not isinstance(t, TicketRecord):
+                                    tickets[i] = TicketRecord(t)
+                        with stage("index"):
+                            tickets.sort(key=_ticket_id)
+                            self._build_indexes(tickets)
+                self._tickets = tickets
+                self._saved_next_id = self.backend.counter.load()
+                self._next_id = max(self._saved_next_id, _ticket_id(tickets[-1]) + 1 if tickets else 1)
+                self._forget_encoded(None)
+                if self._version:
+                    # Modifié hors du process : pas de delta connu, les abonnés relisent
+                    self.changes.publish_reset()
+                self._bump_version()
+                self._loaded = True
+                if resumed is not None:
+                    # Snapshot à jour, sauf écritures journalisées depuis (wal)
+                    self._snapshot_version = self._version
+                    self._replay(ops)
+
+    def _build_indexes(self, tickets: List[Dict[str, Any]]) -> None:
+        """
+        Tous les index en un seul passage sur les tickets chargés (au lieu
+        d'un parcours par index) ; les colonnes NumPy ensuite, d'un bloc.
+        """
+        by_id: Dict[int, Dict[str, Any]] = {}
+        values: Dict[int, Tuple] = {}
+        index = TicketIndex()
+        search_index = SearchIndex()
+        # Moteur numpy : stats par np.bincount sur les colonnes
+        stats = TicketStats() if self.engine != "numpy" else None
+        for t in tickets:
+            tid = _ticket_id(t)
+            by_id[tid] = t
+            values[tid] = sort_values(t)
+            index.add(t)
+            search_index.add(t, keep_sorted=False)
+            if stats is not None:
+                stats.add(t)
+        search_index.sort_vocabulary()
+        self._by_id, self._sort_values, self.index, self.search_index = by_id, values, index, search_index
+        self._build_columns(tickets, stats)
+
+    def _build_columns(self, tickets: List[Dict[str, Any]], stats: Optional[TicketStats]) -> None:
+        """Colonnes NumPy (moteur numpy) ; stats par np.bincount, sinon celles fournies."""
+        # IDs en double (fichier édité à la main) : une ligne par id impossible, chemin Python
+        self.columns = None
+        if self.engine == "numpy" and len(self._by_id) == len(tickets):
+            values = self._sort_values
+            self.columns = columnar.ColumnarIndex.from_tickets(tickets, lambda t: values[_ticket_id(t)])
+        if self.columns is not None:
+            stats = self.columns.stats()
+        elif stats is None:
+            stats = TicketStats.from_tickets(tickets)
+        self.stats = stats
+
+    # ---------------- Snapshot binaire (voir snapshot.py) ----------------
+    def _load_snapshot(self) -> Optional[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+        """
+        Tickets et index relus depuis le snapshot (verrous tenus) ->
+        (tickets, opérations écrites depuis). None : snapshot absent ou
+        périmé, chargement normal.
+        """
+        if self.snapshot_path is None:
+            return None
+        with storage_op("snapshot", self.backend.name):
+            loaded = read_snapshot(self.snapshot_path)
+        if loaded is None:
+            return None
+        source, state = loaded
+        ops = self.backend.resume(source)
+        if ops is None:
+            return None
+        with stage("index"):
+            tickets = state["tickets"]
+            if self.compact:
+                tickets = [TicketRecord(t) for t in tickets]
+            self._by_id = {_ticket_id(t): t for t in tickets}
+            self._sort_values = state["sort_values"]
+            self.index = TicketIndex.from_state(state["index"])
+            self.search_index = SearchIndex.from_state(state["search"])
+            self._build_columns(tickets, TicketStats.from_state(state["stats"]))
+        return tickets, ops
+
+    def save_snapshot(self) -> bool:
+        """
+        Écrit le snapshot des tickets et des index s'il n'est plus à jour.
+        L'état est copié sous le verrou (quelques centaines de ms pour
+        100 000 tickets) ; l'écriture du fichier se fait ensuite, sans lui.
+        """
+        if self.snapshot_path is None:
+            return False
+        with self._lock:
+            if not self._loaded or self._version == self._snapshot_version:
+                return False
+            # Même forme que l'état relu par _load_snapshot (snapshot.FORMAT_VERSION)
+            state = {
+                "tickets": [t.to_dict() for t in self._tickets] if self.compact else self._tickets,
+                "sort_values": self._sort_values,
+                "index": self.index.state(),
+                "search": self.search_index.state(),
+                "stats": self.stats.state(),
+            }
+            data = encode_snapshot(self.backend.source(), state)
+            self._snapshot_version = self._version
+        write_snapshot(self.snapshot_path, data)
+        return True
+
+    def _replay(self, ops: List[Dict[str, Any]]) -> None:
+        """
+        Applique au cache et aux index les opérations écrites par un autre
+        process (verrous tenus). Les abonnés du flux reçoivent les événements
+        comme s'ils venaient de ce worker.
+        """
+        if not ops:
+            return
+        changes = self._pending_changes = []
+        ids: List[int] = []
+        resort = False
+        with stage("index"):
+            for op in ops:
+                kind = op["op"]
+                if kind == "create":
+                    ticket = dict(op["ticket"])
+                    ticket_id = _ticket_id(ticket)
+                    if ticket_id in self._by_id:  # déjà vu : opérations idempotentes
+                        self._remove(ticket_id)
+                    # IDs attribués dans l'ordre : normalement ajouté en fin de cache trié
+                    resort = resort or (bool(self._tickets) and ticket_id < _ticket_id(self._tickets[-1]))
+                    self._add(ticket, ticket_id)
+                    self._next_id = max(self._next_id, ticket_id + 1)
+                elif kind == "patch":
+                    ticket_id = int(op["id"])
+                    self._patch(ticket_id, op["data"], from_archive=False)
+                elif kind == "delete":
+                    ticket_id = int(op["id"])
+                    if not self._remove(ticket_id, from_archive=False)[0] and self.archive is not None:
+                        # Ticket archivé supprimé par l'autre worker
+                        self.archive.forget(ticket_id)
+                elif kind == "archive":
+                    # Archivé par l'autre worker (qui a écrit les segments) : le ticket existe toujours
+                    ticket_id = int(op["id"])
+                    self._detach(ticket_id)
+                elif kind == "restore":
+                    ticket = dict(op["ticket"])
+                    ticket_id = _ticket_id(ticket)
+                    if ticket_id not in self._by_id:
+                        self._attach(ticket, ticket_id)
+                    if self.archive is not None:
+                        self.archive.forget(ticket_id)
+                else:
+                    continue
+                ids.append(ticket_id)
+            if resort:
+                self._tickets.sort(key=_ticket_id)
+            self._refresh_columns()
+        self._saved_next_id = self.backend.counter.load()
+        self._next_id = max(self._next_id, self._saved_next_id)
+        self._forget_encoded(ids)
+        self._bump_version()
+        self.changes.publish(changes)
+
+    def needs_reload(self) -> bool:
+        """Le cache doit-il être (re)chargé depuis le disque ? (stat() ou compteur partagé, pas de lecture)"""
+        return not self._loaded or self.backend.has_changed()
+
+    def writing(self) -> bool:
+        """Un lot est-il en cours d'écriture ? (une lecture attendrait alors la fin du commit)"""
+        return self._writing is not None
+
+    def refresh(self) -> None:
+        """Recharge le cache si besoin (lecture disque : hors boucle asyncio)."""
+        self._ensure_fresh()
+
+    def _bump_version(self) -> None:
+        # Après la modification du cache : qui lit la nouvelle version voit les nouvelles données
+        self._modified_at = time.time()
+        self._version += 1
+
+    def version(self) -> Tuple[str, float]:
+        """
+        (étiquette de version, date de dernière modification en secondes epoch).
+        L'étiquette change à chaque mutation ; base des ETag de GET /tickets.
+        """
+        self._ensure_fresh()
+        return f"{self._instance}-{self._version}", self._modified_at
+
+    def tickets(self) -> List[Dict[str, Any]]:
+        """Renvoie la liste en cache (à ne pas modifier ni trier en place)."""
+        self._ensure_fresh()
+        return self._tickets
+
+    def archive_hit(
+        self,
+        status: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+        ticket_id: Optional[int] = None,
+    ) -> bool:
+        """
+        La lecture peut-elle lire des segments de l'archive (disque + gzip) ?
+        query(status, created_from, created_to) qui vise l'archive, ou
+        get(ticket_id) d'un ticket absent du store actif.
+        """
+        if self.archive is None:
+            return False
+        if ticket_id is not None:
+            return ticket_id not in self._by_id
+        return status == "Closed" or (status is None and (created_from is not None or created_to is not None))
+
+    def get(self, ticket_id: int) -> Optional[Dict[str, Any]]:
+        self._ensure_fresh()
+        ticket = self._by_id.get(ticket_id)
+        if ticket is None and self.archive is not None:
+            return self.archive.get(ticket_id)
+        return _as_dict(ticket)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Compteurs agrégés (maintenus incrémentalement ; archive : ceux de son manifeste)."""
+        self._ensure_fresh()
+        if self.archive is None:
+            return self.stats.as_dict()
+        # Somme recalculée seulement si l'un des deux côtés a changé
+        key = (self._version, self.archive.signature())
+        cached = self._combined_stats
+        if cached is None or cached[0] != key:
+            cached = (key, TicketStats.combined(self.stats, self.archive.stats()).as_dict())
+            self._combined_stats = cached
+        return cached[1]
+
+    def sort_values(self, ticket: Dict[str, Any]) -> Tuple:
+        """Clés de tri précalculées du ticket (voir sorting.sort_values)."""
+        values = self._sort_values.get(int(ticket.get("id", -1)))
+        return values if values is not None else sort_values(ticket)
+
+    def encoded(self, ticket: Dict[str, Any]) -> bytes:
+        """
+        Ticket encodé en JSON, mis en cache jusqu'à sa prochaine modification.
+        Un encodage commencé avant une invalidation n'est pas gardé (il a pu
+        voir le ticket à moitié modifié).
+        """
+        tid = int(ticket.get("id", -1))
+        data = self._encoded.get(tid)
+        if data is not None:
+            return data
+        generation = self._generation
+        data = dumps(ticket)
+        with self._encoded_lock:
+            if generation == self._generation and len(self._encoded) < self.MAX_ENCODED:
+                self._encoded[tid] = data
+        return data
+
+    def _forget_encoded(self, ids: Optional[List[int]]) -> None:
+        """Oublie l'encodage des tickets modifiés (tous si ids est None)."""
+        with self._encoded_lock:
+            self._generation += 1
+            if ids is None:
+                self._encoded.clear()
+            else:
+                for tid in ids:
+                    self._encoded.pop(tid, None)
+
+    def filter(
+        self,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        tag: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Tickets correspondant aux filtres (nouvelle liste, triée par id).
+        Servi par les index : coût proportionnel à la taille du résultat.
+        search passe par l'index plein texte (préfixes, sans accents) ;
+        une requête sans aucun mot est ignorée ici.
+        """
+        self._ensure_fresh()
+        ids = self.index.lookup(status=status, priority=priority, tag=tag)
+        if search is not None:
+            found = self.search_index.search(search)
+            if found is not None:
+                ids = found if ids is None else ids & found
+        if ids is None:
+            return list(self._tickets)
+        by_id = self._by_id
+        return [by_id[i] for i in sorted(ids) if i in by_id]
+
+    # ---------------- Écriture (thread unique) ----------------
+    def _submit(self, apply: Callable[[], Tuple[Any, List[Dict[str, Any]]]], wait: bool = True) -> Any:
+        """
+        Confie une mutation au thread écrivain et attend son résultat.
+        apply() renvoie (résultat, opérations à persister).
+        wait=False : renvoie tout de suite le Future (chemin async, voir async_store.py).
+        """
+        if self._writer is None:
+            with self._writer_start:
+                if self._writer is None:
+                    self._writer = threading.Thread(target=self._writer_loop, name="ticket-writer", daemon=True)
+                    self._writer.start()
+        future: Future = Future()
+        self._queue.put((apply, future))
+        if not wait:
+            return future
+        # File d'attente + group commit, vus depuis la requête
+        with stage("write"):
+            return future.result()
+
+    def _writer_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            while len(batch) < self.MAX_BATCH:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)  # on traitera l'arrêt après ce lot
+                    break
+                batch.append(item)
+            self._apply_batch(batch)
+            if self.archive is not None and self.archive.due():
+                # Passage périodique de l'archivage, comme une mutation de plus
+                self._apply_batch([(self._archive_closed, Future())])
+
+    def _apply_batch(self, batch: List[Tuple[Callable, Future]]) -> None:
+        done: List[Tuple[Future, Any]] = []
+        ops: List[Dict[str, Any]] = []
+        try:
+            with self._lock, self.backend.lock:
+                self._ensure_fresh()
+                # Après _ensure_fresh : un rejeu y publie ses propres événements
+                changes = self._pending_changes = []
+                # Jusqu'au commit, les lecteurs attendent le verrou (voir _ensure_fresh)
+                self._writing = threading.get_ident()
+                try:
+                    for apply, future in batch:
+                        try:
+                            result, new_ops = apply()
+                        except BaseException as e:
+                            future.set_exception(e)
+                            continue
+                        ops.extend(new_ops)
+                        done.append((future, result))
+                    self._refresh_columns()
+                    if ops:
+                        self._forget_encoded([op["id"] for op in ops if "id" in op])
+                        if self._next_id != self._saved_next_id:
+                            # Compteur avant les données : au pire un trou dans les IDs, jamais un ID réutilisé
+                            self.backend.counter.save(self._next_id)
+                            self._saved_next_id = self._next_id
+                        if self.archive is not None:
+                            # Tickets archivés écrits dans leur segment avant de quitter les données actives
+                            self.archive.commit_added()
+                        with storage_op("save", self.backend.name):
+                            written = self.backend.commit(self._tickets, ops)
+                        if self.archive is not None:
+                            # Tickets restaurés ou supprimés retirés de l'archive une fois le commit fait
+                            self.archive.commit_removed()
+                        observe_bytes_written(self.backend.name, written)
+                        self._bump_version()
+                        self.changes.publish(changes)
+                except BaseException:
+                    # Le cache a déjà été modifié : relecture du disque forcée,
+                    # avant que les lecteurs en attente ne reprennent
+                    self._discard_batch()
+                    raise
+                finally:
+                    self._writing = None
+        except BaseException as e:
+            self._discard_batch()
+            for future, _ in done:
+                future.set_exception(e)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, result in done:
+            future.set_result(result)
+
+    def _discard_batch(self) -> None:
+        """Lot non écrit : cache relu au prochain accès, tickets archivés en attente oubliés."""
+        self._loaded = False
+        if self.archive is not None:
+            self.archive.discard_pending()
+
+    def _take_ids(self, count: int) -> int:
+        """Réserve count IDs consécutifs et renvoie le premier (thread écrivain)."""
+        first = self._next_id
+        self._next_id += count
+        return first
+
+    def _add(self, ticket: Dict[str, Any], ticket_id: int) -> Dict[str, Any]:
+        """Ajoute un nouveau ticket au cache et aux index (thread écrivain)."""
+        ticket["id"] = ticket_id
+        ticket = self._attach(ticket, ticket_id, at_end=True)
+        self._pending_changes.append(("create", {"id": ticket_id, "ticket": _snapshot(ticket)}, (ticket_state(ticket),)))
+        return {"op": "create", "ticket": ticket}
+
+    def _attach(self, ticket: Dict[str, Any], ticket_id: int, at_end: bool = False) -> Dict[str, Any]:
+        """
+        Ajoute le ticket au cache et aux index, sans événement (thread écrivain).
+        at_end=False : ID ancien (ticket sorti de l'archive), inséré à sa place.
+        """
+        if self.compact:
+            ticket = TicketRecord(ticket)
+        if at_end:
+            self._tickets.append(ticket)
+        else:
+            self._tickets.insert(bisect_left(self._tickets, ticket_id, key=_ticket_id), ticket)
+        self._by_id[ticket_id] = ticket
+        self._sort_values[ticket_id] = sort_values(ticket)
+        self.index.add(ticket)
+        self.search_index.add(ticket)
+        self.stats.add(ticket)
+        if self.columns is not None:
+            if at_end:
+                self.columns.add(ticket, self._sort_values[ticket_id])
+            else:
+                # Les colonnes n'acceptent que des IDs croissants
+                self._columns_stale = True
+        return ticket
+
+    def _refresh_columns(self) -> None:
+        """Fin de lot : colonnes reconstruites si un ticket d'ID ancien a été ajouté (voir _attach)."""
+        if self._columns_stale:
+            self._columns_stale = False
+            with stage("index"):
+                self._build_columns(self._tickets, self.stats)
+
+    def create(self, ticket: Dict[str, Any], wait: bool = True) -> Dict[str, Any]:
+        """Attribue un ID au ticket, l'ajoute puis persiste."""
+        def apply():
+            op = self._add(ticket, self._take_ids(1))
+            return ticket, [op]
+        return self._submit(apply, wait)
+
+    def create_many(self, tickets: List[Dict[str, Any]], wait: bool = True) -> List[Dict[str, Any]]:
+        """
+        Import en masse : IDs consécutifs, une seule mutation dans la file,
+        donc une seule écriture sur disque pour tout le lot.
+        """
+        def apply():
+            first = self._take_ids(len(tickets))
+            ops = [self._add(t, first + i) for i, t in enumerate(tickets)]
+            return tickets, ops
+        return self._submit(apply, wait)
+
+    def _patch(
+        self, ticket_id: int, data: Dict[str, Any], from_archive: bool = True
+    ) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Applique data au ticket en cache et à ses index (thread écrivain). (None, []) si introuvable.
+        Ticket archivé (from_archive) : remis d'abord dans le store actif.
+        """
+        ticket = self._by_id.get(ticket_id)
+        ops: List[Dict[str, Any]] = []
+        if ticket is None and from_archive and self.archive is not None:
+            archived = self.archive.take(ticket_id)
+            if archived is not None:
+                ticket = self._attach(archived, ticket_id)
+                ops.append({"op": "restore", "ticket": ticket})
+        if ticket is None:
+            return None, []
+        reindex_text = not data.keys().isdisjoint(("title", "description", "tags"))
+        before = ticket_state(ticket)
+        self.index.remove(ticket)
+        self.stats.remove(ticket)
+        if reindex_text:
+            self.search_index.remove(ticket)
+        ticket.update(data)
+        self._sort_values[ticket_id] = sort_values(ticket)
+        self.index.add(ticket)
+        self.stats.add(ticket)
+        if reindex_text:
+            self.search_index.add(ticket)
+        if self.columns is not None:
+            self.columns.update(ticket, self._sort_values[ticket_id])
+        self._pending_changes.append(
+            ("patch", {"id": ticket_id, "data": data, "ticket": _snapshot(ticket)}, (before, ticket_state(ticket)))
+        )
+        ops.append({"op": "patch", "id": ticket_id, "data": data})
+        return _as_dict(ticket), ops
+
+    def _remove(self, ticket_id: int, from_archive: bool = True) -> Tuple[bool, List[Dict[str, Any]]]:
+        """
+        Retire le ticket du cache et des index (thread écrivain). (False, []) si introuvable.
+        Ticket archivé (from_archive) : retiré de son segment après le commit.
+        """
+        ticket = self._detach(ticket_id)
+        if ticket is None and from_archive and self.archive is not None:
+            ticket = self.archive.take(ticket_id)
+        if ticket is None:
+            return False, []
+        self._pending_changes.append(("delete", {"id": ticket_id}, (ticket_state(ticket),)))
+        return True, [{"op": "delete", "id": ticket_id}]
+
+    def _detach(self, ticket_id: int) -> Optional[Dict[str, Any]]:
+        """Retire le ticket du cache et des index, sans événement (thread écrivain). None si absent."""
+        ticket = self._by_id.pop(ticket_id, None)
+        if ticket is None:
+            return None
+        self._sort_values.pop(ticket_id, None)
+        self.index.remove(ticket)
+        self.search_index.remove(ticket)
+        self.stats.remove(ticket)
+        if self.columns is not None:
+            self.columns.remove(ticket_id)
+        # Cache trié par id : position par dichotomie, pas de reconstruction de la liste
+        pos = bisect_left(self._tickets, ticket_id, key=_ticket_id)
+        if pos < len(self._tickets) and self._tickets[pos] is ticket:
+            del self._tickets[pos]
+        else:  # IDs en double ou non numériques dans un fichier édité à la main
+            self._tickets = [t for t in self._tickets if t is not ticket]
+        return ticket
+
+    def update(self, ticket_id: int, data: Dict[str, Any], wait: bool = True) -> Optional[Dict[str, Any]]:
+        """Applique les champs de data au ticket. None si introuvable."""
+        return self._submit(lambda: self._patch(ticket_id, data), wait)
+
+    def update_many(
+        self, changes: List[Tuple[int, Dict[str, Any]]], wait: bool = True
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Modifications en lot (PATCH /tickets) : une seule mutation dans la
+        file, donc une seule écriture. Un résultat par (id, data), None si introuvable.
+        """
+        def apply():
+            results: List[Optional[Dict[str, Any]]] = []
+            ops: List[Dict[str, Any]] = []
+            for ticket_id, data in changes:
+                ticket, new_ops = self._patch(ticket_id, data)
+                results.append(ticket)
+                ops.extend(new_ops)
+            return results, ops
+        return self._submit(apply, wait)
+
+    def delete(self, ticket_id: int, wait: bool = True) -> bool:
+        """Supprime le ticket. False si introuvable."""
+        return self._submit(lambda: self._remove(ticket_id), wait)
+
+    def delete_many(self, ids: List[int], wait: bool = True) -> List[bool]:
+        """Suppressions en lot (DELETE /tickets), en une seule écriture. False si introuvable."""
+        def apply():
+            results: List[bool] = []
+            ops: List[Dict[str, Any]] = []
+            for ticket_id in ids:
+                removed, new_ops = self._remove(ticket_id)
+                results.append(removed)
+                ops.extend(new_ops)
+            return results, ops
+        return self._submit(apply, wait)
+
+    # ---------------- Archive (voir archive.py) ----------------
+    def archive_closed(self, wait: bool = True) -> int:
+        """
+        Déplace dans l'archive les tickets Closed créés il y a plus de
+        TICKETS_ARCHIVE_DAYS jours (warm_up, puis au plus une fois par
+        archive.CHECK_INTERVAL après une écriture). Renvoie leur nombre.
+        """
+        if self.archive is None:
+            return 0
+        return self._submit(self._archive_closed, wait)
+
+    def _archive_closed(self) -> Tuple[int, List[Dict[str, Any]]]:
+        # Sur les clés de tri précalculées : (id, jour de création, priorité, statut, titre)
+        cutoff, closed = self.archive.cutoff(), STATUS_WEIGHT["Closed"]
+        ids = sorted(tid for tid, values in self._sort_values.items() if values[3] == closed and values[1] < cutoff)
+        if not ids:
+            return 0, []
+        if len(ids) * 4 > len(self._tickets):
+            # Premier passage (l'essentiel du store) : index reconstruits sur ce qui reste
+            moved = set(ids)
+            kept = []
+            for t in self._tickets:
+                if _ticket_id(t) in moved:
+                    self.archive.put(t)
+                else:
+                    kept.append(t)
+            with stage("index"):
+                self._build_indexes(kept)
+            self._tickets = kept
+        else:
+            for tid in ids:
+                self.archive.put(self._detach(tid))
+        # Pas d'événement du flux : les tickets existent toujours, ailleurs
+        return len(ids), [{"op": "archive", "id": tid} for tid in ids]
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        tag: Optional[str] = None,
+        search: Optional[str] = None,
+        search_mode: str = "prefix",
+        sort: Optional[SortSpec] = None,
+        offset: int = 0,
+        limit: int = 200,
+        after: Optional[List[Any]] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None,
+    ) -> Page:
+        """
+        Filtrage + tri + pagination de GET /tickets (paramètres déjà validés).
+        Tickets archivés compris seulement si la requête les vise : status=Closed,
+        ou created_from / created_to sans autre statut.
+        """
+        sort = sort if sort is not None else SortSpec("id", "desc")
+        self._ensure_fresh()
+        days = day_range(created_from, created_to)
+        args = (status, priority, tag, search, search_mode, sort)
+        if self.archive_hit(status, created_from, created_to):
+            names = self.archive.segments(days)
+            if names:
+                # Les offset + limit premiers de chaque partition, même curseur, puis fusion
+                wanted = offset + limit
+                parts = [self._query(*args, 0, wanted, after, days)]
+                parts.append(self.archive.open(names)._query(*args, 0, wanted, after, days))
+                with stage("sort"):
+                    items, has_more = merge_pages(
+                        [(p.items, p.next_after is not None) for p in parts], self.sort_values, sort, offset, limit
+                    )
+                next_after = sort.raw(self.sort_values(items[-1])) if has_more and items else None
+                return Page(items, sum(p.total for p in parts), next_after)
+        return self._query(*args, offset, limit, after, days)
+
+    def _query(
+        self,
+        status: Optional[str],
+        priority: Optional[str],
+        tag: Optional[str],
+        search: Optional[str],
+        search_mode: str,
+        sort: SortSpec,
+        offset: int,
+        limit: int,
+        after: Optional[List[Any]],
+        days: Optional[Tuple[int, int]],
+    ) -> Page:
+        """query() sur les tickets de ce store seulement ; days : voir sorting.day_range."""
+        self._ensure_fresh()
+        needle = search.strip().lower() if search is not None else ""
+        use_index = uses_index(needle, search_mode)
+
+        field, desc = sort.primary
+        if field == "id" and status is None and priority is None and tag is None and not needle and days is None:
+            # Liste complète triée par id : le cache est déjà dans cet ordre
+            tickets = self._tickets
+            total = len(tickets)
+            with stage("page"):
+                items, has_more = page_by_id(tickets, desc, offset, limit, after[0] if after else None)
+        elif self.columns is not None:
+            # Mêmes étapes en colonnes NumPy (masques, lexsort)
+            found = self.search_index.search(needle) if use_index else None
+            predicate = (lambda t: contains_text(t, needle)) if needle and not use_index else None
+            items, total, has_more = self.columns.query(
+                status, priority, tag, found, predicate, sort, offset, limit, after, days
+            )
+        else:
+            # Filtrage : status/priority/tag (et search en mode prefix) servis
+            # par les index (nouvelle liste : le tri ne touche pas au cache)
+            with stage("filter"):
+                results = self.filter(status=status, priority=priority, tag=tag, search=needle if use_index else None)
+                if needle and not use_index:
+                    results = [t for t in results if contains_text(t, needle)]
+                if days is not None:
+                    low, high = days
+                    results = [t for t in results if low <= self.sort_values(t)[1] <= high]
+            total = len(results)
+            # Tri sur les clés précalculées + pagination (heapq si petite page)
+            with stage("sort"):
+                items, has_more = select_page(results, self.sort_values, sort, offset, limit, after)
+
+        next_after = sort.raw(self.sort_values(items[-1])) if has_more and items else None
+        return Page(items, total, next_after)
+
+    def iter_tickets(self, chunk_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Tous les tickets par id croissant, par paquets de copies (export).
+        Chaque paquet est copié sous le verrou : le thread écrivain ne peut
+        pas modifier un ticket pendant qu'il est sérialisé.
+        """
+        self._ensure_fresh()
+        if self.archive is None:
+            yield from self._chunks(chunk_size)
+            return
+        # Store actif et archive, fusionnés par id
+        merged = heapq.merge(
+            (t for chunk in self._chunks(chunk_size) for t in chunk), self.archive.iter_tickets(), key=_ticket_id
+        )
+        chunk = []
+        for t in merged:
+            chunk.append(t)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _chunks(self, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+        tickets = self._tickets
+        for start in range(0, len(tickets), chunk_size):
+            with self._lock:
+                chunk = [dict(t) for t in tickets[start:start + chunk_size]]
+            yield chunk
+
+    def invalidate(self) -> None:
+        """Force la relecture au prochain accès."""
+        self._loaded = False
+
+    def close(self) -> None:
+        """Arrête le thread écrivain (après les mutations en attente)."""
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+        self.backend.close()
+
+
+def make_store(kind: str = STORAGE_BACKEND):
+    """
+    Store du process : TicketStore (json/wal) ou SqliteTicketStore (sqlite),
+    qui expose les mêmes méthodes (get, query, get_stats, create, update, delete).
+    """
+    if kind == "sqlite":
+        try:
+            from .sqlite_store import SqliteTicketStore
+        except ImportError:
+            from sqlite_store import SqliteTicketStore
+        # Premier démarrage : la base est remplie depuis le fichier JSON
+        return SqliteTicketStore(SQLITE_FILE, migrate_from=DATA_FILE)
+    return TicketStore(make_backend(kind))
+
+
+_store = make_store()
+
+
+def get_store() -> TicketStore:
+    """Dépendance FastAPI : le store unique du process."""
+    return _store
+
+
+def warm_up(store=None) -> None:
+    """
+    Au démarrage du serveur (lifespan) : charge le store avant la première
+    requête, archive les tickets fermés anciens (TICKETS_ARCHIVE_DAYS), puis
+    écrit le snapshot des index s'il manquait ou était périmé, pour que le
+    prochain démarrage n'ait plus à tout réindexer.
+    """
+    store = store if store is not None else _store
+    # SQLite : rien à charger en mémoire
+    if hasattr(store, "save_snapshot"):
+        with _gc_paused(freeze=True):
+            store.refresh()
+        # Tickets Closed devenus assez anciens depuis le dernier démarrage
+        store.archive_closed()
+        store.save_snapshot()
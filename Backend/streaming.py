@@ -0,0 +1,87 @@
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, Optional
+
+try:
+    from .storage import DATA_FILE, USE_MMAP, iter_file
+    from .indexes import normalize_tag, ticket_tags
+    from .fulltext import contains_text, ticket_tokens, tokenize, uses_index
+    from .serialization import dumps
+    from .sorting import day_range, parse_date_yyyy_mm_dd
+except ImportError:
+    from storage import DATA_FILE, USE_MMAP, iter_file
+    from indexes import normalize_tag, ticket_tags
+    from fulltext import contains_text, ticket_tokens, tokenize, uses_index
+    from serialization import dumps
+    from sorting import day_range, parse_date_yyyy_mm_dd
+
+""" Traitements en flux sur un fichier de tickets, à mémoire bornée.
+
+Pour un fichier trop gros pour le store (sauvegarde, export d'un autre
+environnement), les tickets sont décodés un par un (storage.iter_file),
+filtrés ticket par ticket avec la même sémantique que GET /tickets, puis
+écrits au fil de l'eau. La mémoire ne dépend pas de la taille du fichier :
+seuls le morceau en cours de lecture et le ticket courant sont gardés.
+
+Pas de tri ici (il faut tous les tickets) : les tickets sortent dans l'ordre
+du fichier, c'est-à-dire par id croissant pour un fichier écrit par le store.
+"""
+
+
+def ticket_matcher(
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    tag: Optional[str] = None,
+    search: Optional[str] = None,
+    search_mode: str = "prefix",
+    created_from: Optional[str] = None,
+    created_to: Optional[str] = None,
+) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Prédicat équivalent aux filtres de TicketStore.query, appliqué ticket par
+    ticket (sans index) : statut et priorité exacts, tag normalisé, search
+    par préfixes de mots (sans accents) ou par sous-chaîne en mode exact,
+    createdAt entre created_from et created_to (inclus).
+    """
+    needle = search.strip().lower() if search is not None else ""
+    tag_key = normalize_tag(tag) if tag is not None else None
+    words = tokenize(needle) if uses_index(needle, search_mode) else None
+    days = day_range(created_from, created_to)
+
+    def match(ticket: Dict[str, Any]) -> bool:
+        if status is not None and ticket.get("status") != status:
+            return False
+        if priority is not None and ticket.get("priority") != priority:
+            return False
+        if tag_key is not None and tag_key not in ticket_tags(ticket):
+            return False
+        if days is not None:
+            day = parse_date_yyyy_mm_dd(str(ticket.get("createdAt", ""))).toordinal()
+            if not days[0] <= day <= days[1]:
+                return False
+        if words is not None:
+            tokens = ticket_tokens(ticket)
+            return all(any(tok.startswith(w) for tok in tokens) for w in words)
+        if needle:
+            return contains_text(ticket, needle)
+        return True
+
+    return match
+
+
+def stream_tickets(path: str = DATA_FILE, use_mmap: bool = USE_MMAP, **filters: Any) -> Iterator[Dict[str, Any]]:
+    """Tickets du fichier qui passent les filtres (mêmes paramètres que ticket_matcher), en flux."""
+    match = ticket_matcher(**filters)
+    return (t for t in iter_file(path, use_mmap) if isinstance(t, dict) and match(t))
+
+
+def write_ndjson(tickets: Iterable[Dict[str, Any]], out: BinaryIO, chunk_size: int = 1000) -> int:
+    """Écrit les tickets en NDJSON (une ligne par ticket), par paquets. Renvoie le nombre écrit."""
+    count = 0
+    lines = []
+    for ticket in tickets:
+        lines.append(dumps(ticket) + b"\n")
+        if len(lines) >= chunk_size:
+            out.write(b"".join(lines))
+            count += len(lines)
+            lines = []
+    out.write(b"".join(lines))
+    return count + len(lines)
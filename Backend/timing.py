@@ -0,0 +1,149 @@
+import os
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from . import metrics
+except ImportError:
+    import metrics
+
+""" Chronométrage des requêtes : histogrammes sur /metrics et en-tête Server-Timing.
+
+TimingMiddleware (branché par main.py) mesure chaque requête HTTP par route.
+Dans le code, `with stage("filter"):` mesure une étape : la durée va dans
+l'histogramme tickets_stage_seconds et, si l'étape tourne pour une requête,
+dans l'en-tête Server-Timing de sa réponse, par exemple :
+
+    Server-Timing: filter;dur=0.41, sort;dur=1.20, serialize;dur=0.35, total;dur=2.31
+
+Les étapes exécutées hors requête (thread écrivain : save) ne vont que dans
+les histogrammes.
+
+TICKETS_TIMING=0 désactive tout : pas de middleware, et stage() renvoie un
+context manager vide partagé (aucune horloge lue, rien d'alloué).
+"""
+
+ENABLED = os.environ.get("TICKETS_TIMING", "1") != "0"
+
+REQUEST_SECONDS = metrics.histogram(
+    "tickets_http_request_seconds", "Durée des requêtes HTTP par route.", ("method", "route")
+)
+STAGE_SECONDS = metrics.histogram(
+    "tickets_stage_seconds", "Durée des étapes de traitement (load, filter, sort, serialize...).", ("stage",)
+)
+STORAGE_SECONDS = metrics.histogram(
+    "tickets_storage_seconds", "Durée des chargements (load, load_changes) et écritures (save) du stockage.", ("op", "backend")
+)
+BYTES_WRITTEN = metrics.histogram(
+    "tickets_storage_bytes_written", "Octets écrits sur disque par commit.", ("backend",), metrics.SIZE_BUCKETS
+)
+RESULT_SIZE = metrics.histogram(
+    "tickets_result_size", "Nombre de tickets correspondant aux filtres de GET /tickets.", (), metrics.SIZE_BUCKETS
+)
+
+# Étapes de la requête en cours : (nom, secondes). Liste partagée avec les
+# threads du pool (run_in_threadpool copie le contexte, pas la liste).
+_stages: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("tickets_timing_stages", default=None)
+
+
+class _Timer:
+    __slots__ = ("name", "hist", "labels", "start")
+
+    def __init__(self, name: str, hist: metrics.Histogram, labels: Tuple[str, ...]):
+        self.name = name
+        self.hist = hist
+        self.labels = labels
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        elapsed = time.perf_counter() - self.start
+        self.hist.observe(elapsed, self.labels)
+        stages = _stages.get()
+        if stages is not None:
+            stages.append((self.name, elapsed))
+
+
+class _NoTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoTimer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NO_TIMER = _NoTimer()
+
+
+def stage(name: str):
+    """Mesure une étape du traitement d'une requête."""
+    if not ENABLED:
+        return _NO_TIMER
+    return _Timer(name, STAGE_SECONDS, (name,))
+
+
+def storage_op(op: str, backend: str):
+    """Mesure un chargement ("load", "load_changes") ou une écriture ("save") du stockage."""
+    if not ENABLED:
+        return _NO_TIMER
+    return _Timer(op, STORAGE_SECONDS, (op, backend))
+
+
+def observe_bytes_written(backend: str, size: Optional[int]) -> None:
+    if ENABLED and size is not None:
+        BYTES_WRITTEN.observe(size, (backend,))
+
+
+def observe_result_size(total: int) -> None:
+    if ENABLED:
+        RESULT_SIZE.observe(total)
+
+
+def server_timing(stages: List[Tuple[str, float]], total: float) -> bytes:
+    """Valeur de l'en-tête Server-Timing (durées en ms, étapes répétées additionnées)."""
+    merged: Dict[str, float] = {}
+    for name, seconds in stages:
+        merged[name] = merged.get(name, 0.0) + seconds
+    merged["total"] = total
+    return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in merged.items()).encode("latin-1")
+
+
+class TimingMiddleware:
+    """
+    Middleware ASGI : durée de chaque requête HTTP (par méthode et route) et
+    en-tête Server-Timing. ASGI pur plutôt que BaseHTTPMiddleware : pas de
+    tâche ni de file supplémentaire par requête.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stages: List[Tuple[str, float]] = []
+        token = _stages.set(stages)
+        start = time.perf_counter()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", ()))
+                headers.append((b"server-timing", server_timing(stages, time.perf_counter() - start)))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _stages.reset(token)
+            # Gabarit de la route (/tickets/{ticket_id}) : nombre de séries borné
+            route = scope.get("route")
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - start, (scope["method"], getattr(route, "path", "<inconnue>"))
+            )
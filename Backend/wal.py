@@ -0,0 +1,361 @@
+import os
+import threading
+import time
+from typing import List, Dict, Any, Optional, Tuple, Callable
+
+from fastapi import HTTPException
+
+try:
+    from .storage import IdCounter, _read_file, _write_file, _file_stamp, _fsync_dir
+    from .locking import FileLock
+    from .serialization import dumps, loads
+    from .sharedversion import SharedVersion
+except ImportError:
+    from storage import IdCounter, _read_file, _write_file, _file_stamp, _fsync_dir
+    from locking import FileLock
+    from serialization import dumps, loads
+    from sharedversion import SharedVersion
+
+""" Backend "journal d'écriture" (write-ahead log).
+
+Chaque create/patch/delete (et archive/restore, voir archive.py) est ajouté
+comme une ligne JSON à la fin de <fichier>.log (fsync à chaque commit). Au démarrage, l'état est reconstruit
+en rejouant le journal par-dessus le dernier snapshot (<fichier>, même format
+que le backend JSON). Quand le journal dépasse compact_bytes, un thread
+réécrit le snapshot en arrière-plan.
+
+Compaction : le journal courant est renommé en <fichier>.log.1, un journal
+vide prend sa place, puis le snapshot est réécrit (fichier temporaire +
+os.replace) avant de supprimer .log.1. Les opérations sont idempotentes :
+en cas de crash entre les deux étapes, rejouer .log.1 sur le nouveau
+snapshot donne le même état.
+
+Plusieurs workers : chaque commit incrémente un compteur partagé
+(<fichier>.version, voir sharedversion.py). Un worker qui voit le compteur
+bouger relit seulement la fin du journal, à partir de l'offset où il s'était
+arrêté (load_changes), au lieu de tout recharger. Les modifications faites
+hors d'un store (édition à la main) sont vues par la signature des fichiers,
+vérifiée au plus toutes les STAT_INTERVAL secondes.
+"""
+
+# Délai max avant de voir une modification qui n'est pas passée par un store
+STAT_INTERVAL = 1.0
+
+
+def _inode(path: str) -> Optional[int]:
+    """Identifie un journal même après renommage (.log -> .log.1). None si absent."""
+    try:
+        return os.stat(path).st_ino
+    except FileNotFoundError:
+        return None
+
+
+def read_log(path: str, start: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Lit un journal à partir de l'offset start et renvoie (opérations, offset de la fin valide).
+
+    Une dernière ligne incomplète (pas de retour à la ligne, JSON tronqué)
+    correspond à une écriture interrompue : elle est ignorée. Une ligne
+    invalide au milieu du journal est une vraie corruption.
+    """
+    ops: List[Dict[str, Any]] = []
+    good = start
+    try:
+        with open(path, "rb") as f:
+            f.seek(start)
+            lines = f.read().split(b"\n")
+    except FileNotFoundError:
+        return ops, 0
+    except OSError as e:
+        raise HTTPException(status_code=500, detail=f"Erreur système de fichier: {e}")
+
+    # split() laisse un dernier élément : vide si le fichier finit par \n,
+    # sinon c'est une ligne interrompue en cours d'écriture
+    complete = lines[:-1]
+    for i, raw in enumerate(complete):
+        try:
+            op = loads(raw)
+            if not isinstance(op, dict) or "op" not in op:
+                raise ValueError(raw)
+        except ValueError:
+            if i == len(complete) - 1 and not lines[-1]:
+                # dernière ligne terminée mais illisible : écriture déchirée
+                break
+            raise HTTPException(status_code=500, detail="Journal des tickets corrompu.")
+        ops.append(op)
+        good += len(raw) + 1
+    return ops, good
+
+
+def replay(tickets: List[Dict[str, Any]], ops: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Applique les opérations du journal à la liste de tickets."""
+    by_id = {int(t.get("id", -1)): t for t in tickets}
+    for op in ops:
+        kind = op["op"]
+        if kind in ("create", "restore"):
+            # restore : ticket sorti de l'archive (voir archive.py), remis tel quel
+            ticket = op["ticket"]
+            by_id[int(ticket["id"])] = ticket
+        elif kind == "patch":
+            ticket = by_id.get(int(op["id"]))
+            if ticket is not None:
+                ticket.update(op["data"])
+        elif kind in ("delete", "archive"):
+            # archive : ticket déplacé dans l'archive, qui le garde
+            by_id.pop(int(op["id"]), None)
+    return list(by_id.values())
+
+
+class WalBackend:
+    """Snapshot JSON + journal append-only, avec compaction en arrière-plan."""
+
+    name = "wal"
+    # Écritures des autres workers relues depuis le journal (load_changes)
+    incremental = True
+
+    def __init__(self, path: str, compact_bytes: int = 8 * 1024 * 1024):
+        self.path = path
+        self.log_path = path + ".log"
+        self.old_log_path = path + ".log.1"
+        self.compact_bytes = compact_bytes
+        # Verrou inter-process : tenu par le store pendant load/commit
+        self.lock = FileLock(path + ".lock")
+        self.counter = IdCounter(path + ".seq")
+        # Compteur partagé entre workers, incrémenté à chaque commit
+        self.version = SharedVersion(path + ".version")
+        self._seen_version = 0
+        self._checked_at = 0.0
+
+        self._log = None
+        self._stamps: Optional[Tuple] = None
+        # (inode, offset) : journal dont les offset premiers octets sont dans notre état
+        self._log_pos: Tuple[Optional[int], int] = (None, 0)
+        self._after_rotation = False
+        # Protège la cohérence snapshot/journaux entre lecture et compaction
+        self._files_lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+
+    # ---------------- Détection des modifications externes ----------------
+    def _current_stamps(self) -> Tuple:
+        return (_file_stamp(self.path), _file_stamp(self.old_log_path), _file_stamp(self.log_path))
+
+    def has_changed(self) -> bool:
+        if self.version.value() != self._seen_version:
+            return True
+        # Modifications hors store : signature des fichiers, pas à chaque appel
+        now = time.monotonic()
+        if now - self._checked_at < STAT_INTERVAL:
+            return False
+        with self._files_lock:
+            if self._current_stamps() != self._stamps:
+                return True  # reste vrai jusqu'à la relecture (_mark_seen)
+        self._checked_at = now
+        return False
+
+    def _mark_seen(self) -> None:
+        self._seen_version = self.version.value()
+        self._stamps = self._current_stamps()
+        self._checked_at = time.monotonic()
+
+    # ---------------- Lecture ----------------
+    def load(self, item_hook: Optional[Callable] = None) -> List[Dict[str, Any]]:
+        with self._files_lock:
+            self._close_log()
+            tickets = _read_file(self.path, item_hook) if os.path.exists(self.path) else []
+            old_ops, _ = read_log(self.old_log_path)
+            ops, good = read_log(self.log_path)
+            if os.path.exists(self.log_path) and good != os.path.getsize(self.log_path):
+                # On retire la ligne déchirée pour repartir d'un journal propre
+                with open(self.log_path, "r+b") as f:
+                    f.truncate(good)
+                    f.flush()
+                    os.fsync(f.fileno())
+            tickets = replay(tickets, old_ops + ops)
+            if old_ops and not self._compacting():
+                # Compaction interrompue (crash) : on la termine maintenant
+                self._write_snapshot([dict(t) for t in tickets])
+            # Journal toujours présent : son inode repère notre position, même après rotation
+            self._open_log()
+            self._log_pos = (_inode(self.log_path), good)
+            self._after_rotation = False
+            self._mark_seen()
+            return tickets
+
+    def load_changes(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Opérations ajoutées au journal par d'autres process depuis notre
+        dernière lecture (verrou de fichier tenu par l'appelant).
+        None : impossible de repartir de notre état (journal tourné puis
+        supprimé avant qu'on ait lu sa fin, snapshot réécrit hors compaction,
+        ligne déchirée), il faut tout recharger.
+        """
+        with self._files_lock:
+            ino, pos = self._log_pos
+            if ino is None:
+                return None
+            if _inode(self.old_log_path) == ino:
+                # Un autre worker a fait tourner notre journal : sa fin, puis le nouveau
+                segments = [(self.old_log_path, pos), (self.log_path, 0)]
+                self._after_rotation = True
+            elif _inode(self.log_path) == ino:
+                segments = [(self.log_path, pos)]
+            else:
+                return None
+            if _file_stamp(self.path) != self._stamps[0]:
+                # Snapshot réécrit : attendu seulement après une rotation dont on a tout lu
+                if not self._after_rotation:
+                    return None
+                self._after_rotation = False
+            ops: List[Dict[str, Any]] = []
+            for path, start in segments:
+                new_ops, end = read_log(path, start)
+                if os.path.exists(path) and end != os.path.getsize(path):
+                    return None
+                ops.extend(new_ops)
+            self._log_pos = (_inode(self.log_path), end)
+            self._mark_seen()
+            return ops
+
+    # ---------------- Snapshot du store (voir snapshot.py) ----------------
+    def source(self) -> Tuple:
+        """État du disque que reflète le cache du store : snapshot JSON + position dans le journal."""
+        with self._files_lock:
+            return (self.name, self._stamps[0] if self._stamps else None, self._log_pos)
+
+    def resume(self, source: Tuple) -> Optional[List[Dict[str, Any]]]:
+        """
+        Reprend à la position source sans relire le snapshot JSON : opérations
+        ajoutées au journal depuis (comme load_changes), ou None s'il faut
+        tout recharger (snapshot réécrit, journal tourné, .log.1 à terminer).
+        """
+        name, stamp, log_pos = source
+        if name != self.name or os.path.exists(self.old_log_path):
+            return None
+        self._log_pos = tuple(log_pos)
+        self._stamps = (stamp, None, None)
+        self._after_rotation = False
+        ops = self.load_changes()
+        if ops is None:
+            self._log_pos = (None, 0)
+            return None
+        self._open_log()
+        return ops
+
+    # ---------------- Écriture ----------------
+    def _open_log(self):
+        if self._log is None:
+            self._log = open(self.log_path, "ab")
+        return self._log
+
+    def _close_log(self) -> None:
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def commit(self, tickets: List[Dict[str, Any]], ops: List[Dict[str, Any]]) -> int:
+        """Ajoute les opérations au journal (une ligne chacune) puis fsync. Renvoie les octets ajoutés."""
+        payload = b"".join(dumps(op) + b"\n" for op in ops)
+        with self._files_lock:
+            start = None
+            try:
+                log = self._open_log()
+                if os.fstat(log.fileno()).st_ino != _inode(self.log_path):
+                    # Journal tourné par un autre worker : on écrit dans le nouveau
+                    self._close_log()
+                    log = self._open_log()
+                start = log.tell()
+                log.write(payload)
+                log.flush()
+                os.fsync(log.fileno())
+                size = log.tell()
+            except OSError as e:
+                self._rollback_log(start)
+                raise HTTPException(status_code=500, detail=f"Échec de l'écriture disque: {e}")
+            self._log_pos = (os.fstat(log.fileno()).st_ino, size)
+            # Après les données : un worker qui voit la nouvelle valeur trouve les opérations
+            self.version.bump()
+
+            if (size >= self.compact_bytes and not self._compacting()
+                    and not os.path.exists(self.old_log_path)):
+                self._start_compaction(tickets)
+            self._mark_seen()
+        return len(payload)
+
+    def _rollback_log(self, start: Optional[int]) -> None:
+        """Après un échec d'écriture, retire la ligne partielle du journal."""
+        self._close_log()
+        if start is None:
+            return
+        try:
+            with open(self.log_path, "r+b") as f:
+                f.truncate(start)
+        except OSError:
+            # Au pire, la ligne déchirée sera ignorée au prochain chargement
+            pass
+
+    # ---------------- Compaction ----------------
+    def _start_compaction(self, tickets: List[Dict[str, Any]]) -> None:
+        """Fait tourner le journal et lance la réécriture du snapshot (verrou tenu)."""
+        self._close_log()
+        os.replace(self.log_path, self.old_log_path)
+        _fsync_dir(self.log_path)
+        rotated = _inode(self.old_log_path)
+        # Notre état contient tout .log.1 : le nouveau journal part de zéro
+        self._log_pos = (os.fstat(self._open_log().fileno()).st_ino, 0)
+        # Copie : les tickets du store sont modifiés en place par les PATCH suivants
+        state = [dict(t, tags=list(t.get("tags") or [])) for t in tickets]
+        self._compactor = threading.Thread(target=self._compact, args=(state, rotated), daemon=True)
+        self._compactor.start()
+
+    def _compacting(self) -> bool:
+        return self._compactor is not None and self._compactor.is_alive()
+
+    def _write_tmp(self, state: List[Dict[str, Any]]) -> str:
+        # Propre au process : un autre worker peut terminer la même compaction (voir load)
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        _write_file(tmp, state)  # écrit et fsync
+        return tmp
+
+    def _install_snapshot(self, tmp: str) -> None:
+        """Remplace le snapshot puis oublie .log.1 (verrou tenu)."""
+        os.replace(tmp, self.path)
+        _fsync_dir(self.path)
+        if os.path.exists(self.old_log_path):
+            os.remove(self.old_log_path)
+
+    def _write_snapshot(self, state: List[Dict[str, Any]]) -> None:
+        self._install_snapshot(self._write_tmp(state))
+
+    def _compact(self, state: List[Dict[str, Any]], rotated: Optional[int]) -> None:
+        try:
+            tmp = self._write_tmp(state)
+        except (HTTPException, OSError):
+            # Le snapshot précédent et .log.1 restent valides : rien de perdu
+            return
+        with self.lock, self._files_lock:
+            if _inode(self.old_log_path) != rotated:
+                # Déjà terminée par un autre worker (et peut-être suivie d'une
+                # autre rotation) : notre snapshot est périmé
+                os.remove(tmp)
+                return
+            self._install_snapshot(tmp)
+            self._stamps = self._current_stamps()
+            self._after_rotation = False
+
+    def compact_now(self, tickets: List[Dict[str, Any]]) -> None:
+        """Compaction synchrone (outils, arrêt propre)."""
+        with self.lock, self._files_lock:
+            if self._compacting() or not os.path.exists(self.log_path):
+                return
+            self._start_compaction(tickets)
+        self.wait_compaction()
+
+    def wait_compaction(self) -> None:
+        if self._compactor is not None:
+            self._compactor.join()
+
+    def close(self) -> None:
+        self.wait_compaction()
+        with self._files_lock:
+            self._close_log()
+        self.version.close()